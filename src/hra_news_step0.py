@@ -1,43 +1,98 @@
 # src/hra_news_step0.py
 
-import urllib.request
 import urllib.parse
-import json
-import pandas as pd
 from datetime import datetime, timedelta
 import html
 import os
-import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
 
 from utils.logger import log_info, log_error
-from utils.file_manager import get_today_folder, get_today_filename
-
-def search_naver_news_single(query, client_id, client_secret, start_date, display=300):
-    """개별 쿼리에 대한 검색 수행"""
+from utils.file_manager import get_today_folder
+from utils.rate_limiter import TokenBucket
+from utils.http_client import get_http_client, retry_wait, RETRYABLE_STATUS
+from utils.news_accumulator import NewsAccumulator
+from utils.frame_store import read_frame, remove_frame, STEP0_RAW
+from utils.query_planner import load_query_plan, apply_query_plan
+from utils import page_scheduler
+from utils import watermark_store
+
+# 동시 수집 설정 (NAVER_MAX_WORKERS=1 이면 기존 순차 수집)
+NAVER_MAX_WORKERS = int(os.getenv("NAVER_MAX_WORKERS", "8"))
+NAVER_QPS = float(os.getenv("NAVER_QPS", "8"))                  # 검색 API 초당 호출 한도
+NAVER_DAILY_QUOTA = int(os.getenv("NAVER_DAILY_QUOTA", "25000"))  # 검색 API 일일 호출 한도
+NAVER_RETRIES = int(os.getenv("NAVER_RETRIES", "3"))             # 429/5xx/네트워크 오류 재시도 횟수 (재시도도 한도에 포함)
+# 1 이면 쿼리별 워터마크 이후 기사만 수집 (시간 단위 증분 실행용)
+NAVER_INCREMENTAL = os.getenv("NAVER_INCREMENTAL", "0") == "1"
+# 0 이면 수집 체크포인트(step0_checkpoint.jsonl)를 남기지 않음
+STEP0_CHECKPOINT = os.getenv("STEP0_CHECKPOINT", "1") == "1"
+# 0 이면 query_plan.json 을 무시하고 전체 키워드 수집
+NAVER_QUERY_PLAN = os.getenv("NAVER_QUERY_PLAN", "1") == "1"
+# 쿼리별 최근 수율로 페이지 수 배정 (0 이면 모든 쿼리 3페이지)
+NAVER_ADAPTIVE_PAGES = os.getenv("NAVER_ADAPTIVE_PAGES", "1") == "1"
+NAVER_CALL_BUDGET = int(os.getenv("NAVER_CALL_BUDGET", "0"))   # 실행당 API 호출 예산 (0 = 제한 없음)
+
+def naver_client():
+    # 재시도는 _fetch_naver_page 가 직접 (HTTP 클라이언트가 재전송하면 limiter 의 초당/일일 한도 집계에서 빠짐)
+    return get_http_client(max_retries=0)
+
+def _fetch_naver_page(url, headers, query, limiter=None, retries=NAVER_RETRIES):
+    """단일 페이지 요청. 429/5xx/네트워크 오류는 백오프 후 재시도하며 시도마다 limiter 토큰 사용. 실패/일일 한도 소진 시 None"""
+    error = None
+    for attempt in range(retries + 1):
+        if limiter is not None and not limiter.acquire():
+            log_error(f"⛔ 일일 API 한도 소진으로 '{query}' 요청 중단")
+            return None
+        response = None
+        try:
+            response = naver_client().get(url, headers=headers)
+            if response.status_code == 200:
+                return response.json()
+            error = f"HTTP {response.status_code}"
+            if response.status_code not in RETRYABLE_STATUS: break
+        except Exception as e:
+            error = e
+        if attempt < retries:
+            time.sleep(retry_wait(response, attempt))
+    log_error(f"⚠️ '{query}' 요청 실패: {error}")
+    return None
+
+def search_naver_news_single(query, client_id, client_secret, start_date, display=300, limiter=None,
+                             watermark=None, newest=None):
+    """개별 쿼리에 대한 검색 수행. (결과, ok) 반환 - 페이지 요청이 실패하면 ok=False (받은 결과까지만 반환)
+
+    sort=date 결과이므로 페이지가 start_date(또는 watermark) 경계를 넘으면 이후 페이지는 요청하지 않는다.
+    newest 가 주어지면 이번에 본 가장 최신 pubDate/link 를 기록한다. 단 경계를 넘거나 마지막 페이지까지 받아
+    끝까지 수집한 경우에만 기록 (요청 실패/페이지 예산 소진으로 중간에 멈추면 못 받은 기사가 워터마크 뒤로 밀려 유실되므로)
+    """
     results = []
+    candidate = {}
+    finished = False
+    ok = True
     for start_index in range(1, min(display, 1000) + 1, 100):
         encText = urllib.parse.quote(query)
         url = f"https://openapi.naver.com/v1/search/news?query={encText}&display=100&start={start_index}&sort=date"
 
-        request = urllib.request.Request(url)
-        request.add_header("X-Naver-Client-Id", client_id)
-        request.add_header("X-Naver-Client-Secret", client_secret)
+        headers = {"X-Naver-Client-Id": client_id, "X-Naver-Client-Secret": client_secret}
 
-        try:
-            with urllib.request.urlopen(request, timeout=10) as response:
-                if response.getcode() != 200: continue
-                news_data = json.loads(response.read().decode('utf-8'))
-        except Exception as e:
-            log_error(f"⚠️ '{query}' 요청 실패: {e}")
+        news_data = _fetch_naver_page(url, headers, query, limiter)
+        if news_data is None:
+            ok = False
             break
 
         items = news_data.get('items', [])
-        if not items: break
+        if not items:
+            finished = True
+            break
 
+        crossed = False
         for item in items:
             # 타임존 제거 후 날짜 비교
             pub_date = datetime.strptime(item['pubDate'], "%a, %d %b %Y %H:%M:%S %z").replace(tzinfo=None)
-            if pub_date.date() < start_date: continue
+            watermark_store.advance(candidate, pub_date, item['link'])
+            if pub_date.date() < start_date or watermark_store.is_seen(pub_date, item['link'], watermark):
+                crossed = True
+                continue
 
             # 도메인 추출 최적화
             link = item.get('originallink', item['link'])
@@ -54,14 +109,58 @@ def search_naver_news_single(query, client_id, client_secret, start_date, displa
                 "날짜": pub_date.strftime("%Y-%m-%d"),
                 "매체명": press_domain  # Step 1 매핑용 도메인 저장
             })
-    return results
 
-def main():
-    client_id = os.getenv("NAVER_CLIENT_ID")
-    client_secret = os.getenv("NAVER_CLIENT_SECRET")
-    
-    # 설정 값
-    queries = [
+        # 날짜 경계를 넘은 페이지 이후는 모두 더 오래된 기사
+        if crossed or len(items) < 100:
+            finished = True
+            break
+    if newest is not None and finished:
+        newest.update(candidate)
+    return results, ok
+
+def collect_queries_serially(queries, client_id, client_secret, start_date, limiter=None, watermarks=None, pages=None):
+    """기존 순차 수집 경로. (query, results, newest, ok) 를 쿼리 순서대로 yield"""
+    if limiter is None:
+        limiter = TokenBucket(NAVER_QPS, daily_limit=NAVER_DAILY_QUOTA)
+    watermarks = watermarks or {}
+    pages = pages or {}
+    for i, query in enumerate(queries):
+        log_info(f"🔍 [{i+1}/{len(queries)}] '{query}' 처리 중...")
+        newest = {}
+        results, ok = search_naver_news_single(query, client_id, client_secret, start_date,
+                                               display=pages.get(query, page_scheduler.MAX_PAGES) * page_scheduler.PAGE_SIZE,
+                                               limiter=limiter, watermark=watermarks.get(query), newest=newest)
+        yield query, results, newest, ok
+    _log_limiter(limiter)
+
+def _log_limiter(limiter):
+    log_info(f"📊 Naver API 호출 {limiter.used}회 (남은 일일 한도: {limiter.remaining()})")
+
+def collect_queries_concurrently(queries, client_id, client_secret, start_date, max_workers=NAVER_MAX_WORKERS,
+                                 limiter=None, watermarks=None, pages=None):
+    """쿼리 목록을 스레드 풀로 동시 수집. (query, results, newest, ok) 를 입력 쿼리 순서대로 yield"""
+    if limiter is None:
+        limiter = TokenBucket(NAVER_QPS, daily_limit=NAVER_DAILY_QUOTA)
+    watermarks = watermarks or {}
+    pages = pages or {}
+
+    def _run(i, query):
+        log_info(f"🔍 [{i+1}/{len(queries)}] '{query}' 처리 중...")
+        newest = {}
+        results, ok = search_naver_news_single(query, client_id, client_secret, start_date,
+                                               display=pages.get(query, page_scheduler.MAX_PAGES) * page_scheduler.PAGE_SIZE,
+                                               limiter=limiter, watermark=watermarks.get(query), newest=newest)
+        return results, newest, ok
+
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as pool:
+        futures = [pool.submit(_run, i, q) for i, q in enumerate(queries)]
+        for query, future in zip(queries, futures):
+            results, newest, ok = future.result()
+            yield query, results, newest, ok
+    _log_limiter(limiter)
+
+# 검색 키워드 (query_planner 도 이 목록을 기준으로 계획 수립)
+QUERIES = [
               
                   # 🏢 인사 전략 (HR Strategy)
     # ▪ 조직 구조 및 인사 제도
@@ -179,64 +278,91 @@ def main():
               
               
               ] # (기존 쿼리 리스트 유지)
-    filter_domains = [
 
-            "www.chosun.com", "www.joins.com", "www.donga.com", "www.khan.co.kr", "www.hani.co.kr",
-            "www.hankyung.com", "www.mk.co.kr", "www.hankookilbo.com", "biz.chosun.com",
-            "view.asiae.co.kr", "www.edaily.co.kr", "news.heraldcorp.com", "www.fnnews.com",
-            "www.mt.co.kr", "magazine.mk.co.kr", "www.sisain.co.kr", "weekly.chosun.com", "www.insnews.co.kr", "www.insjournal.co.kr", "www.insweek.co.kr"
-        
-    ] # (기존 도메인 리스트 유지)
+def stage_config():
+    """파이프라인 단계 캐시 키에 들어가는 설정 (검색어/수집 방식이 바뀌면 Step 0 재실행)"""
+    return {
+        "queries": QUERIES, "incremental": NAVER_INCREMENTAL, "query_plan": NAVER_QUERY_PLAN,
+        "adaptive_pages": NAVER_ADAPTIVE_PAGES, "call_budget": NAVER_CALL_BUDGET,
+    }
+
+def main(on_rows=None):
+    """on_rows: 쿼리별로 새로 채택된 기사 행(dict 목록)을 받는 콜백 (스트리밍 파이프라인용). 저장 결과에는 영향 없음"""
+    client_id = os.getenv("NAVER_CLIENT_ID")
+    client_secret = os.getenv("NAVER_CLIENT_SECRET")
+    
+    # 수집 계획(query_plan.json)이 있으면 중복 쿼리 건너뛰기/순서 조정 적용
+    queries = QUERIES
+    plan = load_query_plan() if NAVER_QUERY_PLAN else None
+    if plan:
+        queries = apply_query_plan(QUERIES, plan)
+        log_info(f"🗺️ 수집 계획 적용: {len(QUERIES)}개 중 {len(queries)}개 실행 (건너뜀 {len(plan.get('skip', {}))}개)")
     
     output_dir = get_today_folder()
     os.makedirs(output_dir, exist_ok=True)
-    output_file = os.path.join(output_dir, get_today_filename("step0_raw.csv"))
 
     # 시작 날짜 기준 (타임존 naive)
     start_date = (datetime.now() - timedelta(days=1)).date()
     
     log_info(f"🚀 총 {len(queries)}개 키워드 수집 시작")
 
-    # 기존 파일이 있다면 삭제 (새로운 세션 시작)
-    if os.path.exists(output_file):
-        os.remove(output_file)
+    # 수집 결과는 메모리 누적기에서 바로 정제 (중단 시 체크포인트로 이어서 수집)
+    checkpoint_file = os.path.join(output_dir, "step0_checkpoint.jsonl") if STEP0_CHECKPOINT else None
+    accumulator = NewsAccumulator(checkpoint_path=checkpoint_file)
 
-    for i, query in enumerate(queries):
-        log_info(f"🔍 [{i+1}/{len(queries)}] '{query}' 처리 중...")
-        query_results = search_naver_news_single(query, client_id, client_secret, start_date)
-        
-        if query_results:
-            df_temp = pd.DataFrame(query_results)
-            # 언론사 필터링 적용
-            if filter_domains:
-                df_temp = df_temp[df_temp["매체명"].apply(lambda x: any(d in x for d in filter_domains))]
-            
-            # 실시간 파일 쓰기 (mode='a')
-            is_first = not os.path.exists(output_file)
-            df_temp.to_csv(output_file, mode='a', index=False, header=is_first, encoding="utf-8-sig")
-
-    # --- 모든 수집 완료 후 최종 정제 ---
-    if os.path.exists(output_file):
-        final_df = pd.read_csv(output_file, encoding="utf-8-sig")
-        
-        # 중복 제거 (URL 기준) 및 네이버 뉴스 필터링
-        final_df = final_df.drop_duplicates(subset=["URL"])
-        final_df = final_df[final_df["URL"].str.contains("n.news.naver.com", na=False)].reset_index(drop=True)
-        
-        # Step 1에서 기대하는 최종 컬럼 구조로 재편성
-        df_out = pd.DataFrame({
-            "구분": "",
-            "키워드": final_df["검색어"],
-            "일자": final_df["날짜"],
-            "헤드라인": final_df["제목"],
-            "요약": final_df["요약"],
-            "매체명": final_df["매체명"],
-            "URL": final_df["URL"]
-        })
-        df_out["row_id"] = df_out.index
-        df_out.to_csv(output_file, index=False, encoding="utf-8-sig")
-        log_info(f"✅ Step 0 완료: 총 {len(df_out)}건 최종 저장")
+    # 증분 모드: 워터마크 이후 기사만 수집하므로 같은 날 기존 결과에 병합 (URL 중복 제외)
+    # 일반 모드: 하루치 전체를 다시 수집하므로 기존 파일 삭제 (새로운 세션 시작)
+    if NAVER_INCREMENTAL:
+        seeded = accumulator.seed(read_frame(output_dir, STEP0_RAW))
+        if seeded: log_info(f"📎 같은 날 기존 수집 결과 {seeded}건에 새 기사 병합")
+    else:
+        remove_frame(output_dir, STEP0_RAW)
+    resumed = accumulator.resume()
+    if resumed:
+        log_info(f"♻️ 체크포인트에서 {resumed}개 키워드 복원 ({len(accumulator.rows)}건)")
+        if on_rows and accumulator.rows: on_rows(list(accumulator.rows))
+    pending = [q for q in queries if q not in accumulator.done]
+
+    # 수율 기반 페이지 예산 배정 및 고수율 쿼리 우선 실행
+    yield_stats = page_scheduler.load_yield_stats()
+    pages = None
+    if NAVER_ADAPTIVE_PAGES:
+        pending, pages = page_scheduler.schedule_pages(pending, yield_stats, call_budget=NAVER_CALL_BUDGET or None)
+        log_info(f"📐 페이지 예산: {len(pending)}개 키워드, 최대 {sum(pages[q] for q in pending)}회 호출 예정")
+
+    # 쿼리별 워터마크 (증분 모드에서만 수집 경계로 사용, 기록은 항상 갱신)
+    watermarks = watermark_store.load_watermarks()
+    active_watermarks = watermarks if NAVER_INCREMENTAL else None
+    if NAVER_INCREMENTAL:
+        log_info(f"⏱️ 증분 수집 모드: 워터마크 {len(watermarks)}개 적용")
+
+    if NAVER_MAX_WORKERS > 1:
+        collected = collect_queries_concurrently(pending, client_id, client_secret, start_date,
+                                                 watermarks=active_watermarks, pages=pages)
+    else:
+        collected = collect_queries_serially(pending, client_id, client_secret, start_date,
+                                             watermarks=active_watermarks, pages=pages)
+
+    for query, query_results, newest, ok in collected:
+        added = accumulator.add(query, query_results, newest, ok)
+        if on_rows and added: on_rows(accumulator.rows[-added:])
+    if accumulator.failed:
+        log_error(f"⚠️ 요청 실패/한도 소진 키워드 {len(accumulator.failed)}개 - 완료로 기록하지 않음 (다음 실행 때 다시 수집)")
+
+    for query, newest in accumulator.done.items():
+        if newest:
+            watermarks[query] = watermark_store.merge(watermarks.get(query), newest)
+    watermark_store.save_watermarks(watermarks)
+    page_scheduler.save_yield_stats(page_scheduler.update_yield_stats(yield_stats, accumulator.query_hits))
+    naver_client().log_stats("Step 0")
+
+    # --- 모든 수집 완료 후 최종 저장 (1회, 원자적 교체) ---
+    if accumulator.raw_count:
+        df_out = accumulator.save(output_dir)
+        log_info(f"✅ Step 0 완료: 원본 {accumulator.raw_count}건 → 총 {len(df_out)}건 최종 저장")
     else:
+        # 남은 체크포인트가 다음 실행의 수집을 막지 않도록 삭제
+        accumulator.remove_checkpoint()
         log_error("❌ 수집된 데이터가 없습니다.")
 
 if __name__ == "__main__":
@@ -6,48 +6,133 @@ import sys
 import pandas as pd
 import html
 from utils.logger import log_info, log_error
-from utils.file_manager import get_today_folder, get_today_filename
-from utils.gpt_utils import analyze_articles_batch, deduplicate_news_with_gpt_twopass
-
-def _normalize_headline(s: pd.Series) -> pd.Series:
-    """중복 제거를 위한 제목 정규화"""
-    return (
-        s.fillna("")
-         .str.replace(r"\[.*?\]", "", regex=True)
-         .str.replace(r"\s+", " ", regex=True)
-         .str.strip()
-         .str.lower()
-    )
+from utils.file_manager import get_today_folder
+from utils.frame_store import read_frame_file, write_frame, find_frame, STEP0_RAW, STEP1_FILTERED, STEP1_LABELED, LABEL_SOURCE
+from utils.gpt_utils import analyze_articles_batch, deduplicate_news_with_gpt_twopass, LABEL_COLUMNS
+from utils.press_registry import PRESS_REGISTRY
+from utils.gpt_batch import remove_consumed
+from utils.local_dedup import local_dedupe, ambiguous_groups_order, normalize_headline
+from utils.story_index import StoryIndex, CLASSIFIED, DUPLICATE, headline_signatures
+from utils.pre_classifier import (
+    load_pre_classifier, split_by_confidence, save_label_history, IMPORTANT_SCORE,
+    SOURCE_GPT, SOURCE_LOCAL, SOURCE_REUSED, SOURCE_DUPLICATE,
+)
+
+# 0 이면 로컬 유사도 군집화 없이 전체 기사를 GPT 중복제거로 보냄
+LOCAL_DEDUP = os.getenv("LOCAL_DEDUP", "1") == "1"
+# 0 이면 이전 실행의 분석 결과(story_index)를 재사용하지 않음
+STORY_INDEX = os.getenv("STORY_INDEX", "1") == "1"
+# 0 이면 로컬 사전 분류기(hra_pre_classifier.py 로 학습) 없이 전체 기사를 GPT 분석
+PRECLASSIFIER = os.getenv("PRECLASSIFIER", "1") == "1"
+
+def _split_seen(df: pd.DataFrame, index: StoryIndex):
+    """(새 기사, 이전 분석 라벨을 채운 재사용 기사) 반환. 이전에 중복으로 제외된 기사는 버림"""
+    hits = index.lookup(df)
+    seen = hits["status"] == CLASSIFIED
+    dropped = hits["status"] == DUPLICATE
+    reused = df[seen].copy()
+    for col in LABEL_COLUMNS:
+        reused[col] = hits.loc[seen, "labels"].map(lambda labels: labels.get(col, "X"))
+    reused["중요도"] = hits.loc[seen, "score"].fillna(0).astype(int)
+    # 같은 기사가 여러 URL 로 다시 들어온 경우 1건만 유지
+    reused = reused[~headline_signatures(reused["헤드라인"]).duplicated() | reused["헤드라인"].isna()]
+    log_info(f"🗂️ 처리 이력 재사용: {int(seen.sum())}건 라벨 재사용, {int(dropped.sum())}건 기존 중복 제외, 신규 {int((~seen & ~dropped).sum())}건")
+    return df[~seen & ~dropped], reused
+
+def _local_prededupe(base: pd.DataFrame):
+    """로컬 유사도로 확정 중복 제거. (정리된 df, GPT 판단 대상 마스크) 반환"""
+    try:
+        kept, ambiguous = local_dedupe(base)
+    except ValueError as e:
+        # 헤드라인/요약이 모두 비어 어휘가 없는 경우 등
+        log_error(f"⚠️ 로컬 중복제거 건너뜀: {e}")
+        return base, pd.Series(True, index=base.index)
+    log_info(f"🧮 로컬 중복제거: {len(base)}건 → {len(kept)}건 (GPT 판단 대상 {int(ambiguous.sum())}건)")
+    return kept, ambiguous
 
 def _safe_twopass_dedupe(df: pd.DataFrame) -> pd.DataFrame:
-    """GPT 중복제거 실패 시 에러 없이 규칙 기반으로 전환"""
+    """로컬 군집화로 명확한 중복을 먼저 정리하고, 모호한 기사만 GPT 2패스. GPT 실패 시 규칙 기반으로 전환"""
     if df.empty: return df
     base = df.reset_index(drop=True).copy()
+    if LOCAL_DEDUP:
+        base, ambiguous = _local_prededupe(base)
+    else:
+        ambiguous = pd.Series(True, index=base.index)
+    base["__pos__"] = base.index
+    clear, target = base[~ambiguous], base[ambiguous]
+
     try:
-        return deduplicate_news_with_gpt_twopass(base)
+        if not target.empty:
+            # 유사 후보끼리 같은 배치에 들어가도록 정렬
+            target = target.iloc[ambiguous_groups_order(target)].reset_index(drop=True)
+            target = deduplicate_news_with_gpt_twopass(target).reindex(columns=base.columns)
     except Exception as e:
         log_error(f"⚠️ GPT 중복제거 중 오류 발생(건너뜀): {e}")
         # 폴백: URL 및 제목 기반 단순 중복 제거
-        fb = base.copy()
-        fb["__norm__"] = _normalize_headline(fb["헤드라인"])
+        fb = target.copy()
+        fb["__norm__"] = normalize_headline(fb["헤드라인"])
         fb = fb.drop_duplicates(subset=["URL"]).drop_duplicates(subset=["__norm__"])
-        return fb.drop(columns=["__norm__"]).reset_index(drop=True)
+        target = fb.drop(columns=["__norm__"])
+
+    merged = pd.concat([clear, target]).sort_values("__pos__")
+    return merged.drop(columns=["__pos__"]).reset_index(drop=True)
 
-def main():
+def _preclassify(df: pd.DataFrame):
+    """(GPT 분석 대상, 로컬 분류기로 확정한 기사) 반환. 학습된 모델이 없으면 전체가 GPT 대상"""
+    model = load_pre_classifier() if PRECLASSIFIER else None
+    if model is None or df.empty: return df, None
+    try:
+        uncertain, decided = split_by_confidence(model, df)
+    except Exception as e:
+        log_error(f"⚠️ 사전 분류 건너뜀: {e}")
+        return df, None
+    log_info(f"🧠 사전 분류: {len(df)}건 중 {len(decided)}건 로컬 확정, GPT 분석 대상 {len(uncertain)}건 "
+             f"(감사 표본 {uncertain.attrs.get('audit', 0)}건 포함)")
+    return uncertain, decided
+
+def _labeled_frame(gpt, decided, reused, duplicates):
+    """step1_labeled: 출처별 판정 전체 (GPT 라벨만 남기면 로컬 확정 기사가 빠져 학습 분포가 치우침)"""
+    parts = [(decided, SOURCE_LOCAL), (reused, SOURCE_REUSED), (duplicates, SOURCE_DUPLICATE)]
+    frames = [gpt.assign(**{LABEL_SOURCE: SOURCE_GPT})]
+    frames += [f.assign(**{LABEL_SOURCE: source}) for f, source in parts if f is not None and not f.empty]
+    return pd.concat(frames).sort_values("__order__").drop(columns=["__order__"])
+
+def stage_config():
+    """파이프라인 단계 캐시 키에 들어가는 설정 (모델/프롬프트/임계값이 바뀌면 Step 1 재실행)"""
+    from utils import gpt_utils, local_dedup, pre_classifier
+    from utils.stage_runner import file_digest
+    model_file = pre_classifier.PRE_CLASSIFIER_FILE
+    return {
+        "dedup": [gpt_utils.DEDUP_MODEL, gpt_utils.DEDUP_SYSTEM_PROMPT],
+        "analyze": [gpt_utils.ANALYZE_MODEL, gpt_utils.ANALYZE_PROMPT_VERSION],
+        "local_dedup": LOCAL_DEDUP and [local_dedup.DUPLICATE_THRESHOLD, local_dedup.AMBIGUOUS_THRESHOLD],
+        "story_index": STORY_INDEX,
+        "preclassifier": PRECLASSIFIER and os.path.exists(model_file) and [
+            file_digest(model_file), pre_classifier.PRECLASSIFY_LOW, pre_classifier.PRECLASSIFY_HIGH, pre_classifier.PRECLASSIFY_AUDIT_RATE,
+        ],
+    }
+
+def _emit_selected(on_selected, rows):
+    # 중요도가 확정된 행 중 최종 선별될 기사만 전달 (스트리밍 파이프라인의 본문 선수집용)
+    if on_selected is None or rows is None or rows.empty: return
+    selected = rows[rows["중요도"] >= IMPORTANT_SCORE]
+    if not selected.empty: on_selected(selected)
+
+def main(on_selected=None):
+    """on_selected: 선별이 확정되는 대로 해당 행(DataFrame)을 받는 콜백. 최종 결과 파일에는 영향 없음"""
     log_info("📄 Step 1: 중요 기사 선별 및 필터링 시작")
     today_folder = get_today_folder()
-    input_file = os.path.join(today_folder, get_today_filename("step0_raw.csv"))
-    output_file = os.path.join(today_folder, get_today_filename("step1_filtered.csv"))
 
     # 1. 파일 존재 여부 및 데이터 로드 체크
-    if not os.path.exists(input_file):
-        log_error(f"❌ 입력 파일이 없습니다: {input_file}")
+    input_file = find_frame(today_folder, STEP0_RAW)
+    if input_file is None:
+        log_error(f"❌ 입력 파일이 없습니다: {os.path.join(today_folder, STEP0_RAW)}")
         sys.exit(1)
 
     try:
-        df = pd.read_csv(input_file, encoding="utf-8-sig")
+        df = read_frame_file(input_file)
     except Exception as e:
-        log_error(f"❌ CSV 로드 실패: {e}")
+        log_error(f"❌ 입력 파일 로드 실패: {e}")
         sys.exit(1)
 
     # 2. 데이터가 0건이거나 URL 컬럼이 없을 때의 방어 (KeyError 방지 핵심)
@@ -55,54 +140,73 @@ def main():
         log_info("⚠️ 처리할 데이터가 0건입니다. 빈 결과 파일을 생성합니다.")
         # Step 2에서 기대하는 최소한의 컬럼 구조 생성
         empty_df = pd.DataFrame(columns=["구분", "키워드", "일자", "헤드라인", "요약", "매체명", "URL", "row_id", "중요도"])
-        empty_df.to_csv(output_file, index=False, encoding="utf-8-sig")
+        write_frame(empty_df, today_folder, STEP1_FILTERED)
         return
 
-    # 3. 언론사 매핑 (도메인 기반)
-    domain_to_korean = {
-        "www.chosun.com": "조선일보", "biz.chosun.com": "조선비즈", 
-        "www.hankyung.com": "한국경제", "www.mk.co.kr": "매일경제",
-        "www.edaily.co.kr": "이데일리", "www.mt.co.kr": "머니투데이",
-        "www.insnews.co.kr": "한국보험신문", "www.insjournal.co.kr": "보험저널",
-        "www.joins.com" : "중앙일보", "www.donga.com" : "동아일보",
-        "magazine.hankyung.com" : "매거진한경", "www.hani.co.kr" : "한겨레",
-        "www.hankookilbo.com" : "한국일보", "view.asiae.co.kr" : "아시아경제",
-        "heraldcorp.com" : "헤럴드경제", "www.fnnews.com" : "파이낸셜뉴스",
-        "mk.co.kr" : "매일경제", "www.sisain.co.kr" : "시사인", 
-        "weekly.chosun.com" : "주간조선", "insweek.co.kr" : "보험신보",
-        "www.khan.co.kr" : "경향신문", "weekly.khan.co.kr" : "주간경향", 
-        "weekly.donga.com" : "주간동아",  "mbn.mk.co.kr" : "매일경제",
-         "sports.donga.com" : "스포츠동아", "sports.khan.co.kr" : "경향스포츠"
-    }
-    df["매체명"] = df["매체명"].map(domain_to_korean).fillna(df["매체명"])
+    # 3. 언론사 매핑 (도메인 기반, press_registry 접미사 인덱스)
+    df["매체명"] = PRESS_REGISTRY.display_names(df["매체명"])
 
     # 4. 텍스트 정제 및 인덱스 초기화
     df["헤드라인"] = df["헤드라인"].apply(html.unescape)
     df = df.reset_index(drop=True)
 
+    # 4-1. 이전 실행에서 처리한 기사는 분석 결과 재사용 (GPT 대상에서 제외)
+    df["__order__"] = df.index
+    story_index = StoryIndex() if STORY_INDEX else None
+    reused = None
+    if story_index:
+        story_index.evict()
+        df, reused = _split_seen(df, story_index)
+        _emit_selected(on_selected, reused)
+
     # 5. GPT 중복 제거 (안전 래퍼)
+    before_dedupe = df
     df = _safe_twopass_dedupe(df)
+    duplicates = before_dedupe[~before_dedupe["URL"].isin(df["URL"])]
+    if story_index:
+        story_index.record(duplicates, DUPLICATE)
     
-    # 6. GPT 기사 분석 (중요도 판별)
+    # 6. GPT 기사 분석 (중요도 판별) - 사전 분류기가 확신하는 기사는 제외
+    df, decided = _preclassify(df)
+    _emit_selected(on_selected, decided)
     df = df.reset_index(drop=True)
     df["row_id"] = df.index # GPT 응답과 매칭을 위한 고정 ID
     
     log_info(f"🤖 GPT 분석 실행 중... (대상: {len(df)}건)")
     try:
-        df = analyze_articles_batch(df)
+        df = analyze_articles_batch(df, on_result=lambda rows: _emit_selected(on_selected, rows))
+        labeled = df.drop(index=df.attrs.get("gpt_failed", []), errors="ignore")
+        # 중요도 3 미만까지 포함한 판정 전체 (사전 분류기 학습 데이터, 로컬 확정/재사용/중복 사본은 라벨출처로 구분)
+        all_labeled = _labeled_frame(labeled, decided, reused, duplicates)
+        write_frame(all_labeled, today_folder, STEP1_LABELED)
+        save_label_history(all_labeled, os.path.basename(today_folder))
+        if story_index:
+            story_index.record(labeled, CLASSIFIED, LABEL_COLUMNS)
     except Exception as e:
         log_error(f"❌ GPT 분석 중 치명적 오류 발생: {e}")
         if "중요도" not in df.columns: df["중요도"] = 0
 
+    if story_index:
+        story_index.record(reused, CLASSIFIED, LABEL_COLUMNS)
+        if decided is not None:
+            story_index.record(decided, CLASSIFIED, LABEL_COLUMNS)
+        story_index.close()
+    extra = [f for f in (decided, reused) if f is not None and not f.empty]
+    if extra:
+        df = pd.concat([df, *extra]).sort_values("__order__").reset_index(drop=True)
+        df["row_id"] = df.index
+    df = df.drop(columns=["__order__"])
+
     # 7. 중요도 필터링 (중요도 3점 이상)
     if "중요도" in df.columns:
-        df = df[df["중요도"] >= 3].reset_index(drop=True)
+        df = df[df["중요도"] >= IMPORTANT_SCORE].reset_index(drop=True)
     
     log_info(f"✨ 필터링 완료: 최종 {len(df)}건 선별됨")
 
     # 8. 저장
-    df.to_csv(output_file, index=False, encoding="utf-8-sig")
+    output_file = write_frame(df, today_folder, STEP1_FILTERED)
     log_info(f"✅ Step 1 저장 완료: {output_file}")
+    remove_consumed()   # 결과에 반영된 Batch API 결과 파일 정리 (재시작 대비 보관은 저장 전까지만)
 
 if __name__ == "__main__":
     main()
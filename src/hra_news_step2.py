@@ -2,49 +2,110 @@
 
 
 
-import os, sys, pandas as pd, requests
-from bs4 import BeautifulSoup
+import os, pandas as pd
 from tqdm import tqdm
 from utils.logger import log_info, log_error
 from utils.file_manager import get_today_folder, get_today_filename
 from utils.google_sheet_utils import upload_to_google_sheet
-
-def get_naver_news_body(url):
-    headers = {"User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"}
-    try:
-        res = requests.get(url, headers=headers, timeout=10)
-        soup = BeautifulSoup(res.text, 'html.parser')
-        content = soup.select_one('#dic_area, #newsct_article, .article_body')
-        return content.get_text(separator="\n", strip=True) if content else "❌ 본문 미검출"
-    except: return "❌ 수집 실패"
-
-def main():
+from utils.http_client import get_http_client
+from utils.body_fetcher import iter_fetch_bodies, summarize, OK, NO_BODY
+from utils.body_cache import BodyCache
+from utils.fetch_checkpoint import FetchCheckpoint
+from utils.frame_store import read_frame, write_frame, STEP1_FILTERED, STEP2_FINAL
+
+FETCH_RESULTS_FILE = "step2_fetch_results.csv"   # URL별 수집 결과 (상태코드, 지연, 바이트, outcome, 오류)
+CHECKPOINT_FILE = "step2_checkpoint.jsonl"       # 완료된 URL별 결과 (중단 후 재실행 시 이어서 수집)
+# 0 이면 본문 캐시(data/state/body_cache.sqlite)를 쓰지 않음
+BODY_CACHE = os.getenv("BODY_CACHE", "1") == "1"
+# 0 이면 수집 체크포인트를 남기지 않음
+STEP2_CHECKPOINT = os.getenv("STEP2_CHECKPOINT", "1") == "1"
+
+def body_text(result):
+    """시트/CSV 의 본문 컬럼 값 (실패는 사람이 읽을 수 있는 표시)"""
+    if result["outcome"] == OK: return result["body"]
+    if result["outcome"] == NO_BODY: return "❌ 본문 미검출"
+    return "❌ 수집 실패"
+
+def open_checkpoint():
+    """URL별 결과는 완료 즉시 체크포인트에 추가 (중단 시 재실행하면 남은 URL 만 수집). STEP2_CHECKPOINT=0 이면 메모리에만 보관"""
+    checkpoint = FetchCheckpoint(os.path.join(get_today_folder(), CHECKPOINT_FILE) if STEP2_CHECKPOINT else None)
+    resumed = checkpoint.resume()
+    if resumed:
+        log_info(f"♻️ 체크포인트에서 {resumed}건 복원")
+    return checkpoint
+
+def stage_config():
+    """파이프라인 단계 캐시 키에 들어가는 설정 (바뀌면 Step 2 재실행)"""
+    from utils.html_extract import BODY_SELECTOR
+    from utils.google_sheet_utils import SHEET_SYNC_MODE
+    return {"body_selector": BODY_SELECTOR, "sheet_id": os.getenv("SHEET_ID"), "sheet_sync": SHEET_SYNC_MODE}
+
+def main(checkpoint=None):
+    """
+    checkpoint: 스트리밍 파이프라인이 미리 수집한 결과가 담긴 FetchCheckpoint (없으면 파일에서 복원).
+    시트 업로드에 실패하면 False 반환 (파이프라인이 다음 실행 때 이 단계를 다시 실행)
+    """
     today_folder = get_today_folder()
-    input_file = os.path.join(today_folder, get_today_filename("step1_filtered.csv"))
-    output_file = os.path.join(today_folder, get_today_filename("step2_final.csv"))
+    df = read_frame(today_folder, STEP1_FILTERED)
+    if df is None or df.empty or "URL" not in df.columns: return
 
-    if not os.path.exists(input_file): return
-    df = pd.read_csv(input_file, encoding="utf-8-sig")
-    if df.empty or "URL" not in df.columns: return
+    if checkpoint is None:
+        checkpoint = open_checkpoint()
+    pending = checkpoint.pending(df["URL"])
 
-    log_info("📰 본문 수집 중...")
-    bodies = []
-    for url in tqdm(df["URL"]):
-        bodies.append(get_naver_news_body(url))
+    cache = BodyCache() if BODY_CACHE else None
+    if cache is not None:
+        evicted = cache.evict()
+        if evicted: log_info(f"🧹 본문 캐시 {evicted}건 정리")
+
+    log_info(f"📰 본문 수집 중... ({len(pending)}건)")
+    try:
+        with tqdm(total=len(pending)) as bar:
+            for _, result in iter_fetch_bodies(pending, cache=cache):
+                checkpoint.add(result)
+                bar.update()
+    finally:
+        checkpoint.close()
+        if cache is not None:
+            cache.log_stats()
+            cache.close()
+
+    # 최종 파일은 체크포인트 결과로 마지막에 1회 조립 (본문은 체크포인트 파일에서 한 건씩 읽어 본문 컬럼에만 보관)
+    bodies, results = [], []
+    for url in df["URL"]:
+        result = checkpoint.get(url)
+        bodies.append(body_text(result))
+        result.pop("body")
+        results.append(result)
     df["본문"] = bodies
+    pd.DataFrame(results).to_csv(
+        os.path.join(today_folder, get_today_filename(FETCH_RESULTS_FILE)), index=False, encoding="utf-8-sig"
+    )
+    summary = summarize(results)
+    log_info(f"📊 본문 수집 결과: {summary['counts']} (평균 {summary['avg_latency']*1000:.0f}ms, {summary['bytes']/1024:.0f}KB)")
+    get_http_client().log_stats("Step 2")
 
     sheet_id = os.getenv("SHEET_ID")
 
     log_info(f"🔎 디버깅 - SHEET_ID: {sheet_id}")
     # log_info(f"🔎 디버깅 - SHEET_NAME: {sheet_name}")
 
+    uploaded = True
     if sheet_id:
         try:
             upload_to_google_sheet(df.drop(columns=['row_id'], errors='ignore'), sheet_id, "네이버API(첨부파일용)")
-        except Exception as e: log_error(f"❌ 시트 업로드 실패: {e}")
-
-    df.to_csv(output_file, index=False, encoding="utf-8-sig")
+        except Exception as e:
+            log_error(f"❌ 시트 업로드 실패: {e}")
+            uploaded = False
+
+    write_frame(df, today_folder, STEP2_FINAL)
+    # 업로드 실패 시 체크포인트를 남겨 재실행이 수집 없이 업로드만 다시 시도하도록 함
+    if uploaded or not checkpoint.path:
+        checkpoint.remove()
+    else:
+        checkpoint.close()
     log_info("✅ Step 2 최종 완료")
+    return uploaded
 
 if __name__ == "__main__":
     main()
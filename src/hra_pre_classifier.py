@@ -0,0 +1,60 @@
+# src/hra_pre_classifier.py - 과거 GPT 라벨로 로컬 사전 분류기 재학습 + 오프라인 평가 보고서
+
+import os
+import json
+import argparse
+from datetime import datetime
+from utils.logger import log_info, log_error
+from utils.pre_classifier import (
+    PreClassifier, load_training_data, evaluate, MIN_TRAIN_ROWS, PRE_CLASSIFIER_FILE, PRECLASSIFY_LOW, PRECLASSIFY_HIGH,
+)
+
+REPORT_FILE = os.path.join("data", "state", "pre_classifier_report.json")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Step 1 로컬 사전 분류기 재학습 / 평가")
+    parser.add_argument("--lookback", type=int, default=90, help="학습에 쓸 최근 실행 수")
+    parser.add_argument("--test-days", type=int, default=7, help="평가용으로 떼어 둘 최근 실행 수")
+    parser.add_argument("--low", type=float, nargs="+", default=[0.02, 0.05, 0.1, 0.2], help="평가할 비중요 임계값")
+    parser.add_argument("--high", type=float, default=PRECLASSIFY_HIGH, help="확정 양성 임계값 (1.0 이면 사용 안 함)")
+    parser.add_argument("--dry-run", action="store_true", help="평가만 하고 모델은 저장하지 않음")
+    args = parser.parse_args(argv)
+
+    data = load_training_data(lookback_days=args.lookback)
+    days = sorted(data["day"].unique())
+    log_info(f"📚 학습 데이터 {len(data)}건 ({len(days)}일, 중요 {int(data['important'].sum())}건, 정식 라벨 {int(data['labeled'].sum())}건)")
+    if len(data) < MIN_TRAIN_ROWS or data["important"].nunique() < 2:
+        log_error(f"❌ 학습 데이터 부족 (최소 {MIN_TRAIN_ROWS}건, 중요/비중요 모두 필요)")
+        return
+
+    # 날짜 기준 분할: 최근 test_days 일로 평가 (미래 기사 예측 상황 재현)
+    test_days = set(days[-args.test_days:]) if len(days) > args.test_days else set(days[-1:])
+    train, test = data[~data["day"].isin(test_days)], data[data["day"].isin(test_days)]
+    report = {"created": datetime.now().strftime("%Y-%m-%dT%H:%M:%S"), "train_rows": len(train), "test_rows": len(test),
+              "test_days": sorted(test_days), "current_low": PRECLASSIFY_LOW, "results": []}
+    if len(train) >= MIN_TRAIN_ROWS and train["important"].nunique() == 2:
+        model = PreClassifier().fit(train)
+        report["results"] = evaluate(model, test, thresholds=args.low, high=args.high)
+        log_info(f"🧪 평가 ({len(test)}건, 중요 {int(test['important'].sum())}건)")
+        for r in report["results"]:
+            extra = f", 확정 양성 정밀도 {r['positive_precision']:.1%}" if r["positive_precision"] is not None else ""
+            extra += f", 라벨 일치율 {r['label_agreement']:.1%}" if "label_agreement" in r else ""
+            log_info(
+                f"   LOW={r['low']:.2f}: GPT 생략 {r['skipped']:.1%}, 중요 기사 누락 {r['missed_important']}건 ({r['miss_rate']:.1%})"
+                + (f", 비중요 정밀도 {r['negative_precision']:.1%}" if r["negative_precision"] is not None else "") + extra
+            )
+    else:
+        log_info("⚠️ 평가 구간을 떼면 학습 데이터가 부족해 평가를 건너뜀")
+
+    os.makedirs(os.path.dirname(REPORT_FILE), exist_ok=True)
+    with open(REPORT_FILE, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=1)
+    log_info(f"📝 평가 보고서 저장: {REPORT_FILE}")
+
+    if not args.dry_run:
+        # 배포 모델은 평가 구간까지 포함한 전체 데이터로 학습
+        PreClassifier().fit(data).save()
+        log_info(f"✅ 사전 분류기 저장: {PRE_CLASSIFIER_FILE}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,35 @@
+# src/hra_query_planner.py - 과거 step0 이력으로 중복 쿼리를 분석해 data/state/query_plan.json 생성 (main_pipeline 이 실행 후 자동 호출)
+
+import argparse
+from utils.logger import log_info
+from utils.query_planner import load_query_history, build_query_plan, save_query_plan, QUERY_PLAN_FILE
+from hra_news_step0 import QUERIES
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Naver 검색 쿼리 실행 계획 생성")
+    parser.add_argument("--lookback", type=int, default=14, help="분석할 최근 실행 수")
+    parser.add_argument("--min-runs", type=int, default=3, help="판단에 필요한 최소 이력 수")
+    parser.add_argument("--coverage", type=float, default=0.95, help="건너뛰기 기준 포함률")
+    parser.add_argument("--low-yield", type=float, default=0.5, help="후순위 기준 평균 고유 기사 수")
+    parser.add_argument("--dry-run", action="store_true", help="보고서만 출력하고 계획 파일은 저장하지 않음")
+    args = parser.parse_args(argv)
+
+    history = load_query_history(lookback_days=args.lookback)
+    log_info(f"📚 수집 이력 {len(history)}회 분석 ({', '.join(history) or '없음'})")
+    plan = build_query_plan(QUERIES, history, min_runs=args.min_runs, coverage=args.coverage, low_yield=args.low_yield)
+
+    for query, info in plan["skip"].items():
+        log_info(f"⏭️ 건너뜀 '{query}' (포함률 {info['coverage']:.0%}, 흡수: {', '.join(info['covered_by']) or '-'})")
+    log_info(f"🐢 후순위 {len(plan['deprioritize'])}개: {', '.join(plan['deprioritize'][:20])}")
+    saved = plan["estimated_calls_before"] - plan["estimated_calls_after"]
+    log_info(
+        f"📉 쿼리 {len(set(QUERIES))}개 → {len(plan['order'])}개, "
+        f"예상 API 호출 {plan['estimated_calls_before']}회 → {plan['estimated_calls_after']}회 ({saved}회 절감)"
+    )
+
+    if not args.dry_run:
+        save_query_plan(plan)
+        log_info(f"✅ 수집 계획 저장: {QUERY_PLAN_FILE}")
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,171 @@
-from hra_news_step0 import main as step0_main
-from hra_news_step1 import main as step1_main
-from hra_news_step2 import main as step2_main
+# 단계 모듈은 실행 직전에 import (앞 단계가 뒤 단계의 무거운 의존성 import 비용을 먼저 치르지 않도록)
+#
+# 단계별로 입력 파일 + 설정(검색어/프롬프트/모델 등)의 내용 해시를 data/<날짜>/pipeline_state.json 에 기록하고,
+# 다시 실행하면 결과가 유효한 단계는 건너뛰고 첫 무효 단계부터 재개한다 (예: 시트 업로드 실패 → Step 2 만 재실행).
+#   python main_pipeline.py                 # 무효 단계부터 실행
+#   python main_pipeline.py --from step1    # step1 부터 강제 재실행
+#   python main_pipeline.py --only step2    # step2 만 강제 실행
+#   python main_pipeline.py --status        # 단계별 유효 여부만 출력
+#
+# Step 0 은 입력 파일이 없어 설정이 같으면 계속 유효하므로, 마지막 수집 후 STEP0_MAX_AGE_MINUTES 가 지나면 다시 수집한다
+# (시간 단위/증분 재실행이 수집을 건너뛰지 않도록. 0 이면 매번 수집)
+#
+# 파이프라인이 끝나면 data/state 의 누적 이력으로 다음 실행 설정을 갱신한다
+#   - 수집 계획(query_plan.json): 매 실행 (QUERY_PLAN_REFRESH=0 이면 안 함)
+#   - 사전 분류기: PRE_CLASSIFIER_RETRAIN_DAYS 일보다 오래됐을 때(또는 없을 때) 재학습
+#
+# PIPELINE_MODE=staged (기본): 단계를 차례로 실행
+# PIPELINE_MODE=stream: 단계는 staged 와 똑같이 차례로 실행하고, Step 2 의 본문 수집만 앞 단계와 겹친다
+#   - Step 0 수집 중: 이전 실행에서 이미 중요 기사로 분석된 기사(story_index 에 있는 기사)만 미리 수집
+#   - Step 1 분석 중: 캐시 적중/사전 분류/GPT 배치 완료로 중요도가 확정된 기사
+#   Step 1 은 Step 0 이 끝난 뒤 시작한다 (중복 제거가 하루치 전체 기사를 비교하므로 창 단위로 나눠 흘려보내지 않음).
+#   그래서 새 기사의 본문은 대부분 Step 1 분석 중에 받게 되며, 단축 폭은 본문 수집 시간 안에서만 생긴다
+#   (모의 서버 150건 기준 13.5s → 11.5s). 결과는 Step 2 체크포인트로 넘어가므로 최종 파일은 staged 와 동일
+
+import os
+import sys
+import time
+import argparse
+import importlib
+
+PIPELINE_MODE = os.getenv("PIPELINE_MODE", "staged")
+STEP0_MAX_AGE_MINUTES = float(os.getenv("STEP0_MAX_AGE_MINUTES", "60"))
+STAGE_NAMES = ["step0", "step1", "step2"]
+PRE_CLASSIFIER_RETRAIN_DAYS = float(os.getenv("PRE_CLASSIFIER_RETRAIN_DAYS", "7"))   # 0 이면 파이프라인에서 재학습하지 않음
+QUERY_PLAN_REFRESH = os.getenv("QUERY_PLAN_REFRESH", "1") == "1"
+
+def step0_main(**kwargs):
+    from hra_news_step0 import main
+    return main(**kwargs)
+
+def step1_main(**kwargs):
+    from hra_news_step1 import main
+    return main(**kwargs)
+
+def step2_main(**kwargs):
+    from hra_news_step2 import main
+    return main(**kwargs)
+
+def _stage_config(module):
+    return lambda: importlib.import_module(module).stage_config()
+
+def build_runner():
+    from utils.file_manager import get_today_folder
+    from utils.stage_runner import Stage, StageRunner
+    from utils.frame_store import find_frame, frame_path, STEP0_RAW, STEP1_FILTERED, STEP2_FINAL
+    folder = get_today_folder()
+    # 단계 결과 파일은 실행 시점에 찾음 (설정 형식 파일이 없으면 CSV 등 이전 형식 결과)
+    raw, filtered, final = (lambda name=name: find_frame(folder, name) or frame_path(folder, name)
+                            for name in (STEP0_RAW, STEP1_FILTERED, STEP2_FINAL))
+    return StageRunner([
+        Stage("step0", step0_main, outputs=[raw], config=_stage_config("hra_news_step0"), max_age=STEP0_MAX_AGE_MINUTES * 60),
+        Stage("step1", step1_main, inputs=[raw], outputs=[filtered], config=_stage_config("hra_news_step1")),
+        Stage("step2", step2_main, inputs=[filtered], outputs=[final], config=_stage_config("hra_news_step2")),
+    ], folder)
+
+def _known_important():
+    """Step 0 행 → 이전 실행에서 중요 기사로 분석된 URL (story_index 조회). (콜백, 닫기 함수) 반환"""
+    import html
+    import pandas as pd
+    from hra_news_step1 import STORY_INDEX
+    from utils.story_index import StoryIndex, CLASSIFIED
+    from utils.pre_classifier import IMPORTANT_SCORE
+    if not STORY_INDEX: return (lambda rows: []), (lambda: None)
+    index = StoryIndex()
+
+    def lookup(rows):
+        df = pd.DataFrame(rows)
+        df["헤드라인"] = df["헤드라인"].map(html.unescape)   # Step 1 과 같은 정제 후 조회
+        hits = index.lookup(df)
+        return df.loc[(hits["status"] == CLASSIFIED) & (hits["score"].fillna(0) >= IMPORTANT_SCORE), "URL"].tolist()
+    return lookup, index.close
+
+def run_streaming(runner, start=None):
+    """
+    Step 0 → Step 1 을 차례로 실행하면서 각 단계가 확정한 기사의 본문만 미리 수집한 뒤 Step 2 (단계끼리는 겹치지 않음).
+    Step 0/1 이 모두 유효하면 일반 실행과 같음.
+    각 단계의 유효 여부는 일반 실행처럼 앞 단계가 끝난 뒤 내용 해시로 판단 (Step 0 결과가 같으면 Step 1 은 건너뜀)
+    """
+    from utils.logger import log_info, log_error
+    with_step0 = runner.needs_run("step0", start)
+    if not with_step0 and not runner.needs_run("step1", start):
+        return runner.run(start=start)
+
+    import hra_news_step2
+    from utils.body_cache import BodyCache
+    from utils.body_prefetch import BodyPrefetcher
+    checkpoint = hra_news_step2.open_checkpoint()
+    prefetcher = BodyPrefetcher(checkpoint, cache=BodyCache() if hra_news_step2.BODY_CACHE else None)
+    try:
+        if with_step0:
+            known, close_index = _known_important()
+            log_info("▶️ [step0] 실행 (본문 선수집 병행)")
+            runner.invalidate("step0")
+            try:
+                step0_main(on_rows=lambda rows: prefetcher.submit(known(rows)))
+            finally:
+                close_index()
+            runner.record("step0")
+        else:
+            log_info("⏭️ [step0] 입력/설정 변경 없음 - 건너뜀")
+        if runner.needs_run("step1", start):
+            log_info("▶️ [step1] 실행 (본문 선수집 병행)")
+            runner.invalidate("step1")
+            step1_main(on_selected=lambda rows: prefetcher.submit(rows["URL"]))
+            runner.record("step1")
+        else:
+            log_info("⏭️ [step1] 입력/설정 변경 없음 - 건너뜀")
+    finally:
+        prefetcher.close()
+    if not runner.needs_run("step2", start):
+        log_info("⏭️ [step2] 입력/설정 변경 없음 - 건너뜀")
+        checkpoint.remove()   # 선수집했지만 쓰이지 않은 결과 (다음 Step 2 실행이 낡은 본문을 복원하지 않도록)
+        return True
+    log_info("▶️ [step2] 실행")
+    runner.invalidate("step2")
+    if step2_main(checkpoint=checkpoint) is False:
+        log_error("❌ [step2] 미완료 - 다음 실행 때 이 단계부터 다시 실행")
+        return False
+    runner.record("step2")
+    return True
+
+def _older_than(path, days):
+    return not os.path.exists(path) or time.time() - os.path.getmtime(path) > days * 86400
+
+def run_maintenance():
+    """파이프라인 완료 후 누적 이력으로 로컬 모델 갱신 (실패해도 파이프라인 결과에는 영향 없음)"""
+    from utils.logger import log_info, log_error
+    from utils.pre_classifier import PRE_CLASSIFIER_FILE
+    if QUERY_PLAN_REFRESH:
+        try:
+            importlib.import_module("hra_query_planner").main([])
+        except Exception as e:
+            log_error(f"⚠️ 수집 계획 갱신 실패: {e}")
+    if PRE_CLASSIFIER_RETRAIN_DAYS > 0 and _older_than(PRE_CLASSIFIER_FILE, PRE_CLASSIFIER_RETRAIN_DAYS):
+        log_info("🧠 사전 분류기 재학습")
+        try:
+            importlib.import_module("hra_pre_classifier").main([])
+        except Exception as e:
+            log_error(f"⚠️ 사전 분류기 재학습 실패: {e}")
+
+def main():
+    parser = argparse.ArgumentParser(description="뉴스 수집 → 선별 → 본문/시트 파이프라인")
+    parser.add_argument("--from", dest="start", choices=STAGE_NAMES, help="이 단계부터 결과와 무관하게 다시 실행")
+    parser.add_argument("--only", choices=STAGE_NAMES, help="이 단계만 실행")
+    parser.add_argument("--status", action="store_true", help="단계별 결과 유효 여부만 출력")
+    args = parser.parse_args()
+
+    runner = build_runner()
+    if args.status:
+        for name, valid, finished in runner.status():
+            print(f"{name}: {'✅ 유효' if valid else '⏳ 재실행 필요'}" + (f" (마지막 완료 {finished})" if finished else ""))
+        return
+    if PIPELINE_MODE == "stream" and args.only is None:
+        ok = run_streaming(runner, args.start)
+    else:
+        ok = runner.run(start=args.start, only=args.only)
+    if not ok: sys.exit(1)
+    run_maintenance()
 
 if __name__ == "__main__":
-    step0_main()
-    step1_main()
-    step2_main()
+    main()
@@ -0,0 +1,103 @@
+# src/utils/body_cache.py - URL 기준 기사 본문 캐시 (SQLite + zlib 압축, ETag/Last-Modified 재검증, TTL + 용량 LRU)
+
+import os
+import zlib
+import time
+import sqlite3
+import threading
+from utils.logger import log_info
+
+BODY_CACHE_FILE = os.path.join("data", "state", "body_cache.sqlite")
+BODY_CACHE_TTL_HOURS = float(os.getenv("BODY_CACHE_TTL_HOURS", "24"))   # 이 시간 안에는 요청 없이 재사용
+BODY_CACHE_MAX_DAYS = float(os.getenv("BODY_CACHE_MAX_DAYS", "14"))     # 재검증용 보관 기간
+BODY_CACHE_MAX_MB = float(os.getenv("BODY_CACHE_MAX_MB", "200"))        # 압축 본문 총 용량 상한
+
+class BodyCache:
+    """{url: (outcome, 본문, etag, last_modified, fetched)}. 스레드 간 공유 (연결 1개 + 잠금)"""
+
+    def __init__(self, path=BODY_CACHE_FILE, ttl_hours=BODY_CACHE_TTL_HOURS, max_days=BODY_CACHE_MAX_DAYS,
+                 max_mb=BODY_CACHE_MAX_MB):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS bodies (url TEXT PRIMARY KEY, outcome TEXT, body BLOB, etag TEXT,"
+            " last_modified TEXT, size INTEGER, fetched REAL, accessed REAL)"
+        )
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_body_accessed ON bodies(accessed)")
+        self.ttl = ttl_hours * 3600
+        self.max_age = max_days * 86400
+        self.max_bytes = int(max_mb * 1024 * 1024)
+        self._lock = threading.Lock()
+        self.stats = {"hit": 0, "revalidated": 0, "miss": 0}
+
+    def get(self, url):
+        """캐시 항목 dict (없으면 None). fresh=True 면 TTL 이내라 요청 없이 사용 가능"""
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT outcome, body, etag, last_modified, fetched FROM bodies WHERE url = ?", (url,)
+            ).fetchone()
+            if row is None: return None
+            now = time.time()
+            self.conn.execute("UPDATE bodies SET accessed = ? WHERE url = ?", (now, url))
+        outcome, body, etag, last_modified, fetched = row
+        return {
+            "outcome": outcome, "body": zlib.decompress(body).decode("utf-8") if body else None,
+            "etag": etag, "last_modified": last_modified, "fresh": now - fetched < self.ttl,
+        }
+
+    def validators(self, entry):
+        """조건부 요청 헤더 (If-None-Match / If-Modified-Since)"""
+        headers = {}
+        if entry and entry.get("etag"): headers["If-None-Match"] = entry["etag"]
+        if entry and entry.get("last_modified"): headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def put(self, url, outcome, body, etag=None, last_modified=None):
+        blob = zlib.compress(body.encode("utf-8"), 6) if body else None
+        now = time.time()
+        with self._lock:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO bodies (url, outcome, body, etag, last_modified, size, fetched, accessed)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (url, outcome, blob, etag, last_modified, len(blob or b""), now, now),
+            )
+            self.conn.commit()
+
+    def touch(self, url):
+        """304 재검증 성공: 신선도 갱신"""
+        now = time.time()
+        with self._lock:
+            self.conn.execute("UPDATE bodies SET fetched = ?, accessed = ? WHERE url = ?", (now, now, url))
+            self.conn.commit()
+
+    def record(self, kind):
+        with self._lock:
+            self.stats[kind] += 1
+
+    def evict(self):
+        """보관 기간이 지난 항목 삭제 후, 총 용량이 상한을 넘으면 가장 오래 안 쓰인 순(LRU)으로 삭제"""
+        with self._lock:
+            removed = self.conn.execute("DELETE FROM bodies WHERE fetched < ?", (time.time() - self.max_age,)).rowcount
+            total = self.conn.execute("SELECT COALESCE(SUM(size), 0) FROM bodies").fetchone()[0]
+            if total > self.max_bytes:
+                excess = total - self.max_bytes
+                victims, freed = [], 0
+                for url, size in self.conn.execute("SELECT url, size FROM bodies ORDER BY accessed"):
+                    if freed >= excess: break
+                    victims.append((url,))
+                    freed += size
+                self.conn.executemany("DELETE FROM bodies WHERE url = ?", victims)
+                removed += len(victims)
+            self.conn.commit()
+        return removed
+
+    def log_stats(self, label="본문 캐시"):
+        s = self.stats
+        total = sum(s.values())
+        rate = (s["hit"] + s["revalidated"]) / total if total else 0
+        log_info(f"💾 [{label}] 적중 {s['hit']}건 / 재검증(304) {s['revalidated']}건 / 미적중 {s['miss']}건 (재사용률 {rate:.0%})")
+
+    def close(self):
+        with self._lock:
+            self.conn.commit()
+            self.conn.close()
@@ -0,0 +1,124 @@
+# src/utils/body_fetcher.py - 기사 본문 동시 수집 (호스트별 동시성/속도 제한 + 재시도, URL별 구조화 결과)
+
+import os
+import time
+import random
+import threading
+import urllib.parse
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import requests
+from utils.http_client import get_http_client
+from utils.html_extract import extract_body_text
+from utils.rate_limiter import TokenBucket
+
+BODY_MAX_WORKERS = int(os.getenv("BODY_MAX_WORKERS", "8"))           # 1 이면 순차 수집
+BODY_HOST_CONCURRENCY = int(os.getenv("BODY_HOST_CONCURRENCY", "4"))  # 호스트당 동시 요청 수
+BODY_HOST_QPS = float(os.getenv("BODY_HOST_QPS", "5"))                # 호스트당 초당 요청 수
+BODY_RETRIES = int(os.getenv("BODY_RETRIES", "2"))                    # 본문 전송 중 끊김 재시도 횟수
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
+
+# 결과 outcome: ok(본문 추출) / no_body(본문 영역 없음) / http_error(4xx/5xx) / fetch_error(네트워크 오류)
+OK, NO_BODY, HTTP_ERROR, FETCH_ERROR = "ok", "no_body", "http_error", "fetch_error"
+# 연결/읽기 타임아웃/429·5xx 는 HTTP 클라이언트(urllib3 Retry)가 이미 재시도하므로, 여기서는 응답 본문 수신 중 끊긴 경우만 재시도
+TRANSIENT_ERRORS = (requests.exceptions.ChunkedEncodingError, requests.exceptions.ContentDecodingError)
+
+class HostLimits:
+    """호스트별 세마포어(동시 요청 수) + 토큰 버킷(초당 요청 수)"""
+
+    def __init__(self, concurrency=BODY_HOST_CONCURRENCY, qps=BODY_HOST_QPS):
+        self.concurrency = concurrency
+        self.qps = qps
+        self._hosts = {}
+        self._lock = threading.Lock()
+
+    def get(self, url):
+        host = urllib.parse.urlparse(url).netloc
+        with self._lock:
+            if host not in self._hosts:
+                self._hosts[host] = (threading.BoundedSemaphore(max(1, self.concurrency)), TokenBucket(self.qps))
+            return self._hosts[host]
+
+def fetch_body(url, limits=None, client=None, retries=BODY_RETRIES, cache=None):
+    """
+    URL 1건 수집. {"url", "status", "latency", "bytes", "outcome", "body", "error", "attempts", "cache"} 반환 (예외 없음).
+    cache(BodyCache)가 있으면 TTL 이내 항목은 요청 없이 사용(hit), 지난 항목은 조건부 요청으로 재검증(304 → revalidated)
+    """
+    client = client or get_http_client()
+    result = {"url": url, "status": None, "latency": 0.0, "bytes": 0, "outcome": FETCH_ERROR, "body": None, "error": None,
+              "attempts": 0, "cache": None}
+    entry = cache.get(url) if cache is not None else None
+    if entry and entry["fresh"]:
+        cache.record("hit")
+        result.update(outcome=entry["outcome"], body=entry["body"], cache="hit")
+        return result
+    headers = {"User-Agent": USER_AGENT, **(cache.validators(entry) if cache is not None else {})}
+    semaphore, bucket = (limits or HostLimits()).get(url)
+    for attempt in range(retries + 1):
+        result["attempts"] = attempt + 1
+        try:
+            with semaphore:
+                bucket.acquire()
+                res = client.get(url, headers=headers)
+            result.update(status=res.status_code, latency=res.latency, bytes=res.bytes, error=None)
+            if res.status_code == 304 and entry:
+                cache.touch(url)
+                cache.record("revalidated")
+                result.update(outcome=entry["outcome"], body=entry["body"], cache="revalidated")
+                return result
+            if res.status_code >= 400:
+                result["outcome"] = HTTP_ERROR
+                return result
+            body = extract_body_text(res.content, res.headers.get("Content-Type"))
+            result.update(outcome=OK if body else NO_BODY, body=body)
+            if cache is not None:
+                cache.put(url, result["outcome"], body, res.headers.get("ETag"), res.headers.get("Last-Modified"))
+                cache.record("miss")
+                result["cache"] = "miss"
+            return result
+        except TRANSIENT_ERRORS as e:
+            result["error"] = f"{type(e).__name__}: {e}"
+            if attempt < retries:
+                time.sleep(min(10, 2 ** attempt) + random.uniform(0, 0.5))
+        except Exception as e:
+            result["error"] = f"{type(e).__name__}: {e}"
+            return result
+    return result
+
+def iter_fetch_bodies(urls, max_workers=BODY_MAX_WORKERS, limits=None, cache=None):
+    """URL 목록 동시 수집. 완료되는 대로 (입력 위치, fetch_body 결과) 를 yield (순서 무관)"""
+    urls = list(urls)
+    limits = limits or HostLimits()
+    client = get_http_client()
+    if max_workers <= 1 or len(urls) <= 1:
+        for i, url in enumerate(urls):
+            yield i, fetch_body(url, limits, client, cache=cache)
+        return
+    pool = ThreadPoolExecutor(max_workers=max_workers)
+    try:
+        futures = {pool.submit(fetch_body, url, limits, client, cache=cache): i for i, url in enumerate(urls)}
+        for future in as_completed(futures):
+            yield futures[future], future.result()
+    finally:
+        # 중단(Ctrl+C 등) 시 아직 시작하지 않은 요청은 취소
+        pool.shutdown(wait=True, cancel_futures=True)
+
+def fetch_bodies(urls, max_workers=BODY_MAX_WORKERS, limits=None, progress=None, cache=None):
+    """URL 목록 동시 수집. 입력 순서대로 fetch_body 결과 리스트 반환 (progress: 건별 호출되는 콜백)"""
+    urls = list(urls)
+    results = [None] * len(urls)
+    for i, result in iter_fetch_bodies(urls, max_workers, limits, cache):
+        results[i] = result
+        if progress: progress(result)
+    return results
+
+def summarize(results):
+    """outcome 별 건수 / 평균 지연 / 총 바이트"""
+    counts = {}
+    for r in results:
+        counts[r["outcome"]] = counts.get(r["outcome"], 0) + 1
+    latencies = [r["latency"] for r in results if r["status"] is not None]
+    return {
+        "counts": counts,
+        "avg_latency": sum(latencies) / len(latencies) if latencies else 0.0,
+        "bytes": sum(r["bytes"] for r in results),
+    }
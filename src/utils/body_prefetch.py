@@ -0,0 +1,67 @@
+# src/utils/body_prefetch.py - stream 모드용 본문 선수집기 (Step 0/1 진행 중 확정된 기사만. bounded 큐 + 작업 스레드, 결과는 Step 2 체크포인트에 기록)
+
+import os
+import queue
+import threading
+from utils.logger import log_info, log_error
+from utils.body_fetcher import fetch_body, HostLimits, BODY_MAX_WORKERS, FETCH_ERROR
+from utils.http_client import get_http_client
+
+PIPELINE_QUEUE_SIZE = int(os.getenv("PIPELINE_QUEUE_SIZE", "64"))   # 대기 URL 상한 (가득 차면 앞 단계가 대기)
+
+class BodyPrefetcher:
+    """
+    앞 단계가 선별을 확정한 기사 URL 을 submit 으로 받아 백그라운드에서 본문 수집.
+    큐가 가득 차면 submit 이 블록되어 앞 단계 속도를 본문 수집 속도에 맞춤(back-pressure)
+    """
+
+    def __init__(self, checkpoint, cache=None, max_workers=BODY_MAX_WORKERS, queue_size=PIPELINE_QUEUE_SIZE):
+        self.checkpoint = checkpoint
+        self.cache = cache
+        self.queue = queue.Queue(maxsize=max(1, queue_size))
+        self.limits = HostLimits()
+        self.client = get_http_client()
+        self.submitted = set(checkpoint.outcomes)
+        self.fetched = 0
+        self._lock = threading.Lock()
+        self._workers = [threading.Thread(target=self._work, daemon=True) for _ in range(max(1, max_workers))]
+        for worker in self._workers:
+            worker.start()
+
+    def submit(self, urls):
+        """아직 요청하지 않은 URL 만 큐에 추가 (큐가 가득 차면 대기)"""
+        for url in urls:
+            with self._lock:
+                if url in self.submitted: continue
+                self.submitted.add(url)
+            self.queue.put(url)
+
+    def _work(self):
+        while True:
+            url = self.queue.get()
+            if url is None: return
+            # 예외로 작업 스레드가 끝나면 남은 URL 과 종료 신호(None)가 처리되지 않으므로 URL 단위로 잡아 FETCH_ERROR 로 기록
+            try:
+                result = fetch_body(url, self.limits, self.client, cache=self.cache)
+            except Exception as e:
+                log_error(f"⚠️ 본문 선수집 실패: {url} - {e}")
+                result = {"url": url, "status": None, "latency": 0.0, "bytes": 0, "outcome": FETCH_ERROR, "body": None,
+                          "error": f"{type(e).__name__}: {e}", "attempts": 0, "cache": None}
+            try:
+                with self._lock:
+                    self.checkpoint.add(result)
+                    self.fetched += 1
+            except Exception as e:
+                log_error(f"⚠️ 본문 선수집 결과 기록 실패: {url} - {e}")
+
+    def close(self):
+        """남은 URL 을 모두 수집한 뒤 작업 스레드 종료"""
+        for _ in self._workers:
+            self.queue.put(None)
+        for worker in self._workers:
+            worker.join()
+        self.checkpoint.close()
+        if self.cache is not None:
+            self.cache.log_stats("본문 캐시(선수집)")
+            self.cache.close()
+        log_info(f"🚚 본문 선수집: {self.fetched}건")
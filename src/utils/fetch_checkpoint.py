@@ -0,0 +1,87 @@
+# src/utils/fetch_checkpoint.py - Step 2 본문 수집 체크포인트 (URL별 결과를 완료 즉시 JSONL 에 추가, 재시작 시 이어서 수집)
+
+import os
+import json
+import tempfile
+from utils.body_fetcher import FETCH_ERROR, HTTP_ERROR
+from utils.http_client import RETRYABLE_STATUS
+
+def is_retryable(result):
+    """재시작 시 다시 수집할 결과 (네트워크 오류, 429/5xx 등 일시적 HTTP 오류)"""
+    if result["outcome"] == FETCH_ERROR: return True
+    status = result.get("status")
+    return result["outcome"] == HTTP_ERROR and (status is None or status in RETRYABLE_STATUS or status >= 500)
+
+class FetchCheckpoint:
+    """
+    URL별 fetch_body 결과. 메모리에는 {url: outcome} 과 파일 위치만 두고 본문은 파일에서 get 으로 다시 읽음.
+    path 가 없으면 익명 임시 파일에 기록 (닫히면 자동 삭제)
+    """
+
+    def __init__(self, path=None):
+        self.path = path
+        self.outcomes = {}
+        self._offsets = {}
+        self._file = None if path else tempfile.TemporaryFile("w+b")
+        self._reader = None
+
+    def resume(self):
+        """체크포인트가 있으면 재생해 완료된 URL 복원. 복원된 URL 수 반환"""
+        if not self.path or not os.path.exists(self.path): return 0
+        with open(self.path, "r+b") as f:
+            while True:
+                offset = f.tell()
+                line = f.readline()
+                if not line: break
+                try:
+                    result = json.loads(line)
+                except ValueError:
+                    f.truncate(offset)  # 기록 도중 중단된 마지막 줄 (이어 쓸 기록이 붙지 않도록 잘라냄)
+                    break
+                if is_retryable(result):
+                    self.outcomes.pop(result["url"], None)
+                    self._offsets.pop(result["url"], None)
+                else:
+                    self.outcomes[result["url"]] = result["outcome"]
+                    self._offsets[result["url"]] = offset
+        return len(self.outcomes)
+
+    def pending(self, urls):
+        """아직 완료되지 않은 URL (입력 순서 유지, 중복 제거)"""
+        return list(dict.fromkeys(url for url in urls if url not in self.outcomes))
+
+    def add(self, result):
+        if self._file is None:
+            self._file = open(self.path, "ab")
+        self._file.seek(0, os.SEEK_END)
+        offset = self._file.tell()
+        self._file.write(json.dumps(result, ensure_ascii=False).encode("utf-8") + b"\n")
+        self._file.flush()
+        self.outcomes[result["url"]] = result["outcome"]
+        self._offsets[result["url"]] = offset
+
+    def get(self, url):
+        """기록된 결과 1건 (본문 포함)을 파일에서 읽음"""
+        if self.path:
+            if self._reader is None:
+                self._reader = open(self.path, "rb")
+            f = self._reader
+        else:
+            f = self._file
+        f.seek(self._offsets[url])
+        return json.loads(f.readline())
+
+    def close(self):
+        """파일 닫기 (임시 파일은 이후 get 을 위해 remove 전까지 유지)"""
+        if not self.path: return
+        for f in (self._file, self._reader):
+            if f is not None: f.close()
+        self._file = self._reader = None
+
+    def remove(self):
+        """최종 파일 기록이 끝난 뒤 체크포인트 삭제"""
+        for f in (self._file, self._reader):
+            if f is not None: f.close()
+        self._file = self._reader = None
+        if self.path and os.path.exists(self.path):
+            os.remove(self.path)
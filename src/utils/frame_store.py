@@ -0,0 +1,132 @@
+# src/utils/frame_store.py - 단계 간 중간 결과 저장/로드 (컬럼형 Parquet/Feather + 단계별 고정 스키마, CSV 는 선택 내보내기)
+#
+# 이름(확장자 없음, 예: step1_filtered)으로 저장하고 읽는다.
+# 읽기는 설정 형식 → 다른 형식 순으로 찾으므로 CSV 로 저장된 과거 실행 폴더도 그대로 읽힌다.
+
+import os
+import pandas as pd
+from utils.logger import log_info
+
+try:
+    import pyarrow  # 선택 의존성: 없으면 CSV 로 저장
+except ImportError:
+    pyarrow = None
+
+# parquet (기본, 압축) | feather (Arrow IPC, 메모리 맵 읽기) | csv (이전 방식)
+FRAME_FORMAT = os.getenv("FRAME_FORMAT", "parquet")
+# 함께 CSV(utf-8-sig)로도 내보낼 단계 이름 (쉼표 구분, all = 전부). 사람이 열어볼 파일용이며 다음 단계는 읽지 않음
+FRAME_CSV_EXPORT = {n.strip() for n in os.getenv("FRAME_CSV_EXPORT", "").split(",") if n.strip()}
+EXTENSIONS = {"parquet": ".parquet", "feather": ".feather", "csv": ".csv"}
+
+# 단계 결과 이름
+STEP0_RAW = "step0_raw"
+STEP1_LABELED = "step1_labeled"     # 중요도 3 미만까지 포함한 Step 1 판정 전체 (사전 분류기 학습 데이터, 라벨출처 컬럼으로 구분)
+STEP1_FILTERED = "step1_filtered"
+STEP2_FINAL = "step2_final"
+
+ARTICLE_COLUMNS = ["구분", "키워드", "일자", "헤드라인", "요약", "매체명", "URL"]
+LABEL_COLUMNS = ["대기업 관련", "HR 관련", "정책/법안 관련", "경제/산업 관련", "보험/금융 관련", "중요여부"]   # gpt_utils.LABEL_COLUMNS
+LABEL_SOURCE = "라벨출처"   # step1_labeled 행의 판정 출처 (pre_classifier.SOURCE_*)
+
+# 단계별 컬럼 타입 (str / int). 스키마에 없는 컬럼은 값 그대로 두되 문자열이 섞인 object 컬럼은 str 로 맞춤
+_STEP0 = {**{c: str for c in ARTICLE_COLUMNS}, "row_id": int}
+_STEP1 = {**_STEP0, **{c: str for c in LABEL_COLUMNS}, "중요도": int}
+SCHEMAS = {
+    STEP0_RAW: _STEP0,
+    STEP1_LABELED: {**_STEP1, LABEL_SOURCE: str},
+    STEP1_FILTERED: _STEP1,
+    STEP2_FINAL: {**_STEP1, "본문": str},
+}
+
+def storage_format():
+    """실제 저장 형식 (pyarrow 가 없으면 csv)"""
+    if FRAME_FORMAT != "csv" and pyarrow is None: return "csv"
+    return FRAME_FORMAT if FRAME_FORMAT in EXTENSIONS else "parquet"
+
+def frame_path(folder, name, fmt=None):
+    """이번 실행이 쓰는 파일 경로"""
+    return os.path.join(folder, name + EXTENSIONS[fmt or storage_format()])
+
+def find_frame(folder, name):
+    """기존 파일 경로 (설정 형식 우선, 없으면 다른 형식). 없으면 None"""
+    preferred = storage_format()
+    for fmt in [preferred, *(f for f in EXTENSIONS if f != preferred)]:
+        path = frame_path(folder, name, fmt)
+        if os.path.exists(path): return path
+    return None
+
+def _as_text(value):
+    if value is None or (not isinstance(value, str) and pd.isna(value)): return None
+    return value if isinstance(value, str) else str(value)
+
+def apply_schema(df, name=None):
+    """스키마 타입으로 변환한 사본. 정수 컬럼에 결측이 있으면 실수로 둠 (CSV 로 읽었을 때와 같은 값)"""
+    schema = SCHEMAS.get(name, {})
+    df = df.copy()
+    for col in df.columns:
+        kind = schema.get(col)
+        if kind is int:
+            values = pd.to_numeric(df[col], errors="coerce")
+            df[col] = values.astype("int64") if values.notna().all() else values.astype("float64")
+        elif (kind is str or df[col].dtype == object) and not isinstance(df[col].dtype, pd.StringDtype):
+            df[col] = df[col].map(_as_text).astype("string")
+    return df
+
+def read_frame_file(path, columns=None):
+    """확장자에 맞춰 읽기. columns 중 파일에 없는 컬럼은 무시 (필요한 컬럼만 읽어 메모리 절약)"""
+    ext = os.path.splitext(path)[1]
+    if ext == ".csv":
+        usecols = (lambda c: c in columns) if columns is not None else None
+        return pd.read_csv(path, encoding="utf-8-sig", usecols=usecols)
+    if ext == ".feather":
+        from pyarrow import feather
+        table = feather.read_table(path, memory_map=True)
+    else:
+        from pyarrow import parquet
+        names = parquet.read_schema(path).names
+        table = parquet.read_table(path, columns=None if columns is None else [c for c in columns if c in names])
+    if columns is not None: table = table.select([c for c in columns if c in table.column_names])
+    return table.to_pandas()
+
+def read_frame(folder, name, columns=None):
+    """단계 결과 읽기. 파일이 없으면 None"""
+    path = find_frame(folder, name)
+    return read_frame_file(path, columns) if path else None
+
+def write_frame(df, folder, name):
+    """
+    스키마 적용 후 저장 (임시 파일 → 교체). FRAME_CSV_EXPORT 에 포함된 단계는 CSV 도 함께 기록하고,
+    그 외 다른 형식의 같은 이름 파일은 삭제. 저장 경로 반환
+    """
+    fmt = storage_format()
+    path = frame_path(folder, name, fmt)
+    tmp_path = path + ".tmp"
+    typed = apply_schema(df, name)
+    if fmt == "csv":
+        typed.to_csv(tmp_path, index=False, encoding="utf-8-sig")
+    else:
+        table = pyarrow.Table.from_pandas(typed, preserve_index=False)
+        if fmt == "feather":
+            from pyarrow import feather
+            feather.write_feather(table, tmp_path, compression="zstd")
+        else:
+            from pyarrow import parquet
+            parquet.write_table(table, tmp_path, compression="zstd")
+    os.replace(tmp_path, path)
+    export = name in FRAME_CSV_EXPORT or "all" in FRAME_CSV_EXPORT
+    for other in EXTENSIONS:
+        if other == fmt: continue
+        other_path = frame_path(folder, name, other)
+        if other == "csv" and export:
+            typed.to_csv(other_path + ".tmp", index=False, encoding="utf-8-sig")
+            os.replace(other_path + ".tmp", other_path)
+            log_info(f"📤 CSV 내보내기: {other_path}")
+        elif os.path.exists(other_path):
+            os.remove(other_path)   # 형식을 바꾸기 전의 이전 결과 (find_frame 이 옛 파일을 읽지 않도록)
+    return path
+
+def remove_frame(folder, name):
+    """모든 형식의 기존 파일 삭제"""
+    for fmt in EXTENSIONS:
+        path = frame_path(folder, name, fmt)
+        if os.path.exists(path): os.remove(path)
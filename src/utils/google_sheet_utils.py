@@ -1,19 +1,37 @@
-
 # src/utils/google_sheet_utils.py
 
-from gspread_dataframe import set_with_dataframe
-from google.oauth2.service_account import Credentials
-import gspread
+import os
+from functools import lru_cache
 from datetime import datetime
+from utils.logger import log_info
 
 SCOPES = ["https://www.googleapis.com/auth/spreadsheets", "https://www.googleapis.com/auth/drive"]
-creds = Credentials.from_service_account_file("creds.json", scopes=SCOPES)
-gc = gspread.authorize(creds)
+CREDS_FILE = "creds.json"
+
+# diff: URL 기준으로 바뀐 행만 기록 / full: 기존 방식 (3행부터 지우고 전체 재작성)
+SHEET_SYNC_MODE = os.getenv("SHEET_SYNC_MODE", "diff")
+
+@lru_cache(maxsize=None)
+def get_gspread_client():
+    """gspread 클라이언트 (첫 업로드 때 creds.json 으로 인증, 이후 재사용). 시트를 쓰지 않는 단계는 creds.json 불필요"""
+    import gspread
+    from google.oauth2.service_account import Credentials
+    creds = Credentials.from_service_account_file(CREDS_FILE, scopes=SCOPES)
+    return gspread.authorize(creds)
 
 def upload_to_google_sheet(df, sheet_id, sheet_name):
-    sheet = gc.open_by_key(sheet_id)
+    from utils.sheet_sync import sync_worksheet, call_with_backoff
+    sheet = get_gspread_client().open_by_key(sheet_id)
     worksheet = sheet.worksheet(sheet_name)
-    worksheet.batch_clear(["A3:Z"])
-    set_with_dataframe(worksheet, df, row=3, col=1)
-    worksheet.update("A2", [[f"업데이트 시각: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}"]])
+    if SHEET_SYNC_MODE == "full":
+        from gspread_dataframe import set_with_dataframe
+        worksheet.batch_clear(["A3:Z"])
+        set_with_dataframe(worksheet, df, row=3, col=1)
+    else:
+        stats = sync_worksheet(worksheet, df, header_row=3)
+        log_info(
+            f"📤 시트 동기화({stats['mode']}): {stats['rows']}행 | 추가 {stats.get('inserted', stats['rows'])} / 수정 {stats.get('updated', 0)}"
+            f" / 삭제 {stats.get('deleted', 0)} | 요청 {stats['requests']}회, {stats['bytes']/1024:.0f}KB"
+        )
+    call_with_backoff(worksheet.update, [[f"업데이트 시각: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}"]], "A2")
     print("✅ Google 스프레드시트 저장 완료!")
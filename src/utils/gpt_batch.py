@@ -0,0 +1,140 @@
+# src/utils/gpt_batch.py - OpenAI Batch API 실행 (JSONL 제출 → 폴링 → custom_id 로 결과 매핑, 재시작 시 이어서 폴링)
+
+import os
+import io
+import json
+import time
+import glob
+import hashlib
+from utils.logger import log_info, log_error
+from utils.gpt_executor import record_usage
+
+GPT_BATCH_DIR = os.path.join("data", "state", "gpt_batch")
+GPT_BATCH_POLL_SECONDS = float(os.getenv("GPT_BATCH_POLL_SECONDS", "30"))
+GPT_BATCH_TIMEOUT_HOURS = float(os.getenv("GPT_BATCH_TIMEOUT_HOURS", "24"))
+# 완료된 배치 결과를 재사용하는 기간. 지나면 새로 제출하고, 이보다 오래된 상태/결과 파일은 정리
+GPT_BATCH_MAX_AGE_HOURS = float(os.getenv("GPT_BATCH_MAX_AGE_HOURS", "24"))
+BATCH_ENDPOINT = "/v1/chat/completions"
+TERMINAL_STATUSES = {"completed", "failed", "expired", "cancelled"}
+BATCH_SDK_RETRIES = 2   # 파일 업로드/폴링 요청은 chat_completion 재시도를 거치지 않으므로 SDK 재시도 사용 (기본 클라이언트는 0)
+
+def build_batch_jsonl(bodies, kind):
+    """요청 본문 목록 → Batch 입력 JSONL (custom_id = '{kind}-{순번}')"""
+    lines = [
+        json.dumps({"custom_id": f"{kind}-{i}", "method": "POST", "url": BATCH_ENDPOINT, "body": body}, ensure_ascii=False)
+        for i, body in enumerate(bodies)
+    ]
+    return "\n".join(lines) + "\n"
+
+def parse_batch_output(text):
+    """출력/에러 JSONL → {custom_id: 응답 content 또는 None}"""
+    contents = {}
+    for line in text.splitlines():
+        if not line.strip(): continue
+        record = json.loads(line)
+        response = record.get("response") or {}
+        try:
+            contents[record["custom_id"]] = response["body"]["choices"][0]["message"]["content"] if response.get("status_code") == 200 else None
+        except (KeyError, IndexError, TypeError):
+            contents[record["custom_id"]] = None
+    return contents
+
+def _record_batch_usage(text):
+    for line in text.splitlines():
+        if not line.strip(): continue
+        usage = ((json.loads(line).get("response") or {}).get("body") or {}).get("usage")
+        if usage:
+            record_usage(usage.get("prompt_tokens"), usage.get("completion_tokens"))
+
+_consumed = set()   # 이번 프로세스에서 읽은 결과 파일 (remove_consumed 로 삭제)
+
+def _state_paths(kind, payload, model, version):
+    digest = hashlib.sha256(f"{model}\x1f{version}\x1f{payload}".encode("utf-8")).hexdigest()[:16]
+    base = os.path.join(GPT_BATCH_DIR, f"{kind}-{digest}")
+    return base + ".json", base + ".output.jsonl"
+
+def _age_hours(path):
+    return (time.time() - os.path.getmtime(path)) / 3600
+
+def prune_batch_dir(max_age_hours=GPT_BATCH_MAX_AGE_HOURS):
+    """오래된 결과/임시 파일과 폴링 기한이 지난 상태 파일 삭제"""
+    for path in glob.glob(os.path.join(GPT_BATCH_DIR, "*")):
+        limit = max(max_age_hours, GPT_BATCH_TIMEOUT_HOURS) if path.endswith(".json") else max_age_hours
+        try:
+            if _age_hours(path) > limit: os.remove(path)
+        except OSError:
+            pass
+
+def remove_consumed():
+    """결과를 반영한 뒤 이번 실행에서 읽은 배치 결과 파일 삭제"""
+    for path in _consumed:
+        if os.path.exists(path): os.remove(path)
+    _consumed.clear()
+
+def _save_state(path, state):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(state, f, ensure_ascii=False, indent=1)
+    os.replace(tmp_path, path)
+
+def run_chat_batch(client, bodies, kind, model, version):
+    """
+    chat completion 요청 본문 목록을 Batch API 로 실행하고 입력 순서대로 content(실패 시 None) 리스트 반환.
+    같은 요청 묶음(모델/프롬프트 버전/내용 해시 동일)이 이미 제출돼 있으면 새로 제출하지 않고 그 배치를 이어서 폴링하며,
+    GPT_BATCH_MAX_AGE_HOURS 이내에 완료된 결과가 있으면 그대로 사용한다.
+    """
+    if not bodies: return []
+    prune_batch_dir()
+    client = client.with_options(max_retries=BATCH_SDK_RETRIES)
+    payload = build_batch_jsonl(bodies, kind)
+    state_path, output_path = _state_paths(kind, payload, model, version)
+    custom_ids = [f"{kind}-{i}" for i in range(len(bodies))]
+    _consumed.add(output_path)
+
+    if os.path.exists(output_path):
+        log_info(f"📥 [{kind}] 완료된 배치 결과 재사용: {output_path}")
+        with open(output_path, encoding="utf-8") as f:
+            contents = parse_batch_output(f.read())
+        return [contents.get(cid) for cid in custom_ids]
+
+    state = None
+    if os.path.exists(state_path):
+        with open(state_path, encoding="utf-8") as f:
+            state = json.load(f)
+        log_info(f"♻️ [{kind}] 제출된 배치 {state['batch_id']} 이어서 폴링")
+    else:
+        uploaded = client.files.create(file=(f"{kind}.jsonl", io.BytesIO(payload.encode("utf-8"))), purpose="batch")
+        batch = client.batches.create(input_file_id=uploaded.id, endpoint=BATCH_ENDPOINT, completion_window="24h")
+        state = {"batch_id": batch.id, "input_file_id": uploaded.id, "requests": len(bodies), "submitted": time.time()}
+        _save_state(state_path, state)
+        log_info(f"📤 [{kind}] 배치 제출: {batch.id} ({len(bodies)}건)")
+
+    deadline = state["submitted"] + GPT_BATCH_TIMEOUT_HOURS * 3600
+    while True:
+        batch = client.batches.retrieve(state["batch_id"])
+        if batch.status in TERMINAL_STATUSES: break
+        if time.time() > deadline:
+            log_error(f"⏰ [{kind}] 배치 {batch.id} 대기 시간 초과 (상태: {batch.status})")
+            return [None] * len(bodies)
+        counts = getattr(batch, "request_counts", None)
+        progress = f"{counts.completed}/{counts.total}" if counts else "-"
+        log_info(f"⏳ [{kind}] 배치 {batch.id} 상태: {batch.status} ({progress})")
+        time.sleep(GPT_BATCH_POLL_SECONDS)
+
+    if batch.status != "completed" and not batch.output_file_id:
+        log_error(f"❌ [{kind}] 배치 {batch.id} 종료 상태: {batch.status}")
+        os.remove(state_path)
+        return [None] * len(bodies)
+
+    text = client.files.content(batch.output_file_id).text if batch.output_file_id else ""
+    if batch.error_file_id:
+        text += "\n" + client.files.content(batch.error_file_id).text
+    with open(output_path, "w", encoding="utf-8") as f:
+        f.write(text)
+    os.remove(state_path)
+
+    _record_batch_usage(text)
+    contents = parse_batch_output(text)
+    log_info(f"✅ [{kind}] 배치 완료: {sum(1 for cid in custom_ids if contents.get(cid))}/{len(bodies)}건 응답")
+    return [contents.get(cid) for cid in custom_ids]
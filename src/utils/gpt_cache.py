@@ -0,0 +1,77 @@
+# src/utils/gpt_cache.py - 기사 분류 GPT 응답 캐시 (SQLite, 내용 주소 기반)
+
+import os
+import json
+import time
+import sqlite3
+import hashlib
+from utils.logger import log_info
+
+GPT_CACHE_FILE = os.path.join("data", "state", "gpt_cache.sqlite")
+GPT_CACHE_TTL_DAYS = float(os.getenv("GPT_CACHE_TTL_DAYS", "30"))
+GPT_CACHE_MAX_ROWS = int(os.getenv("GPT_CACHE_MAX_ROWS", "50000"))
+
+def prompt_version(*parts):
+    """프롬프트 문구가 바뀌면 달라지는 버전 해시 (캐시 자동 무효화용)"""
+    return hashlib.sha256("\x1f".join(parts).encode("utf-8")).hexdigest()[:16]
+
+def cache_key(text, model, version):
+    return hashlib.sha256(f"{model}\x1f{version}\x1f{text}".encode("utf-8")).hexdigest()
+
+class GptCache:
+    def __init__(self, path=GPT_CACHE_FILE, ttl_days=GPT_CACHE_TTL_DAYS, max_rows=GPT_CACHE_MAX_ROWS):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.conn = sqlite3.connect(path)
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses (key TEXT PRIMARY KEY, value TEXT, created REAL, accessed REAL)"
+        )
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_accessed ON responses(accessed)")
+        self.ttl = ttl_days * 86400
+        self.max_rows = max_rows
+        self.hits = 0
+        self.misses = 0
+
+    def get_many(self, keys):
+        """{key: value} (만료 항목 제외). 조회된 항목은 accessed 갱신"""
+        now = time.time()
+        found = {}
+        unique = list(dict.fromkeys(keys))
+        for i in range(0, len(unique), 500):
+            chunk = unique[i:i + 500]
+            rows = self.conn.execute(
+                f"SELECT key, value FROM responses WHERE key IN ({','.join('?' * len(chunk))}) AND created >= ?",
+                (*chunk, now - self.ttl),
+            ).fetchall()
+            found.update((k, json.loads(v)) for k, v in rows)
+        self.conn.executemany("UPDATE responses SET accessed = ? WHERE key = ?", [(now, k) for k in found])
+        self.conn.commit()
+        self.hits += sum(1 for k in keys if k in found)
+        self.misses += sum(1 for k in keys if k not in found)
+        return found
+
+    def put_many(self, items):
+        now = time.time()
+        self.conn.executemany(
+            "INSERT OR REPLACE INTO responses (key, value, created, accessed) VALUES (?, ?, ?, ?)",
+            [(k, json.dumps(v, ensure_ascii=False), now, now) for k, v in items.items()],
+        )
+        self.conn.commit()
+
+    def evict(self):
+        """TTL 만료 삭제 후 max_rows 초과분은 가장 오래 안 쓰인 순(LRU)으로 삭제"""
+        removed = self.conn.execute("DELETE FROM responses WHERE created < ?", (time.time() - self.ttl,)).rowcount
+        removed += self.conn.execute(
+            "DELETE FROM responses WHERE key IN (SELECT key FROM responses ORDER BY accessed DESC LIMIT -1 OFFSET ?)",
+            (self.max_rows,),
+        ).rowcount
+        self.conn.commit()
+        return removed
+
+    def log_stats(self, label="GPT 캐시"):
+        total = self.hits + self.misses
+        rate = self.hits / total if total else 0
+        log_info(f"💾 [{label}] 적중 {self.hits}건 / 미적중 {self.misses}건 (적중률 {rate:.0%})")
+
+    def close(self):
+        self.conn.commit()
+        self.conn.close()
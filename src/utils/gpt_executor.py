@@ -0,0 +1,84 @@
+# src/utils/gpt_executor.py - GPT 호출 동시 실행기 (RPM/TPM 제한 + 429 백오프)
+
+import os
+import time
+import random
+import threading
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor
+from utils.logger import log_info
+from utils.rate_limiter import TokenBucket
+from utils.token_budget import count_tokens
+
+GPT_MAX_WORKERS = int(os.getenv("GPT_MAX_WORKERS", "4"))   # 1 이면 순차 실행
+GPT_RPM = float(os.getenv("GPT_RPM", "500"))
+GPT_TPM = float(os.getenv("GPT_TPM", "200000"))
+GPT_MAX_RETRIES = int(os.getenv("GPT_MAX_RETRIES", "5"))
+
+# 분당 한도를 초당 충전 속도로 환산 (버킷 크기 = 1분치의 1/6 → 순간 폭주 방지)
+_request_bucket = TokenBucket(GPT_RPM / 60, capacity=max(1, GPT_RPM / 6))
+_token_bucket = TokenBucket(GPT_TPM / 60, capacity=max(1, GPT_TPM / 6))
+
+# 호출별 실제 사용 토큰 (prompt, completion) 기록
+_usage = []
+_usage_lock = threading.Lock()
+
+@lru_cache(maxsize=None)
+def retryable_errors():
+    """재시도 대상 openai 예외 (openai import 는 첫 호출 때)"""
+    from openai import RateLimitError, APIConnectionError, APITimeoutError, InternalServerError
+    return (RateLimitError, APIConnectionError, APITimeoutError, InternalServerError)
+
+def estimate_tokens(messages, max_output_tokens=500):
+    # 메시지 토큰 + 예상 출력
+    return sum(count_tokens(m.get("content")) for m in messages) + max_output_tokens
+
+def record_usage(prompt_tokens, completion_tokens):
+    with _usage_lock:
+        _usage.append((int(prompt_tokens or 0), int(completion_tokens or 0)))
+
+def reset_usage():
+    with _usage_lock:
+        _usage.clear()
+
+def log_usage(label="GPT"):
+    """reset_usage 이후 호출들의 호출 수 / 호출당 입력·출력 토큰 (평균, 최대) 로그"""
+    with _usage_lock:
+        usage = list(_usage)
+    if not usage: return
+    prompts, completions = zip(*usage)
+    log_info(
+        f"🧾 [{label}] 호출 {len(usage)}회 | 호출당 입력 평균 {sum(prompts) / len(usage):.0f} (최대 {max(prompts)}) 토큰"
+        f" | 출력 평균 {sum(completions) / len(usage):.0f} (최대 {max(completions)}) 토큰 | 합계 {sum(prompts) + sum(completions)}"
+    )
+
+def chat_completion(client, messages, **kwargs):
+    """제한기 통과 후 호출. 429/일시 오류는 지수 백오프(+지터)로 재시도, 그 외 예외는 그대로 raise"""
+    for attempt in range(GPT_MAX_RETRIES + 1):
+        _request_bucket.acquire()
+        _token_bucket.acquire(estimate_tokens(messages))
+        try:
+            response = client.chat.completions.create(messages=messages, **kwargs)
+            usage = getattr(response, "usage", None)
+            if usage is not None:
+                record_usage(usage.prompt_tokens, usage.completion_tokens)
+            return response
+        except retryable_errors() as e:
+            if attempt == GPT_MAX_RETRIES: raise
+            wait = min(60, 2 ** attempt) + random.uniform(0, 1)
+            log_info(f"⏳ GPT {type(e).__name__} - {wait:.1f}초 후 재시도 ({attempt+1}/{GPT_MAX_RETRIES})")
+            time.sleep(wait)
+
+def iter_concurrently(fn, jobs, max_workers=GPT_MAX_WORKERS):
+    """run_concurrently 와 같되, 결과를 입력 순서대로 준비되는 즉시 하나씩 yield"""
+    jobs = list(jobs)
+    if max_workers <= 1 or len(jobs) <= 1:
+        for job in jobs:
+            yield fn(job)
+        return
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        yield from pool.map(fn, jobs)
+
+def run_concurrently(fn, jobs, max_workers=GPT_MAX_WORKERS):
+    """jobs 각각에 fn 적용. 완료 순서와 무관하게 입력 순서대로 결과 리스트 반환"""
+    return list(iter_concurrently(fn, jobs, max_workers))
@@ -1,14 +1,97 @@
 import re
 import os
-import math
+import json
 from typing import List
-from openai import OpenAI
+from functools import lru_cache
 import pandas as pd
 from utils.logger import log_info, log_error
+from utils.press_registry import PRESS_REGISTRY
+from utils.gpt_executor import chat_completion, run_concurrently, iter_concurrently, reset_usage, log_usage
+from utils.gpt_cache import GptCache, cache_key, prompt_version
+from utils.gpt_batch import run_chat_batch
+from utils.token_budget import count_tokens, pack_by_tokens
 
-client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+@lru_cache(maxsize=None)
+def get_openai_client():
+    """
+    OpenAI 클라이언트 (첫 GPT 호출 때 생성, 이후 재사용). openai import 도 이때.
+    SDK 자체 재시도는 끔 - 재시도/백오프는 chat_completion 이 GPT_MAX_RETRIES 예산 안에서 처리
+    """
+    from openai import OpenAI
+    return OpenAI(api_key=os.getenv("OPENAI_API_KEY"), max_retries=0)
 
-MEDIA_PRIORITY = ["조선일보", "중앙일보", "동아일보", "서울신문", "경향신문", "한겨레", "한국경제", "머니투데이"]
+def _structured_unsupported(error):
+    """구조화 응답 자체가 안 되는 오류 (스키마/파라미터 미지원 400·422, 스키마에 맞지 않는 응답). 이때만 텍스트 형식으로 재요청"""
+    from openai import BadRequestError, UnprocessableEntityError
+    return isinstance(error, (BadRequestError, UnprocessableEntityError, ValueError, KeyError, TypeError))
+
+# sync: 채팅 API 동시 호출 / batch: OpenAI Batch API 로 제출 후 폴링 (비대화형 정기 실행용, 요금 절반)
+GPT_EXECUTION_MODE = os.getenv("GPT_EXECUTION_MODE", "sync")
+
+DEDUP_MODEL = "gpt-4o-mini"
+DEDUP_SYSTEM_PROMPT = "너는 뉴스 헤드라인 중 중복된 내용을 그룹으로 묶어주는 AI야."
+DEDUP_PROMPT_VERSION = prompt_version(DEDUP_SYSTEM_PROMPT)
+
+# analyze_articles_batch 가 채우는 분류 결과 컬럼 (중요도 제외)
+LABEL_COLUMNS = ["대기업 관련", "HR 관련", "정책/법안 관련", "경제/산업 관련", "보험/금융 관련", "중요여부"]
+
+# 기사 분류 프롬프트 (문구가 바뀌면 ANALYZE_PROMPT_VERSION 이 바뀌어 캐시가 자동 무효화됨)
+ANALYZE_MODEL = "gpt-4o-mini"
+ANALYZE_SYSTEM_PROMPT = (
+    "당신은 대기업 인사팀의 인사 담당자입니다.\n"
+    "각 기사에 대해 1.대기업 관련, 2.HR 관심, 3.정책/법안, 4.경제/산업, 5.보험/금융 여부를 O/X로 판단하세요.\n"
+    "형식: 1. 대기업 관련: O, HR 관심: O, 정책/법안/판례 관련: X, 경제/산업 관련: O, 보험/금융 관련: X"
+)
+ANALYZE_LINE_FORMAT = "{num}. {summary}"
+ANALYZE_SUMMARY_CHARS = 200
+
+# 구조화 출력(JSON 스키마) 모드: 기사 번호별 레코드를 받아 index_map 으로 검증
+# 호출/파싱이 실패한 배치만 위의 텍스트 형식으로 한 번 다시 요청한다 (0 이면 텍스트 형식만 사용)
+ANALYZE_STRUCTURED = os.getenv("GPT_STRUCTURED_OUTPUT", "1") == "1"
+ANALYZE_FIELDS = ["large_corp", "hr", "policy", "economy", "insurance"]   # LABEL_COLUMNS 앞 5개와 같은 순서
+ANALYZE_STRUCTURED_PROMPT = (
+    "당신은 대기업 인사팀의 인사 담당자입니다.\n"
+    "각 기사(번호 id)에 대해 large_corp(대기업 관련), hr(HR 관심), policy(정책/법안/판례), "
+    "economy(경제/산업), insurance(보험/금융) 여부를 O/X로 판단해 모든 기사를 articles 배열로 답하세요."
+)
+ANALYZE_RESPONSE_FORMAT = {
+    "type": "json_schema",
+    "json_schema": {
+        "name": "article_labels",
+        "strict": True,
+        "schema": {
+            "type": "object",
+            "properties": {
+                "articles": {
+                    "type": "array",
+                    "items": {
+                        "type": "object",
+                        "properties": {"id": {"type": "integer"}, **{f: {"type": "string", "enum": ["O", "X"]} for f in ANALYZE_FIELDS}},
+                        "required": ["id", *ANALYZE_FIELDS],
+                        "additionalProperties": False,
+                    },
+                }
+            },
+            "required": ["articles"],
+            "additionalProperties": False,
+        },
+    },
+}
+ANALYZE_PROMPT_VERSION = prompt_version(
+    ANALYZE_SYSTEM_PROMPT, ANALYZE_LINE_FORMAT, str(ANALYZE_SUMMARY_CHARS),
+    ANALYZE_STRUCTURED_PROMPT + json.dumps(ANALYZE_RESPONSE_FORMAT, ensure_ascii=False) if ANALYZE_STRUCTURED else "",
+)
+# 0 이면 분류 결과 캐시 사용 안 함
+GPT_CACHE = os.getenv("GPT_CACHE", "1") == "1"
+
+# 토큰 예산 기반 배치 묶기 (0 이면 기존처럼 batch_size 개수 단위로 묶음)
+GPT_TOKEN_PACKING = os.getenv("GPT_TOKEN_PACKING", "1") == "1"
+ANALYZE_INPUT_TOKENS = int(os.getenv("ANALYZE_INPUT_TOKENS", "3000"))    # 호출당 입력 예산 (시스템 프롬프트 포함)
+ANALYZE_OUTPUT_TOKENS = int(os.getenv("ANALYZE_OUTPUT_TOKENS", "600"))   # 호출당 예상 출력 예산
+ANALYZE_MAX_ITEMS = int(os.getenv("ANALYZE_MAX_ITEMS", "15"))            # 호출 1건 실패 시 재시도 범위 제한
+DEDUP_HEADLINE_TOKENS = int(os.getenv("DEDUP_HEADLINE_TOKENS", "30"))    # 중복제거 입력 예산 = batch_size × 이 값
+DEDUP_OUTPUT_TOKENS = int(os.getenv("DEDUP_OUTPUT_TOKENS", "1000"))
+MESSAGE_OVERHEAD_TOKENS = 10    # 메시지 역할/구분자 등
 
 def parse_gpt_group_output(content: str) -> List[List[int]]:
     group_strings = re.findall(r'\[([0-9,\s]+)\]', content)
@@ -21,20 +104,21 @@ def parse_gpt_group_output(content: str) -> List[List[int]]:
             continue
     return groups
 
-def get_gpt_duplicate_groups(headlines: List[str]) -> List[List[int]]:
-    system_prompt = "너는 뉴스 헤드라인 중 중복된 내용을 그룹으로 묶어주는 AI야."
+def _dedup_request(headlines: List[str]) -> dict:
     user_prompt = "\n".join([f"{i+1}. {h}" for i, h in enumerate(headlines)])
     user_prompt += "\n출력 형식: [[1, 2], [3], [4, 5]]"
+    return {
+        "model": DEDUP_MODEL,
+        "messages": [
+            {"role": "system", "content": DEDUP_SYSTEM_PROMPT},
+            {"role": "user", "content": user_prompt}
+        ],
+        "temperature": 0.2,
+    }
 
+def get_gpt_duplicate_groups(headlines: List[str]) -> List[List[int]]:
     try:
-        response = client.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": user_prompt}
-            ],
-            temperature=0.2
-        )
+        response = chat_completion(get_openai_client(), **_dedup_request(headlines))
         content = response.choices[0].message.content
         return parse_gpt_group_output(content)
     except Exception as e:
@@ -42,117 +126,273 @@ def get_gpt_duplicate_groups(headlines: List[str]) -> List[List[int]]:
         return [[i] for i in range(len(headlines))]
 
 def choose_by_media_priority(group_df: pd.DataFrame) -> pd.Series:
-    for media in MEDIA_PRIORITY:
-        match = group_df[group_df["매체명"] == media]
-        if not match.empty:
-            return match.iloc[0]
-    return group_df.iloc[0]
+    # 우선순위 순위가 가장 높은(숫자가 작은) 첫 기사, 해당 매체가 없으면 첫 기사
+    ranks = PRESS_REGISTRY.priority_ranks(group_df["매체명"]).to_numpy()
+    return group_df.iloc[int(ranks.argmin())]
+
+def _split_by_count(df: pd.DataFrame, batch_size: int):
+    return [df.iloc[i:i+batch_size] for i in range(0, len(df), batch_size)]
+
+def _dedup_batches(df: pd.DataFrame, batch_size: int):
+    """중복제거 배치: 헤드라인 토큰 합이 batch_size 개 평균 분량을 넘지 않게 순서대로 묶음"""
+    if not GPT_TOKEN_PACKING:
+        return _split_by_count(df, batch_size)
+    overhead = count_tokens(DEDUP_SYSTEM_PROMPT) + MESSAGE_OVERHEAD_TOKENS
+    item_tokens = [count_tokens(f"{len(df)}. {h}") + 1 for h in df['헤드라인'].tolist()]
+    spans = pack_by_tokens(
+        item_tokens, overhead + batch_size * DEDUP_HEADLINE_TOKENS,
+        output_budget=DEDUP_OUTPUT_TOKENS, output_per_item=count_tokens(f"[{len(df)}], "),
+        overhead=overhead,
+    )
+    return [df.iloc[a:b] for a, b in spans]
+
+def resolve_duplicate_groups(df: pd.DataFrame, batches, batch_groups) -> pd.DataFrame:
+    """
+    배치별 GPT 그룹(배치 내 0-based 위치) → 그룹마다 choose_by_media_priority 와 같은 규칙으로 1건씩 남긴 df.
+    그룹 id / 우선순위 컬럼을 만들어 groupby 한 번으로 고르므로 dtype 과 row_id 가 그대로 유지된다.
+    batches 는 reset_index 된 df 의 iloc 조각이어야 한다. 여러 그룹에 나온 기사는 첫 그룹에만 속하고,
+    어느 그룹에도 없는 기사는 단독 그룹이 된다.
+    """
+    positions, group_ids = [], []
+    gid = 0
+    for batch_df, groups in zip(batches, batch_groups):
+        base = batch_df.index.to_numpy()
+        mentioned = set()
+        # GPT 가 어느 그룹에도 넣지 않은 기사(응답 누락/깨짐)는 버리지 않고 단독 그룹으로 유지
+        for group in [*groups, *([i] for i in range(len(base)))]:
+            valid = [g for g in group if 0 <= g < len(base) and g not in mentioned]
+            if not valid: continue
+            mentioned.update(valid)
+            positions.extend(base[valid])
+            group_ids.extend([gid] * len(valid))
+            gid += 1
+    if not positions: return df.iloc[:0]
+
+    members = pd.DataFrame({"pos": positions, "gid": group_ids})
+    members["rank"] = PRESS_REGISTRY.priority_ranks(df["매체명"]).to_numpy()[members["pos"].to_numpy()]
+    # 그룹 내 동순위는 GPT 가 나열한 순서상 첫 기사 (idxmin 은 첫 최소값)
+    winners = members.loc[members.groupby("gid", sort=True)["rank"].idxmin(), "pos"]
+    return df.iloc[winners.to_numpy()].reset_index(drop=True)
 
 def deduplicate_news_with_gpt(df: pd.DataFrame, batch_size: int = 20) -> pd.DataFrame:
     if df.empty: return df
     df = df.copy().reset_index(drop=True)
-    headline_batches = [df.iloc[i:i+batch_size] for i in range(0, len(df), batch_size)]
-    selected_rows = []
-    for batch_df in headline_batches:
-        headlines = batch_df['헤드라인'].tolist()
-        groups = get_gpt_duplicate_groups(headlines)
-        for group in groups:
-            try:
-                # 안전한 인덱스 접근
-                valid_group = [g for g in group if 0 <= g < len(batch_df)]
-                if not valid_group: continue
-                group_df = batch_df.iloc[valid_group]
-                selected = choose_by_media_priority(group_df)
-                selected_rows.append(selected)
-            except:
-                continue
-    return pd.DataFrame(selected_rows).reset_index(drop=True)
+    headline_batches = _dedup_batches(df, batch_size)
+    reset_usage()
+    # 배치별 GPT 호출은 동시 실행(또는 Batch API 일괄 제출), 결과 반영은 배치 순서대로
+    if GPT_EXECUTION_MODE == "batch":
+        contents = run_chat_batch(get_openai_client(), [_dedup_request(b['헤드라인'].tolist()) for b in headline_batches],
+                                  f"dedup{batch_size}", DEDUP_MODEL, DEDUP_PROMPT_VERSION)
+        batch_groups = [
+            parse_gpt_group_output(content) if content else [[i] for i in range(len(b))]
+            for b, content in zip(headline_batches, contents)
+        ]
+    else:
+        batch_groups = run_concurrently(lambda b: get_gpt_duplicate_groups(b['헤드라인'].tolist()), headline_batches)
+    log_usage(f"중복제거 {batch_size}")
+    return resolve_duplicate_groups(df, headline_batches, batch_groups)
 
 def deduplicate_news_with_gpt_twopass(df: pd.DataFrame, batch_size_first: int = 20, batch_size_second: int = 50) -> pd.DataFrame:
     first_pass_df = deduplicate_news_with_gpt(df, batch_size=batch_size_first)
     return deduplicate_news_with_gpt(first_pass_df, batch_size=batch_size_second)
 
-def analyze_articles_batch(df: pd.DataFrame, batch_size=5, max_retries=5) -> pd.DataFrame:
+def _summary_text(summary) -> str:
+    return str(summary)[:ANALYZE_SUMMARY_CHARS] # 토큰 절약 및 에러 방지
+
+def parse_text_reply(reply: str, index_map: dict):
+    """'1. 대기업 관련: O, ...' 형식 응답 파싱. ({원본 idx: 5개 O/X}, 실패 idx 목록)"""
+    lines = reply.split("\n")
+    results = {}
+    failed_ids = []
+
+    for line in lines:
+        if '. ' not in line: continue
+        try:
+            parts = line.split('. ', 1)
+            gpt_num = int(re.search(r'\d+', parts[0]).group())
+            content = parts[1]
+            fields = [f.strip() for f in content.split(',')]
+            
+            original_idx = index_map.get(gpt_num)
+            if original_idx is not None and len(fields) >= 5:
+                results[original_idx] = [f.split(':')[-1].strip() if ':' in f else 'X' for f in fields[:5]]
+        except:
+            continue
+    
+    # 응답에 포함되지 않은 ID들을 실패로 간주
+    processed_gpt_nums = [int(re.search(r'\d+', l.split('. ')[0]).group()) for l in lines if '. ' in l and re.search(r'\d+', l.split('. ')[0])]
+    for i in index_map:
+        if i not in processed_gpt_nums:
+            failed_ids.append(index_map[i])
+
+    return results, failed_ids
+
+def parse_structured_reply(reply: str, index_map: dict):
+    """JSON 스키마 응답 검증/파싱. 형식이 깨졌으면 ValueError, 누락/잘못된 id 는 실패로 반환"""
+    articles = json.loads(reply)["articles"]
+    if not isinstance(articles, list):
+        raise ValueError("articles 가 배열이 아님")
+    results = {}
+    for record in articles:
+        original_idx = index_map.get(record.get("id")) if isinstance(record, dict) else None
+        if original_idx is None or original_idx in results: continue
+        vals = [record.get(f) for f in ANALYZE_FIELDS]
+        if all(v in ("O", "X") for v in vals):
+            results[original_idx] = vals
+    return results, [idx for idx in index_map.values() if idx not in results]
+
+def _analyze_prompt(batch_df: pd.DataFrame):
+    """배치 프롬프트와 {프롬프트 번호: 원본 idx} 매핑"""
+    index_map = {}
+    prompt_lines = []
+    for i, idx in enumerate(batch_df.index, 1):
+        summary = _summary_text(batch_df.at[idx, '요약'])
+        prompt_lines.append(ANALYZE_LINE_FORMAT.format(num=i, summary=summary))
+        index_map[i] = idx
+    return "\n".join(prompt_lines), index_map
+
+def _analyze_request(prompt: str, structured: bool) -> dict:
+    if structured:
+        return {
+            "model": ANALYZE_MODEL,
+            "messages": [{"role": "system", "content": ANALYZE_STRUCTURED_PROMPT}, {"role": "user", "content": prompt}],
+            "response_format": ANALYZE_RESPONSE_FORMAT,
+        }
+    return {
+        "model": ANALYZE_MODEL,
+        "messages": [{"role": "system", "content": ANALYZE_SYSTEM_PROMPT}, {"role": "user", "content": prompt}],
+    }
+
+def _parse_analyze_reply(content, index_map: dict, structured: bool):
+    if structured:
+        return parse_structured_reply(content or "", index_map)
+    return parse_text_reply(content.strip(), index_map)
+
+def _analyze_item_tokens(batch_df: pd.DataFrame) -> list:
+    return [
+        count_tokens(ANALYZE_LINE_FORMAT.format(num=len(batch_df), summary=_summary_text(s))) + 1
+        for s in batch_df['요약'].tolist()
+    ]
+
+def _analyze_overhead_tokens() -> int:
+    if ANALYZE_STRUCTURED:
+        return count_tokens(ANALYZE_STRUCTURED_PROMPT) + count_tokens(json.dumps(ANALYZE_RESPONSE_FORMAT)) + MESSAGE_OVERHEAD_TOKENS
+    return count_tokens(ANALYZE_SYSTEM_PROMPT) + MESSAGE_OVERHEAD_TOKENS
+
+def _analyze_output_per_item() -> int:
+    """기사 1건당 예상 응답 토큰 (응답 형식 예시 1줄 기준)"""
+    if ANALYZE_STRUCTURED:
+        return count_tokens(json.dumps({"id": 99, **{f: "O" for f in ANALYZE_FIELDS}})) + 2
+    return count_tokens("99. 대기업 관련: O, HR 관심: O, 정책/법안/판례 관련: X, 경제/산업 관련: O, 보험/금융 관련: X") + 1
+
+def _analyze_batches(df: pd.DataFrame, batch_size: int, max_items: int):
+    """분석 배치: 요약 토큰 합이 입력 예산, 예상 응답이 출력 예산을 넘지 않게 순서대로 묶음"""
+    if not GPT_TOKEN_PACKING:
+        return _split_by_count(df, batch_size)
+    spans = pack_by_tokens(
+        _analyze_item_tokens(df), ANALYZE_INPUT_TOKENS,
+        output_budget=ANALYZE_OUTPUT_TOKENS, output_per_item=_analyze_output_per_item(),
+        max_items=max_items, overhead=_analyze_overhead_tokens(),
+    )
+    return [df.iloc[a:b] for a, b in spans]
+
+def analyze_articles_batch(df: pd.DataFrame, batch_size=5, max_retries=5, on_result=None) -> pd.DataFrame:
+    """on_result: 라벨이 확정된 행(DataFrame 사본)을 캐시 적중/배치 완료 때마다 받는 콜백 (스트리밍 파이프라인용)"""
     # 컬럼 초기화
-    for col in ["대기업 관련", "HR 관련", "정책/법안 관련", "경제/산업 관련", "보험/금융 관련", "중요여부"]:
+    for col in LABEL_COLUMNS:
         df[col] = "X"
     df["중요도"] = 0
 
-    log_info(f"📌 [2단계] 기사 분석 시작 (총 {len(df)}건, {batch_size}개씩 묶음)")
+    if GPT_TOKEN_PACKING:
+        log_info(f"📌 [2단계] 기사 분석 시작 (총 {len(df)}건, 호출당 입력 {ANALYZE_INPUT_TOKENS}/출력 {ANALYZE_OUTPUT_TOKENS} 토큰 예산)")
+    else:
+        log_info(f"📌 [2단계] 기사 분석 시작 (총 {len(df)}건, {batch_size}개씩 묶음)")
+    reset_usage()
     total_success = 0
     retry_indices = set()
 
-    def run_batch(batch_df, index_map):
-        prompt_lines = []
-        for i, idx in enumerate(batch_df.index, 1):
-            summary = str(batch_df.at[idx, '요약'])[:200] # 토큰 절약 및 에러 방지
-            prompt_lines.append(f"{i}. {summary}")
-            index_map[i] = idx
+    # 캐시 키: 잘린 요약 + 모델 + 프롬프트 버전
+    cache = GptCache() if GPT_CACHE else None
+    keys = {idx: cache_key(_summary_text(df.at[idx, '요약']), ANALYZE_MODEL, ANALYZE_PROMPT_VERSION) for idx in df.index}
 
-        prompt = "\n".join(prompt_lines)
-        system_msg = (
-            "당신은 대기업 인사팀의 인사 담당자입니다.\n"
-            "각 기사에 대해 1.대기업 관련, 2.HR 관심, 3.정책/법안, 4.경제/산업, 5.보험/금융 여부를 O/X로 판단하세요.\n"
-            "형식: 1. 대기업 관련: O, HR 관심: O, 정책/법안/판례 관련: X, 경제/산업 관련: O, 보험/금융 관련: X"
-        )
+    def run_batch(batch_df):
+        """배치 1건 분석. ({원본 idx: 5개 O/X 값}, 실패 idx 목록) 반환 (df 는 수정하지 않음)"""
+        prompt, index_map = _analyze_prompt(batch_df)
 
-        try:
-            response = client.chat.completions.create(
-                model="gpt-4o-mini",
-                messages=[{"role": "system", "content": system_msg}, {"role": "user", "content": prompt}]
-            )
-            reply = response.choices[0].message.content.strip()
-            lines = reply.split("\n")
-            
-            success_count = 0
-            failed_ids = []
-
-            for line in lines:
-                if '. ' not in line: continue
-                try:
-                    parts = line.split('. ', 1)
-                    gpt_num = int(re.search(r'\d+', parts[0]).group())
-                    content = parts[1]
-                    fields = [f.strip() for f in content.split(',')]
-                    
-                    original_idx = index_map.get(gpt_num)
-                    if original_idx is not None and len(fields) >= 5:
-                        vals = [f.split(':')[-1].strip() if ':' in f else 'X' for f in fields[:5]]
-                        df.at[original_idx, "대기업 관련"] = vals[0]
-                        df.at[original_idx, "HR 관련"] = vals[1]
-                        df.at[original_idx, "정책/법안 관련"] = vals[2]
-                        df.at[original_idx, "경제/산업 관련"] = vals[3]
-                        df.at[original_idx, "보험/금융 관련"] = vals[4]
-                        
-                        score = vals.count("O")
-                        df.at[original_idx, "중요도"] = score
-                        df.at[original_idx, "중요여부"] = "V" if score >= 3 else ""
-                        success_count += 1
-                except:
-                    continue
-            
-            # 응답에 포함되지 않은 ID들을 실패로 간주
-            processed_gpt_nums = [int(re.search(r'\d+', l.split('. ')[0]).group()) for l in lines if '. ' in l and re.search(r'\d+', l.split('. ')[0])]
-            for i in index_map:
-                if i not in processed_gpt_nums:
-                    failed_ids.append(index_map[i])
+        if ANALYZE_STRUCTURED:
+            try:
+                response = chat_completion(get_openai_client(), **_analyze_request(prompt, structured=True))
+                return _parse_analyze_reply(response.choices[0].message.content, index_map, structured=True)
+            except Exception as e:
+                # 429/타임아웃 등 재시도를 소진한 일시 오류는 텍스트로 다시 호출하지 않고 실패 처리 (재시도 라운드에서 다시 분석)
+                if not _structured_unsupported(e):
+                    log_error(f"⚠️ GPT 배치 분석 실패: {e}")
+                    return {}, list(index_map.values())
+                log_error(f"⚠️ 구조화 응답 실패, 텍스트 형식으로 재요청: {e}")
 
-            return success_count, failed_ids
+        try:
+            response = chat_completion(get_openai_client(), **_analyze_request(prompt, structured=False))
+            return _parse_analyze_reply(response.choices[0].message.content, index_map, structured=False)
 
         except Exception as e:
             log_error(f"⚠️ GPT 배치 분석 실패: {e}")
-            return 0, list(index_map.values())
-
-    # 1차 분석 루프
-    total_batches = math.ceil(len(df) / batch_size)
-    for batch_num in range(total_batches):
-        start = batch_num * batch_size
-        batch_df = df.iloc[start : start + batch_size]
-        index_map = {}
-        success, failed = run_batch(batch_df, index_map)
+            return {}, list(index_map.values())
+
+    def run_batches(batches, kind):
+        """배치 목록 실행 결과를 배치 순서대로 반환 (sync: 동시 호출 / batch: Batch API 1회 제출)"""
+        if GPT_EXECUTION_MODE != "batch":
+            return iter_concurrently(run_batch, batches)
+        prompts = [_analyze_prompt(b) for b in batches]
+        contents = run_chat_batch(get_openai_client(), [_analyze_request(p, ANALYZE_STRUCTURED) for p, _ in prompts], kind,
+                                  ANALYZE_MODEL, ANALYZE_PROMPT_VERSION)
+        outcomes = []
+        for (_, index_map), content in zip(prompts, contents):
+            try:
+                if content is None: raise ValueError("배치 응답 없음")
+                outcomes.append(_parse_analyze_reply(content, index_map, ANALYZE_STRUCTURED))
+            except Exception:
+                outcomes.append(({}, list(index_map.values())))
+        return outcomes
+
+    def apply_results(results, store=True):
+        for original_idx, vals in results.items():
+            df.at[original_idx, "대기업 관련"] = vals[0]
+            df.at[original_idx, "HR 관련"] = vals[1]
+            df.at[original_idx, "정책/법안 관련"] = vals[2]
+            df.at[original_idx, "경제/산업 관련"] = vals[3]
+            df.at[original_idx, "보험/금융 관련"] = vals[4]
+            
+            score = vals.count("O")
+            df.at[original_idx, "중요도"] = score
+            df.at[original_idx, "중요여부"] = "V" if score >= 3 else ""
+        if cache is not None and store and results:
+            cache.put_many({keys[idx]: vals for idx, vals in results.items()})
+        if on_result is not None and results:
+            on_result(df.loc[list(results)].copy())
+        return len(results)
+
+    # 캐시 적중 기사는 바로 반영하고, 미적중 기사만 배치로 GPT 호출
+    pending = df
+    if cache is not None:
+        cache.evict()
+        cached = cache.get_many(list(keys.values()))
+        hit_results = {idx: cached[key] for idx, key in keys.items() if key in cached}
+        total_success += apply_results(hit_results, store=False)
+        pending = df.drop(index=list(hit_results))
+        cache.log_stats()
+
+    # 1차 분석 루프 (배치 동시 실행, 결과는 배치 순서대로 반영)
+    batches = _analyze_batches(pending, batch_size, ANALYZE_MAX_ITEMS)
+    total_batches = len(batches)
+    for batch_num, (results, failed) in enumerate(run_batches(batches, "analyze")):
+        success = apply_results(results)
         total_success += success
         retry_indices.update([f for f in failed if f is not None])
-        log_info(f"📦 Batch {batch_num+1}/{total_batches}: 성공 {success}")
+        if GPT_TOKEN_PACKING:
+            est = _analyze_overhead_tokens() + sum(_analyze_item_tokens(batches[batch_num]))
+            log_info(f"📦 Batch {batch_num+1}/{total_batches}: 성공 {success}/{len(batches[batch_num])} (입력 약 {est} 토큰)")
+        else:
+            log_info(f"📦 Batch {batch_num+1}/{total_batches}: 성공 {success}")
 
     # 재시도 루프 (에러 방어 강화)
     retry_count = 0
@@ -161,20 +401,20 @@ def analyze_articles_batch(df: pd.DataFrame, batch_size=5, max_retries=5) -> pd.
         log_info(f"🔁 재시도 {retry_count}차 (남은 기사: {len(retry_indices)})")
         
         # 🔥 KeyError 방어: None 제거 및 실제 df.index에 존재하는 것만 추출
-        current_retry_list = [idx for idx in retry_indices if idx is not None and idx in df.index]
+        current_retry_list = [idx for idx in sorted(retry_indices) if idx is not None and idx in df.index]
         retry_indices = set()
 
-        for i in range(0, len(current_retry_list), batch_size):
-            batch_ids = current_retry_list[i : i + batch_size]
-            # 한 번 더 체크 (안전장치)
-            batch_ids = [b for b in batch_ids if b in df.index]
-            if not batch_ids: continue
+        # 재시도는 batch_size 개 이하로 작게 묶어 응답 잘림/누락 가능성을 줄임
+        retry_batches = _analyze_batches(df.loc[current_retry_list], batch_size, batch_size)
 
-            batch_df = df.loc[batch_ids]
-            index_map = {}
-            success, failed = run_batch(batch_df, index_map)
-            total_success += success
+        for results, failed in run_batches(retry_batches, f"analyze-retry{retry_count}"):
+            total_success += apply_results(results)
             retry_indices.update([f for f in failed if f is not None])
 
+    if cache is not None:
+        cache.close()
+    log_usage("기사 분석")
     log_info(f"✅ 분석 완료: 총 {total_success}/{len(df)}건 성공")
+    # 재시도 후에도 실패한 행 (기본값 X/0 으로 남음, 결과 재사용 대상에서 제외)
+    df.attrs["gpt_failed"] = sorted(idx for idx in retry_indices if idx is not None)
     return df
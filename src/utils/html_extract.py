@@ -0,0 +1,137 @@
+# src/utils/html_extract.py - 기사 본문 HTML 추출 엔진 (selectolax / lxml / SoupStrainer, 결과는 BeautifulSoup 전체 파싱과 동일)
+
+import os
+import re
+import codecs
+from bs4 import BeautifulSoup
+
+try:
+    from bs4.filter import ElementFilter  # bs4 4.13+
+except ImportError:
+    ElementFilter = None
+
+try:
+    from selectolax.lexbor import LexborHTMLParser  # 선택 의존성
+except ImportError:
+    LexborHTMLParser = None
+try:
+    from lxml import html as lxml_html  # 선택 의존성
+except ImportError:
+    lxml_html = None
+
+BODY_IDS = ["dic_area", "newsct_article"]
+BODY_CLASS = "article_body"
+BODY_SELECTOR = "#dic_area, #newsct_article, .article_body"
+BODY_XPATH = (
+    "//*[@id='dic_area' or @id='newsct_article'"
+    " or contains(concat(' ', normalize-space(@class), ' '), ' article_body ')]"
+)
+# get_text() 가 텍스트로 치지 않는 문자열의 부모 태그 (BeautifulSoup 의 Script/Stylesheet/TemplateString/Ruby 문자열)
+SKIP_TAGS = {"script", "style", "template", "rt", "rp"}
+DEFAULT_CHARSET = "utf-8"
+# 국내 사이트가 흔히 쓰는 별칭 → 상위 호환 코덱
+CHARSET_ALIASES = {"euc-kr": "cp949", "ks_c_5601-1987": "cp949", "ks_c_5601": "cp949", "x-windows-949": "cp949"}
+
+# auto: 설치된 엔진 중 가장 빠른 것 (selectolax → lxml → strainer)
+HTML_ENGINE = os.getenv("HTML_ENGINE", "auto")
+
+_HEADER_CHARSET = re.compile(r"charset=[\"']?([\w.:-]+)", re.I)
+_META_CHARSET = re.compile(rb"<meta[^>]+charset=[\"']?([\w.:-]+)", re.I)
+
+def _codec(name):
+    name = CHARSET_ALIASES.get(name.lower(), name.lower())
+    try:
+        return codecs.lookup(name).name
+    except LookupError:
+        return None
+
+def declared_charset(content: bytes, content_type=None):
+    """Content-Type 헤더 → <meta charset> (앞 4KB) → utf-8 순으로 선언된 문자셋"""
+    m = _HEADER_CHARSET.search(content_type or "")
+    if m and _codec(m.group(1)): return _codec(m.group(1))
+    m = _META_CHARSET.search(content[:4096])
+    if m and _codec(m.group(1).decode("ascii", "ignore")): return _codec(m.group(1).decode("ascii", "ignore"))
+    return DEFAULT_CHARSET
+
+def decode_html(content: bytes, content_type=None) -> str:
+    """
+    원본 바이트를 선언된 문자셋으로 디코딩 (requests 의 추측 인코딩/ISO-8859-1 기본값 사용 안 함).
+    HTML 표준 전처리대로 줄바꿈을 \n 으로 통일 (html.parser 만 \r 을 남겨 엔진 간 결과가 달라지는 것 방지)
+    """
+    text = content.decode(declared_charset(content, content_type), errors="replace")
+    return text.replace("\r\n", "\n").replace("\r", "\n")
+
+def _join(strings):
+    # BeautifulSoup get_text(separator="\n", strip=True) 와 같은 규칙
+    return "\n".join(s for s in (s.strip() for s in strings) if s)
+
+def extract_soup(html: str):
+    """기준 구현: html.parser 전체 파싱 + select_one"""
+    content = BeautifulSoup(html, "html.parser").select_one(BODY_SELECTOR)
+    return content.get_text(separator="\n", strip=True) if content else None
+
+if ElementFilter is not None:
+    class _BodyFilter(ElementFilter):
+        """최상위에서는 본문 후보 태그(id/class 일치)만 트리로 만들고 나머지 태그/문자열은 버림"""
+
+        def allow_tag_creation(self, nsprefix, name, attrs):
+            if not attrs: return False
+            return attrs.get("id") in BODY_IDS or BODY_CLASS in str(attrs.get("class", "")).split()
+
+        def allow_string_creation(self, string):
+            return False
+
+def extract_strainer(html: str):
+    """본문 후보 태그만 남기는 html.parser 부분 파싱 후 select_one (문서 순서상 첫 후보 = 기준 구현과 동일)"""
+    content = BeautifulSoup(html, "html.parser", parse_only=_BodyFilter()).select_one(BODY_SELECTOR)
+    return content.get_text(separator="\n", strip=True) if content else None
+
+def _lxml_strings(el, skip=False):
+    if el.text and not skip and isinstance(el.tag, str):
+        yield el.text
+    for child in el:
+        if isinstance(child.tag, str):   # 주석/처리 지시는 본문 제외, tail 만 포함
+            yield from _lxml_strings(child, skip or child.tag in SKIP_TAGS)
+        if child.tail and not skip:
+            yield child.tail
+
+def extract_lxml(html: str):
+    if not html.strip(): return None
+    try:
+        root = lxml_html.document_fromstring(html)
+    except ValueError:
+        # XML 인코딩 선언이 있는 문자열은 lxml 이 거부 → UTF-8 바이트로 파싱
+        root = lxml_html.document_fromstring(html.encode("utf-8"), parser=lxml_html.HTMLParser(encoding="utf-8"))
+    found = root.xpath(BODY_XPATH)
+    return _join(_lxml_strings(found[0])) if found else None
+
+def _lexbor_strings(node, skip=False):
+    child = node.child
+    while child is not None:
+        tag = child.tag or ""   # 처리 명령(<?php ... ?>) 등은 tag 가 None
+        if tag == "-text":
+            if not skip: yield child.text_content
+        elif tag and not tag.startswith("-"):   # -comment, 처리 명령 등 요소가 아닌 노드 제외
+            yield from _lexbor_strings(child, skip or tag in SKIP_TAGS)
+        child = child.next
+
+def extract_selectolax(html: str):
+    content = LexborHTMLParser(html).css_first(BODY_SELECTOR)
+    return _join(_lexbor_strings(content)) if content is not None else None
+
+ENGINES = {"soup": extract_soup}
+if ElementFilter is not None: ENGINES["strainer"] = extract_strainer
+if lxml_html is not None: ENGINES["lxml"] = extract_lxml
+if LexborHTMLParser is not None: ENGINES["selectolax"] = extract_selectolax
+
+def resolve_engine(name=HTML_ENGINE):
+    if name != "auto":
+        if name not in ENGINES: raise ValueError(f"사용할 수 없는 HTML 엔진: {name} (설치됨: {', '.join(ENGINES)})")
+        return name
+    for candidate in ("selectolax", "lxml", "strainer"):
+        if candidate in ENGINES: return candidate
+    return "soup"
+
+def extract_body_text(content: bytes, content_type=None, engine=None):
+    """응답 바이트 → 본문 텍스트 (본문 영역이 없으면 None)"""
+    return ENGINES[resolve_engine(engine or HTML_ENGINE)](decode_html(content, content_type))
@@ -0,0 +1,102 @@
+# src/utils/http_client.py - step0/step2 공용 HTTP 클라이언트 (keep-alive 풀 + 재시도)
+
+import os
+import time
+import random
+import threading
+import urllib.parse
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from utils.logger import log_info
+
+HTTP_TIMEOUT = float(os.getenv("HTTP_TIMEOUT", "10"))           # 읽기 타임아웃(초)
+HTTP_CONNECT_TIMEOUT = float(os.getenv("HTTP_CONNECT_TIMEOUT", "5"))
+HTTP_MAX_RETRIES = int(os.getenv("HTTP_MAX_RETRIES", "3"))
+HTTP_POOL_MAXSIZE = int(os.getenv("HTTP_POOL_MAXSIZE", "8"))     # 호스트당 최대 연결 수
+HTTP_LOG_REQUESTS = os.getenv("HTTP_LOG_REQUESTS", "0") == "1"   # 요청별 지연/바이트 로그
+RETRYABLE_STATUS = (429, 500, 502, 503, 504)
+
+class HttpClient:
+    """
+    호스트별 커넥션 풀(keep-alive), gzip, 지수 백오프(+지터) 재시도, 요청 통계.
+    max_retries=0 이면 재시도하지 않음 (호출 측이 시도마다 속도/한도 토큰을 쓰며 직접 재시도하는 경우)
+    """
+
+    def __init__(self, timeout=HTTP_TIMEOUT, connect_timeout=HTTP_CONNECT_TIMEOUT, max_retries=HTTP_MAX_RETRIES,
+                 pool_maxsize=HTTP_POOL_MAXSIZE, backoff_factor=0.5, backoff_jitter=0.5, headers=None):
+        self.timeout = (connect_timeout, timeout)
+        retry = Retry(
+            total=max_retries,
+            connect=max_retries,
+            read=max_retries,
+            status=max_retries,
+            status_forcelist=RETRYABLE_STATUS,
+            allowed_methods=frozenset(["GET", "HEAD"]),
+            backoff_factor=backoff_factor,
+            backoff_jitter=backoff_jitter,
+            respect_retry_after_header=True,
+            raise_on_status=False,
+        )
+        # pool_block=True: 호스트당 연결 수를 pool_maxsize 로 제한 (초과 요청은 대기).
+        # 보관할 호스트 풀 수도 같은 설정: 작업 스레드 수만큼 서로 다른 호스트에 동시에 연결될 수 있음
+        adapter = HTTPAdapter(pool_connections=pool_maxsize, pool_maxsize=pool_maxsize,
+                              max_retries=retry if max_retries else 0, pool_block=True)
+        self.session = requests.Session()
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.session.headers.update({"Accept-Encoding": "gzip, deflate"})
+        if headers:
+            self.session.headers.update(headers)
+        self._lock = threading.Lock()
+        self._stats = {}
+
+    def get(self, url, headers=None, timeout=None, **kwargs):
+        """GET 요청. 네트워크 예외는 그대로 raise, 응답에는 latency/bytes 속성 추가"""
+        started = time.perf_counter()
+        res = self.session.get(url, headers=headers, timeout=timeout or self.timeout, **kwargs)
+        latency = time.perf_counter() - started
+        res.latency = latency
+        res.bytes = len(res.content)
+        self._record(url, res.status_code, latency, res.bytes)
+        return res
+
+    def _record(self, url, status, latency, nbytes):
+        host = urllib.parse.urlparse(url).netloc
+        with self._lock:
+            s = self._stats.setdefault(host, {"requests": 0, "errors": 0, "bytes": 0, "latency": 0.0, "max_latency": 0.0})
+            s["requests"] += 1
+            s["errors"] += int(status >= 400)
+            s["bytes"] += nbytes
+            s["latency"] += latency
+            s["max_latency"] = max(s["max_latency"], latency)
+        if HTTP_LOG_REQUESTS:
+            log_info(f"🌐 {status} {latency*1000:.0f}ms {nbytes}B {url}")
+
+    def stats(self):
+        with self._lock:
+            return {host: dict(s) for host, s in self._stats.items()}
+
+    def log_stats(self, label="HTTP"):
+        for host, s in self.stats().items():
+            avg = s["latency"] / s["requests"] if s["requests"] else 0
+            log_info(
+                f"📶 [{label}] {host}: {s['requests']}건, 오류 {s['errors']}건, "
+                f"{s['bytes']/1024:.0f}KB, 평균 {avg*1000:.0f}ms, 최대 {s['max_latency']*1000:.0f}ms"
+            )
+
+_shared_clients = {}
+_shared_lock = threading.Lock()
+
+def get_http_client(max_retries=HTTP_MAX_RETRIES):
+    """프로세스 공용 클라이언트 (재시도 설정별로 최초 호출 시 생성)"""
+    with _shared_lock:
+        if max_retries not in _shared_clients:
+            _shared_clients[max_retries] = HttpClient(max_retries=max_retries)
+        return _shared_clients[max_retries]
+
+def retry_wait(response, attempt, backoff_factor=0.5, jitter=0.5, max_wait=60):
+    """재시도 대기 시간(초): Retry-After 헤더(초)가 있으면 그 값, 없으면 지수 백오프 + 지터"""
+    after = response.headers.get("Retry-After") if response is not None else None
+    if after and after.strip().isdigit(): return min(max_wait, float(after))
+    return min(max_wait, backoff_factor * 2 ** attempt + random.uniform(0, jitter))
@@ -0,0 +1,99 @@
+# src/utils/local_dedup.py - GPT 중복제거 전 로컬 유사도(문자 n-gram TF-IDF) 군집화
+
+import numpy as np
+import pandas as pd
+from utils.press_registry import PRESS_REGISTRY
+
+DUPLICATE_THRESHOLD = 0.80   # 이 이상이면 GPT 없이 같은 기사로 확정
+AMBIGUOUS_THRESHOLD = 0.45   # 이 구간(이상, 확정 미만)만 GPT 판단 대상
+SUMMARY_CHARS = 200
+
+def normalize_headline(s: pd.Series) -> pd.Series:
+    """중복 제거를 위한 제목 정규화"""
+    return (
+        s.fillna("")
+         .str.replace(r"\[.*?\]", "", regex=True)
+         .str.replace(r"\s+", " ", regex=True)
+         .str.strip()
+         .str.lower()
+    )
+
+def _texts(df):
+    return (normalize_headline(df["헤드라인"]) + " " + normalize_headline(df["요약"].astype(str).str[:SUMMARY_CHARS])).tolist()
+
+def _similarity_pairs(texts, threshold):
+    """코사인 유사도 threshold 이상인 (i, j, sim) 쌍 (i < j)"""
+    # 무거운 import 는 실제 군집화 때만
+    from sklearn.feature_extraction.text import TfidfVectorizer
+    from sklearn.neighbors import NearestNeighbors
+    vectors = TfidfVectorizer(analyzer="char_wb", ngram_range=(2, 4), sublinear_tf=True).fit_transform(texts)
+    # 전체 n×n 유사도 행렬 대신 반경(1 - threshold) 안의 이웃만 청크 단위로 계산해 보관 (메모리 O(유사 쌍 수))
+    index = NearestNeighbors(metric="cosine", algorithm="brute", radius=1 - threshold + 1e-9).fit(vectors)
+    dists, neighbors = index.radius_neighbors(vectors)
+    counts = np.fromiter((len(n) for n in neighbors), dtype=np.int64, count=len(neighbors))
+    rows = np.repeat(np.arange(len(neighbors)), counts)
+    cols = np.concatenate(neighbors) if len(neighbors) else np.empty(0, dtype=np.int64)
+    sims = 1 - np.concatenate(dists) if len(dists) else np.empty(0)
+    mask = (rows < cols) & (sims >= threshold - 1e-9)
+    return rows[mask], cols[mask], sims[mask]
+
+def _components(n, rows, cols):
+    """union-find 로 연결 요소 라벨 계산"""
+    parent = np.arange(n)
+    def find(x):
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+    for a, b in zip(rows, cols):
+        ra, rb = find(a), find(b)
+        if ra != rb:
+            parent[max(ra, rb)] = min(ra, rb)
+    return np.array([find(i) for i in range(n)])
+
+def local_dedupe(df: pd.DataFrame, duplicate_threshold=DUPLICATE_THRESHOLD, ambiguous_threshold=AMBIGUOUS_THRESHOLD):
+    """
+    (중복 정리된 df, GPT 판단이 필요한 행 마스크) 반환.
+    확정 중복 그룹은 choose_by_media_priority 와 같은 규칙(우선순위 매체 → 먼저 나온 기사)으로 1건만 남긴다.
+    """
+    df = df.reset_index(drop=True)
+    if len(df) < 2:
+        return df, pd.Series(False, index=df.index)
+
+    rows, cols, sims = _similarity_pairs(_texts(df), ambiguous_threshold)
+    sure = sims >= duplicate_threshold
+    labels = _components(len(df), rows[sure], cols[sure])
+
+    ranks = PRESS_REGISTRY.priority_ranks(df["매체명"]).to_numpy()
+    order = np.lexsort((np.arange(len(df)), ranks, labels))
+    winners = np.zeros(len(df), dtype=bool)
+    first = np.ones(len(order), dtype=bool)
+    first[1:] = labels[order][1:] != labels[order][:-1]
+    winners[order[first]] = True
+
+    # 확정 그룹에 흡수되지 않은 모호한 쌍의 양쪽 기사만 GPT 로 보냄
+    amb_rows, amb_cols = rows[~sure], cols[~sure]
+    cross = labels[amb_rows] != labels[amb_cols]
+    ambiguous_labels = np.union1d(labels[amb_rows[cross]], labels[amb_cols[cross]])
+    ambiguous = np.isin(labels, ambiguous_labels) & winners
+
+    kept = df[winners].reset_index(drop=True)
+    return kept, pd.Series(ambiguous[winners], index=kept.index)
+
+def similar_to(df: pd.DataFrame, reference: pd.Series, threshold=AMBIGUOUS_THRESHOLD) -> pd.Series:
+    """reference 행 중 하나와 유사도 threshold 이상인 행 마스크 (reference 자신은 제외)"""
+    df = df.reset_index(drop=True)
+    reference = pd.Series(reference, dtype=bool).to_numpy()
+    if len(df) < 2 or not reference.any(): return pd.Series(False, index=df.index)
+    rows, cols, _ = _similarity_pairs(_texts(df), threshold)
+    mask = np.zeros(len(df), dtype=bool)
+    mask[cols[reference[rows]]] = True
+    mask[rows[reference[cols]]] = True
+    return pd.Series(mask & ~reference, index=df.index)
+
+def ambiguous_groups_order(df: pd.DataFrame, ambiguous_threshold=AMBIGUOUS_THRESHOLD):
+    """모호 후보끼리 같은 GPT 배치에 들어가도록 유사 그룹 순으로 정렬한 위치 배열"""
+    if len(df) < 2: return np.arange(len(df))
+    rows, cols, _ = _similarity_pairs(_texts(df), ambiguous_threshold)
+    labels = _components(len(df), rows, cols)
+    return np.lexsort((np.arange(len(df)), labels))
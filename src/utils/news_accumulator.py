@@ -0,0 +1,154 @@
+# src/utils/news_accumulator.py - Step 0 수집 결과 스트리밍 누적기 (조기 URL 중복 제거 + 체크포인트)
+
+import os
+import json
+import hashlib
+import pandas as pd
+from datetime import datetime
+from utils.press_registry import PRESS_REGISTRY
+from utils.frame_store import write_frame, STEP0_RAW
+
+NAVER_NEWS_HOST = "n.news.naver.com"
+OUTPUT_COLUMNS = ["구분", "키워드", "일자", "헤드라인", "요약", "매체명", "URL", "row_id"]
+QUERY_HITS_FILE = "step0_query_hits.jsonl"   # 이전 방식: 실행 폴더별 쿼리 수집 이력 (query_planner 가 함께 읽음)
+# 쿼리별 수집 이력 (query_planner 입력). 실행 폴더가 남지 않는 환경에서도 누적되도록 상태 폴더에 실행 단위로 추가
+QUERY_HISTORY_FILE = os.path.join("data", "state", "query_hits.jsonl")
+QUERY_HISTORY_RUNS = int(os.getenv("QUERY_HISTORY_RUNS", "14"))   # 보관할 최근 실행 수
+
+def _url_key(url):
+    # URL 문자열 대신 8바이트 다이제스트만 보관
+    return hashlib.blake2b(url.encode("utf-8"), digest_size=8).digest()
+
+class NewsAccumulator:
+    """쿼리별 결과를 도착 순서대로 받아 비네이버/비허용 매체/중복 URL 을 즉시 제외"""
+
+    def __init__(self, checkpoint_path=None):
+        self.checkpoint_path = checkpoint_path
+        self.rows = []
+        self.seen = set()
+        self.done = {}          # 완료된 쿼리 -> 워터마크(newest)
+        self.query_hits = {}    # 쿼리 -> {"raw": 원본 건수, "accepted": 신규 채택 건수, "urls": 중복 제거 전 유효 URL}
+        self.failed = set()     # 요청 실패/한도 소진으로 끝까지 받지 못한 쿼리 (완료로 기록하지 않아 재실행 시 다시 수집)
+        self.raw_count = 0
+
+    def _accept(self, query, items, ok=True):
+        accepted = []
+        candidates = []
+        for item in items:
+            self.raw_count += 1
+            url = item.get("URL") or ""
+            if NAVER_NEWS_HOST not in url: continue
+            if not PRESS_REGISTRY.is_allowed(item.get("매체명")): continue
+            candidates.append(url)
+            key = _url_key(url)
+            if key in self.seen: continue
+            self.seen.add(key)
+            accepted.append({
+                "구분": "",
+                "키워드": item.get("검색어", query),
+                "일자": item["날짜"],
+                "헤드라인": item["제목"],
+                "요약": item["요약"],
+                "매체명": item["매체명"],
+                "URL": url,
+            })
+        self.rows.extend(accepted)
+        if ok:
+            # 실패 쿼리의 일부 결과는 수율 통계/수집 계획에 넣지 않음 (낮은 수율로 오인)
+            self.query_hits[query] = {"raw": len(items), "accepted": len(accepted), "urls": candidates}
+        return accepted, candidates
+
+    def add(self, query, items, newest=None, ok=True):
+        """
+        쿼리 1건의 결과 추가. 새로 채택된 건수 반환.
+        ok=False (요청 실패/한도 소진) 면 받은 기사는 채택하되 완료로 기록하지 않음 (체크포인트 재개 시 다시 수집)
+        """
+        accepted, candidates = self._accept(query, items or [], ok)
+        if ok:
+            self.done[query] = newest or {}
+            self.failed.discard(query)
+        else:
+            self.failed.add(query)
+        if self.checkpoint_path:
+            record = {"query": query, "raw": len(items or []), "rows": accepted, "newest": newest or {},
+                      "urls": candidates, "failed": not ok}
+            with open(self.checkpoint_path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+        return len(accepted)
+
+    def seed(self, df):
+        """같은 날 이전 실행의 저장 결과를 먼저 채움 (증분 모드: 기존 기사 유지 + 새 기사만 추가). 채운 건수 반환"""
+        if df is None or df.empty or "URL" not in df.columns: return 0
+        seeded = 0
+        frame = df.reindex(columns=OUTPUT_COLUMNS[:-1]).astype(object)
+        for row in frame.where(frame.notna(), None).to_dict("records"):
+            key = _url_key(row["URL"] or "")
+            if key in self.seen: continue
+            self.seen.add(key)
+            self.rows.append(row)
+            seeded += 1
+        return seeded
+
+    def resume(self):
+        """체크포인트가 있으면 재생해 상태 복원. 복원된 쿼리 수 반환"""
+        if not self.checkpoint_path or not os.path.exists(self.checkpoint_path): return 0
+        with open(self.checkpoint_path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    break  # 기록 도중 중단된 마지막 줄
+                for row in record["rows"]:
+                    key = _url_key(row["URL"])
+                    if key in self.seen: continue   # seed 로 이미 채운 기사 (저장 직후 중단된 경우)
+                    self.seen.add(key)
+                    self.rows.append(row)
+                self.raw_count += record.get("raw", 0)
+                if record.get("failed"):
+                    self.failed.add(record["query"])
+                    continue
+                self.failed.discard(record["query"])
+                self.done[record["query"]] = record.get("newest", {})
+                self.query_hits[record["query"]] = {
+                    "raw": record.get("raw", 0), "accepted": len(record["rows"]), "urls": record.get("urls", []),
+                }
+        return len(self.done)
+
+    def to_frame(self):
+        df = pd.DataFrame(self.rows, columns=OUTPUT_COLUMNS[:-1])
+        df["row_id"] = df.index
+        return df
+
+    def save_query_hits(self, path=QUERY_HISTORY_FILE, keep_runs=QUERY_HISTORY_RUNS):
+        """이번 실행의 쿼리별 이력을 추가하고 최근 keep_runs 개 실행만 남김 (임시 파일 → 교체)"""
+        run = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        lines = []
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                lines = [line for line in f if line.strip()]
+        runs = []
+        for line in lines:
+            try:
+                runs.append(json.loads(line).get("run"))
+            except ValueError:
+                runs.append(None)
+        kept = set(list(dict.fromkeys(r for r in runs if r and r != run))[-(keep_runs - 1):]) if keep_runs > 1 else set()
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.writelines(line for line, r in zip(lines, runs) if r in kept)
+            for query, hits in self.query_hits.items():
+                f.write(json.dumps({"run": run, "query": query, **hits}, ensure_ascii=False) + "\n")
+        os.replace(tmp_path, path)
+
+    def save(self, output_dir):
+        """최종 결과(step0_raw) 1회 기록 (임시 파일 → 교체) 후 체크포인트 삭제"""
+        df = self.to_frame()
+        write_frame(df, output_dir, STEP0_RAW)
+        self.save_query_hits()
+        self.remove_checkpoint()
+        return df
+
+    def remove_checkpoint(self):
+        if self.checkpoint_path and os.path.exists(self.checkpoint_path):
+            os.remove(self.checkpoint_path)
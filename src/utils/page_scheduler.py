@@ -0,0 +1,81 @@
+# src/utils/page_scheduler.py - 쿼리별 최근 수율 기반 페이지 예산 배분
+
+import os
+import json
+import math
+from datetime import datetime
+
+QUERY_YIELD_FILE = os.path.join("data", "state", "query_yield.json")
+PAGE_SIZE = 100
+MAX_PAGES = 3     # search_naver_news_single 기본 display=300 → 최대 3회 호출 (query_planner 도 사용)
+YIELD_ALPHA = 0.3   # 지수이동평균 가중치 (최근 실행 비중)
+# 예산 부족으로 제외되는 쿼리가 있을 때, 가장 오래 실행되지 않은 쿼리에 돌려 주는 탐색 페이지 수
+# (제외된 쿼리는 통계가 갱신되지 않아 수율이 회복돼도 계속 제외되므로)
+EXPLORE_PAGES = int(os.getenv("NAVER_EXPLORE_PAGES", "1"))
+
+def load_yield_stats(path=QUERY_YIELD_FILE):
+    """{query: {"runs", "fresh", "accepted"}} (fresh/accepted 는 지수이동평균)"""
+    if not os.path.exists(path): return {}
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def save_yield_stats(stats, path=QUERY_YIELD_FILE):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(stats, f, ensure_ascii=False, indent=1)
+    os.replace(tmp_path, path)
+
+def update_yield_stats(stats, query_hits, alpha=YIELD_ALPHA):
+    """이번 실행 결과(query_hits: {query: {"raw", "accepted"}})를 지수이동평균으로 반영 (last: 마지막 실행 시각)"""
+    now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    for query, hits in query_hits.items():
+        s = stats.get(query)
+        fresh, accepted = hits.get("raw", 0), hits.get("accepted", 0)
+        if s is None:
+            stats[query] = {"runs": 1, "fresh": fresh, "accepted": accepted, "last": now}
+            continue
+        s["runs"] += 1
+        s["last"] = now
+        s["fresh"] = round((1 - alpha) * s["fresh"] + alpha * fresh, 3)
+        s["accepted"] = round((1 - alpha) * s["accepted"] + alpha * accepted, 3)
+    return stats
+
+def desired_pages(stat, max_pages=MAX_PAGES):
+    # 최근 평균 신규 기사 수(+20% 여유)를 담는 페이지 수
+    if stat is None: return max_pages
+    return max(1, min(max_pages, math.ceil(stat["fresh"] * 1.2 / PAGE_SIZE)))
+
+def schedule_pages(queries, stats, call_budget=None, max_pages=MAX_PAGES, explore_pages=EXPLORE_PAGES):
+    """
+    (실행 순서, {query: 페이지 수}) 반환.
+    - 순서: 이력 없는 쿼리 먼저(측정 목적), 이후 평균 채택 기사 수 내림차순
+    - 예산: 수율 순으로 1페이지씩 우선 배정한 뒤 남는 예산을 추가 페이지로 배정,
+      예산이 쿼리 수보다 적으면 수율 하위 쿼리는 0페이지(이번 실행 제외).
+      이때 explore_pages 개는 제외될 쿼리 중 마지막 실행이 가장 오래된 쿼리에 1페이지씩 배정 (실행마다 돌아가며 재측정)
+    """
+    unique = list(dict.fromkeys(queries))
+    position = {q: i for i, q in enumerate(unique)}
+    order = sorted(unique, key=lambda q: (q in stats, -(stats.get(q) or {}).get("accepted", 0), position[q]))
+    wanted = {q: desired_pages(stats.get(q), max_pages) for q in order}
+
+    budget = sum(wanted.values()) if not call_budget else call_budget
+    reserve = min(explore_pages, budget) if budget < len(order) else 0
+    budget -= reserve
+    pages = {}
+    for q in order:
+        pages[q] = 1 if budget > 0 else 0
+        budget -= pages[q]
+    starved = sorted((q for q in order if not pages[q]), key=lambda q: ((stats.get(q) or {}).get("last", ""), position[q]))
+    for q in starved[:reserve]:
+        pages[q] = 1
+    budget += reserve - len(starved[:reserve])
+    for q in order:
+        extra = min(wanted[q] - pages[q], budget) if pages[q] else 0
+        if extra > 0:
+            pages[q] += extra
+            budget -= extra
+    return [q for q in order if pages[q] > 0], pages
@@ -0,0 +1,200 @@
+# src/utils/pre_classifier.py - 과거 GPT 라벨로 학습한 로컬 사전 분류기 (TF-IDF + 로지스틱 회귀)
+
+import os
+import glob
+import shutil
+import pickle
+import numpy as np
+import pandas as pd
+from utils.local_dedup import normalize_headline, similar_to
+from utils.story_index import canonical_url, headline_signatures
+from utils.frame_store import read_frame, write_frame, STEP0_RAW, STEP1_FILTERED, STEP1_LABELED, LABEL_SOURCE
+
+PRE_CLASSIFIER_FILE = os.path.join("data", "state", "pre_classifier.pkl")
+# 학습 데이터 보관 위치 (날짜 폴더별 step1_labeled 중 학습에 쓰는 컬럼/행만). 실행 폴더(data/<날짜>)가 남지 않는 환경에서도 누적되도록 상태 폴더에 둠
+LABEL_HISTORY_DIR = os.path.join("data", "state", "labels")
+LABEL_HISTORY_DAYS = int(os.getenv("LABEL_HISTORY_DAYS", "90"))
+LABEL_FIELDS = ["대기업 관련", "HR 관련", "정책/법안 관련", "경제/산업 관련", "보험/금융 관련"]   # gpt_utils.LABEL_COLUMNS 앞 5개
+IMPORTANT_SCORE = 3
+SUMMARY_CHARS = 200
+
+# 중요 확률이 LOW 미만이면 GPT 없이 비중요(X/0), HIGH 이상이면 로컬 라벨로 확정. 그 사이만 GPT 로 보냄
+# HIGH 기본값 1.0 은 확신 양성도 GPT 로 보냄 (시트에 올라가는 O/X 라벨은 GPT 판단 유지)
+PRECLASSIFY_LOW = float(os.getenv("PRECLASSIFY_LOW", "0.05"))
+PRECLASSIFY_HIGH = float(os.getenv("PRECLASSIFY_HIGH", "1.0"))
+# 로컬 확정 기사 중 이 비율을 무작위로 골라 GPT 로도 분석 (학습 데이터가 GPT 라벨만으로 확정 구간을 계속 대표하도록)
+PRECLASSIFY_AUDIT_RATE = float(os.getenv("PRECLASSIFY_AUDIT_RATE", "0.05"))
+MIN_TRAIN_ROWS = 200
+
+# step1_labeled 의 라벨출처 값. 학습에는 gpt 만 사용: local(사전 분류기 확정)은 모델 자신의 예측이라 다시 학습하면
+# GPT 판단에서 멀어지고, reused(이전 실행 라벨 재사용: 그 날짜 데이터에 이미 있음)와 duplicate(중복제거로 빠진 사본)는 중복
+SOURCE_GPT, SOURCE_LOCAL, SOURCE_REUSED, SOURCE_DUPLICATE = "gpt", "local", "reused", "duplicate"
+
+def _texts(df):
+    return (normalize_headline(df["헤드라인"]) + " " + normalize_headline(df["요약"].astype(str).str[:SUMMARY_CHARS])).tolist()
+
+TRAIN_COLUMNS = ["URL", "헤드라인", "요약", *LABEL_FIELDS, "중요도", LABEL_SOURCE]   # 여러 날짜를 읽을 때 필요한 컬럼만 로드 (본문 등 제외)
+
+def _read_frame(folder, name):
+    try:
+        return read_frame(folder, name, columns=TRAIN_COLUMNS)
+    except Exception:
+        return None
+
+def save_label_history(labeled, day, history_dir=LABEL_HISTORY_DIR, keep_days=LABEL_HISTORY_DAYS):
+    """step1_labeled 중 GPT 라벨 행을 학습 이력에 저장하고 keep_days 개 날짜보다 오래된 이력은 삭제"""
+    rows = labeled[labeled[LABEL_SOURCE] == SOURCE_GPT] if LABEL_SOURCE in labeled.columns else labeled
+    folder = os.path.join(history_dir, day)
+    os.makedirs(folder, exist_ok=True)
+    write_frame(rows[[c for c in TRAIN_COLUMNS if c in rows.columns]], folder, STEP1_LABELED)
+    days = sorted(d for d in glob.glob(os.path.join(history_dir, "????-??-??")) if os.path.isdir(d))
+    for folder in days[:-keep_days] if keep_days > 0 else []:
+        shutil.rmtree(folder, ignore_errors=True)
+
+def _day_folders(dirs, lookback_days):
+    # {날짜: [폴더, ...]} (앞쪽 디렉터리 우선), 최근 lookback_days 개 날짜만
+    folders = {}
+    for data_dir in dirs:
+        for folder in glob.glob(os.path.join(data_dir, "????-??-??")):
+            if os.path.isdir(folder): folders.setdefault(os.path.basename(folder), []).append(folder)
+    return {day: folders[day] for day in sorted(folders)[-lookback_days:]}
+
+def load_training_data(data_dir="data", lookback_days=90, history_dir=LABEL_HISTORY_DIR):
+    """
+    최근 lookback_days 개 날짜의 학습 데이터 (헤드라인, 요약, 라벨 5개, 중요도, important, day, labeled).
+    날짜마다 학습 이력(history_dir) → 실행 폴더(data_dir) 순으로 읽는다.
+    step1_labeled 가 있으면 GPT 라벨 행만 사용(SOURCE_* 참고, 출처 컬럼이 없는 과거 파일은 전부 GPT 라벨)하고,
+    없는 과거 실행은 step1_filtered 를 양성, step0_raw 중 선별되지 않은 기사(URL/헤드라인 서명 모두 불일치)를 음성으로 본다.
+    이때 선별 기사와 유사한 기사는 중복제거로 빠진 사본일 수 있어 음성에서 제외 (labeled=False: 라벨별 모델 학습 제외).
+    """
+    frames = []
+    for day, folders in _day_folders([history_dir, data_dir], lookback_days).items():
+        labeled = next((f for f in (_read_frame(folder, STEP1_LABELED) for folder in folders) if f is not None and not f.empty), None)
+        folder = folders[-1]
+        if labeled is not None:
+            source = labeled[LABEL_SOURCE] if LABEL_SOURCE in labeled.columns else pd.Series(SOURCE_GPT, index=labeled.index)
+            labeled = labeled[(source == SOURCE_GPT).fillna(False).to_numpy(dtype=bool)].assign(labeled=True)
+        else:
+            filtered = _read_frame(folder, STEP1_FILTERED)
+            raw = _read_frame(folder, STEP0_RAW)
+            if filtered is None or filtered.empty or raw is None or "헤드라인" not in raw.columns: continue
+            positive_urls = set(filtered["URL"].map(canonical_url))
+            positive_sigs = set(headline_signatures(filtered["헤드라인"]).dropna())
+            unmatched = ~raw["URL"].map(canonical_url).isin(positive_urls) & ~headline_signatures(raw["헤드라인"]).isin(positive_sigs)
+            if "요약" in raw.columns:
+                unmatched &= ~similar_to(raw, ~unmatched).to_numpy()
+            negative = raw[unmatched]
+            negative = negative.assign(**{c: "X" for c in LABEL_FIELDS}, 중요도=0)
+            labeled = pd.concat([filtered.assign(labeled=True), negative.assign(labeled=False)], ignore_index=True)
+        if not {"헤드라인", "요약", "중요도"}.issubset(labeled.columns): continue
+        labeled = labeled.drop_duplicates(subset=["URL"])
+        frames.append(labeled.assign(day=day)[["헤드라인", "요약", *LABEL_FIELDS, "중요도", "labeled", "day"]])
+    if not frames:
+        return pd.DataFrame(columns=["헤드라인", "요약", *LABEL_FIELDS, "중요도", "labeled", "day", "important"])
+    data = pd.concat(frames, ignore_index=True)
+    data["중요도"] = pd.to_numeric(data["중요도"], errors="coerce").fillna(0).astype(int)
+    data["important"] = data["중요도"] >= IMPORTANT_SCORE
+    return data
+
+class PreClassifier:
+    """중요 여부 확률 모델 1개 + 라벨(O/X)별 모델 5개 (TF-IDF 특징 공유)"""
+
+    def __init__(self):
+        from sklearn.feature_extraction.text import TfidfVectorizer  # 학습할 때만 import (저장된 모델은 unpickle 시 로드)
+        self.vectorizer = TfidfVectorizer(analyzer="char_wb", ngram_range=(2, 4), sublinear_tf=True, min_df=2, max_features=200000)
+        self.important_model = None
+        self.label_models = {}
+        self.trained_on = {}
+
+    def fit(self, data: pd.DataFrame):
+        from sklearn.linear_model import LogisticRegression
+        x = self.vectorizer.fit_transform(_texts(data))
+        self.important_model = LogisticRegression(class_weight="balanced", max_iter=2000).fit(x, data["important"])
+        labeled = data["labeled"].to_numpy(dtype=bool)
+        for col in LABEL_FIELDS:
+            y = (data.loc[labeled, col] == "O").to_numpy()
+            # 한쪽 값만 있으면 학습 불가 → 그 값으로 고정
+            self.label_models[col] = LogisticRegression(class_weight="balanced", max_iter=2000).fit(x[labeled], y) if 0 < y.sum() < len(y) else bool(y.any())
+        self.trained_on = {"rows": len(data), "days": int(data["day"].nunique()), "positives": int(data["important"].sum())}
+        return self
+
+    def important_proba(self, df: pd.DataFrame) -> np.ndarray:
+        return self.important_model.predict_proba(self.vectorizer.transform(_texts(df)))[:, 1]
+
+    def predict_labels(self, df: pd.DataFrame) -> pd.DataFrame:
+        """라벨별 O/X 예측 프레임 (df 와 같은 인덱스)"""
+        x = self.vectorizer.transform(_texts(df))
+        out = {}
+        for col, model in self.label_models.items():
+            pred = model.predict(x) if not isinstance(model, bool) else np.full(len(df), model)
+            out[col] = np.where(pred, "O", "X")
+        return pd.DataFrame(out, index=df.index)
+
+    def save(self, path=PRE_CLASSIFIER_FILE):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            pickle.dump(self, f)
+        os.replace(tmp_path, path)
+
+def load_pre_classifier(path=PRE_CLASSIFIER_FILE):
+    """학습된 모델 (없거나 읽을 수 없으면 None)"""
+    if not os.path.exists(path): return None
+    try:
+        with open(path, "rb") as f:
+            return pickle.load(f)
+    except Exception:
+        return None
+
+def split_by_confidence(model: PreClassifier, df: pd.DataFrame, low=PRECLASSIFY_LOW, high=PRECLASSIFY_HIGH,
+                        audit_rate=PRECLASSIFY_AUDIT_RATE, rng=None):
+    """
+    (GPT 로 보낼 불확실 기사, 로컬 라벨을 채운 확정 기사) 반환.
+    확정 기사 중 audit_rate 비율은 무작위로 GPT 대상에 남김 (감사 표본, 건수는 uncertain.attrs["audit"])
+    """
+    proba = model.important_proba(df)
+    negative = proba < low
+    positive = (proba >= high) & (high < 1.0)
+    if audit_rate > 0:
+        audit = (negative | positive) & ((rng or np.random.default_rng()).random(len(df)) < audit_rate)
+        negative, positive = negative & ~audit, positive & ~audit
+    else:
+        audit = np.zeros(len(df), dtype=bool)
+    decided = df[negative | positive].copy()
+    for col in LABEL_FIELDS:
+        decided[col] = "X"
+    if positive.any():
+        labels = model.predict_labels(df[positive])
+        decided.loc[labels.index, LABEL_FIELDS] = labels
+    scores = (decided[LABEL_FIELDS] == "O").sum(axis=1)
+    # 확신 양성은 라벨 예측과 무관하게 중요 기사로 유지
+    scores = scores.where(~decided.index.isin(df.index[positive]), scores.clip(lower=IMPORTANT_SCORE))
+    decided["중요도"] = scores.astype(int)
+    decided["중요여부"] = np.where(decided["중요도"] >= IMPORTANT_SCORE, "V", "")
+    uncertain = df[~(negative | positive)]
+    uncertain.attrs["audit"] = int(audit.sum())
+    return uncertain, decided
+
+def evaluate(model: PreClassifier, test: pd.DataFrame, thresholds=(0.02, 0.05, 0.1, 0.2), high=PRECLASSIFY_HIGH):
+    """임계값별 GPT 호출 절감률 / 중요 기사 누락률 / 확정 양성 정밀도·라벨 일치율 목록"""
+    proba = model.important_proba(test)
+    important = test["important"].to_numpy()
+    rows = []
+    for low in thresholds:
+        negative = proba < low
+        positive = (proba >= high) & (high < 1.0)
+        row = {
+            "low": low,
+            "high": high,
+            "skipped": float((negative | positive).mean()),
+            "missed_important": int((negative & important).sum()),
+            "miss_rate": float((negative & important).sum() / max(1, important.sum())),
+            "negative_precision": float((~important[negative]).mean()) if negative.any() else None,
+            "positive_precision": float(important[positive].mean()) if positive.any() else None,
+        }
+        if positive.any():
+            labeled = test[positive & test["labeled"].to_numpy(dtype=bool)]
+            if not labeled.empty:
+                row["label_agreement"] = float((model.predict_labels(labeled) == labeled[LABEL_FIELDS]).to_numpy().mean())
+        rows.append(row)
+    return rows
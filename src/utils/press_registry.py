@@ -0,0 +1,93 @@
+# src/utils/press_registry.py - 언론사 레지스트리 (수집 허용 여부 / 한글 매체명 / 중복 시 우선순위)
+
+from collections import namedtuple
+from functools import lru_cache
+import pandas as pd
+
+PressInfo = namedtuple("PressInfo", ["domain", "name", "allowed"])
+
+# (도메인 접미사, 매체명, 수집 허용)
+# 호스트는 가장 긴 접미사 일치 항목으로 판정: news.heraldcorp.com 은 허용, www.heraldcorp.com 은 비허용
+PRESS_TABLE = [
+    ("www.chosun.com", "조선일보", True),
+    ("biz.chosun.com", "조선비즈", True),
+    ("weekly.chosun.com", "주간조선", True),
+    ("www.joins.com", "중앙일보", True),
+    ("www.donga.com", "동아일보", True),
+    ("weekly.donga.com", "주간동아", False),
+    ("sports.donga.com", "스포츠동아", False),
+    ("www.khan.co.kr", "경향신문", True),
+    ("weekly.khan.co.kr", "주간경향", False),
+    ("sports.khan.co.kr", "경향스포츠", False),
+    ("www.hani.co.kr", "한겨레", True),
+    ("www.hankyung.com", "한국경제", True),
+    ("magazine.hankyung.com", "매거진한경", False),
+    ("mk.co.kr", "매일경제", False),
+    ("www.mk.co.kr", "매일경제", True),
+    ("magazine.mk.co.kr", "매경이코노미", True),
+    ("www.hankookilbo.com", "한국일보", True),
+    ("view.asiae.co.kr", "아시아경제", True),
+    ("www.edaily.co.kr", "이데일리", True),
+    ("heraldcorp.com", "헤럴드경제", False),
+    ("news.heraldcorp.com", "헤럴드경제", True),
+    ("www.fnnews.com", "파이낸셜뉴스", True),
+    ("www.mt.co.kr", "머니투데이", True),
+    ("www.sisain.co.kr", "시사인", True),
+    ("www.seoul.co.kr", "서울신문", False),
+    ("www.insnews.co.kr", "한국보험신문", True),
+    ("www.insjournal.co.kr", "보험저널", True),
+    ("insweek.co.kr", "보험신보", True),
+]
+
+# 중복 기사 그룹에서 대표 기사로 남길 매체 순서
+MEDIA_PRIORITY = ["조선일보", "중앙일보", "동아일보", "서울신문", "경향신문", "한겨레", "한국경제", "머니투데이"]
+
+def _normalize_host(host):
+    host = str(host or "").strip().lower()
+    if "//" in host:
+        host = host.split("//", 1)[1]
+    return host.split("/", 1)[0].split(":", 1)[0].rstrip(".")
+
+class PressRegistry:
+    """호스트 접미사 인덱스. 조회는 호스트 라벨 수만큼의 dict 조회 (목록 길이와 무관)"""
+
+    def __init__(self, table=PRESS_TABLE, priority=MEDIA_PRIORITY):
+        self._by_suffix = {domain: PressInfo(domain, name, allowed) for domain, name, allowed in table}
+        self._rank = {name: i for i, name in enumerate(priority)}
+        self.default_rank = len(priority)
+        self.lookup = lru_cache(maxsize=None)(self._lookup)
+
+    def _lookup(self, host):
+        """가장 긴 접미사 일치 항목 (없으면 None)"""
+        labels = _normalize_host(host).split(".")
+        for i in range(len(labels) - 1):
+            info = self._by_suffix.get(".".join(labels[i:]))
+            if info is not None:
+                return info
+        return None
+
+    def is_allowed(self, host):
+        info = self.lookup(host)
+        return bool(info and info.allowed)
+
+    def display_name(self, host):
+        info = self.lookup(host)
+        return info.name if info else host
+
+    def priority_rank(self, name):
+        """매체명(한글) 기준 우선순위. 목록에 없으면 default_rank"""
+        return self._rank.get(name, self.default_rank)
+
+    # --- 컬럼 단위 (고유값만 조회 후 map) ---
+    def allowed_mask(self, hosts: pd.Series) -> pd.Series:
+        table = {h: self.is_allowed(h) for h in hosts.dropna().unique()}
+        return hosts.map(table).fillna(False).astype(bool)
+
+    def display_names(self, hosts: pd.Series) -> pd.Series:
+        table = {h: self.display_name(h) for h in hosts.dropna().unique()}
+        return hosts.map(table).fillna(hosts)
+
+    def priority_ranks(self, names: pd.Series) -> pd.Series:
+        return names.map(self._rank).fillna(self.default_rank).astype(int)
+
+PRESS_REGISTRY = PressRegistry()
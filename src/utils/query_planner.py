@@ -0,0 +1,136 @@
+# src/utils/query_planner.py - 과거 수집 이력 기반 쿼리 중복도 분석 및 실행 계획
+
+import os
+import glob
+import json
+import math
+from datetime import datetime
+from utils.news_accumulator import QUERY_HITS_FILE, QUERY_HISTORY_FILE
+from utils.page_scheduler import MAX_PAGES, PAGE_SIZE
+
+QUERY_PLAN_FILE = os.path.join("data", "state", "query_plan.json")
+
+def _read_hits(path, history, run=None):
+    # JSONL → history[실행][query]. run 이 없으면 기록의 "run" 값
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            runs = history.setdefault(run or record.get("run", ""), {})
+            runs[record["query"]] = {"raw": record.get("raw", 0), "urls": set(record.get("urls", []))}
+
+def load_query_history(data_dir="data", lookback_days=14, path=QUERY_HISTORY_FILE):
+    """최근 lookback_days 개 실행의 {실행: {query: {"raw", "urls"}}} (상태 폴더 이력 + 이전 방식의 실행 폴더별 이력)"""
+    history = {}
+    for legacy in glob.glob(os.path.join(data_dir, "*", QUERY_HITS_FILE)):
+        _read_hits(legacy, history, run=os.path.basename(os.path.dirname(legacy)))
+    if os.path.exists(path):
+        _read_hits(path, history)
+    return {run: history[run] for run in sorted(history)[-lookback_days:]}
+
+def estimate_calls(raw):
+    # 조기 종료 기준: PAGE_SIZE 건 미만 페이지에서 중단
+    return min(MAX_PAGES, raw // PAGE_SIZE + 1)
+
+def query_stats(history):
+    """쿼리별 실행 횟수, 평균 호출 수, 평균 유효/고유 URL 수, 다른 쿼리와의 최대 포함률"""
+    stats = {}
+    for runs in history.values():
+        url_owners = {}
+        for query, hits in runs.items():
+            for url in hits["urls"]:
+                url_owners.setdefault(url, set()).add(query)
+        for query, hits in runs.items():
+            s = stats.setdefault(query, {"runs": 0, "calls": 0, "urls": 0, "unique": 0, "overlap": {}})
+            s["runs"] += 1
+            s["calls"] += estimate_calls(hits["raw"])
+            s["urls"] += len(hits["urls"])
+            for url in hits["urls"]:
+                owners = url_owners[url]
+                if len(owners) == 1:
+                    s["unique"] += 1
+                for other in owners:
+                    if other != query:
+                        s["overlap"][other] = s["overlap"].get(other, 0) + 1
+    for s in stats.values():
+        runs = s["runs"]
+        s["max_overlap"] = max(s["overlap"].values()) / s["urls"] if s["urls"] and s["overlap"] else 0.0
+        s["avg_calls"] = s["calls"] / runs
+        s["avg_urls"] = s["urls"] / runs
+        s["avg_unique"] = s["unique"] / runs
+    return stats
+
+def build_query_plan(queries, history, min_runs=3, coverage=0.95, low_yield=0.5):
+    """
+    - skip: 다른 유지 쿼리들이 과거 유효 URL 의 coverage 이상을 이미 가져오는 쿼리 (고유 기여 낮은 순으로 탐욕 제거)
+    - deprioritize: 고유 기여가 low_yield 미만인 쿼리 (실행 순서 뒤로)
+    Naver 검색 API 는 OR 질의가 없어 병합은 'covered_by' 로 흡수 쿼리를 기록하는 형태로 표현한다.
+    이력이 min_runs 미만인 쿼리는 판단하지 않고 유지한다.
+    """
+    stats = query_stats(history)
+    kept = list(dict.fromkeys(queries))
+    skip = {}
+    # 날짜별 URL 을 가져오는 유지 쿼리 수 (쿼리 제거 시 차감)
+    owner_count = {}
+    for day, runs in history.items():
+        counts = owner_count.setdefault(day, {})
+        for query in kept:
+            for url in runs.get(query, {}).get("urls", ()):
+                counts[url] = counts.get(url, 0) + 1
+    candidates = sorted(
+        (q for q in kept if stats.get(q, {}).get("runs", 0) >= min_runs),
+        key=lambda q: (stats[q]["avg_unique"], -stats[q]["max_overlap"]),
+    )
+    for query in candidates:
+        own = covered = 0
+        for day, runs in history.items():
+            for url in runs.get(query, {}).get("urls", ()):
+                own += 1
+                covered += owner_count[day][url] > 1
+        if own == 0 or covered / own >= coverage:
+            for day, runs in history.items():
+                for url in runs.get(query, {}).get("urls", ()):
+                    owner_count[day][url] -= 1
+            overlap = stats[query]["overlap"]
+            covered_by = sorted((q for q in overlap if q in kept), key=lambda q: -overlap[q])[:3]
+            skip[query] = {"covered_by": covered_by, "coverage": round(covered / own, 3) if own else 1.0}
+            kept.remove(query)
+
+    deprioritize = [q for q in kept if q in stats and stats[q]["runs"] >= min_runs and stats[q]["avg_unique"] < low_yield]
+    order = [q for q in kept if q not in deprioritize] + deprioritize
+    calls_before = sum(stats[q]["avg_calls"] if q in stats else MAX_PAGES for q in dict.fromkeys(queries))
+    calls_after = sum(stats[q]["avg_calls"] if q in stats else MAX_PAGES for q in order)
+    return {
+        "generated": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        "runs": len(history),
+        "skip": skip,
+        "deprioritize": deprioritize,
+        "order": order,
+        "estimated_calls_before": math.ceil(calls_before),
+        "estimated_calls_after": math.ceil(calls_after),
+    }
+
+def save_query_plan(plan, path=QUERY_PLAN_FILE):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(plan, f, ensure_ascii=False, indent=1)
+    os.replace(tmp_path, path)
+
+def load_query_plan(path=QUERY_PLAN_FILE):
+    if not os.path.exists(path): return None
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+def apply_query_plan(queries, plan):
+    """계획에 따라 건너뛰기/순서 조정. 계획에 없는 새 쿼리는 원래 위치 그대로 앞쪽에 유지"""
+    if not plan: return list(queries)
+    skip = plan.get("skip", {})
+    deprioritized = set(plan.get("deprioritize", []))
+    active = [q for q in dict.fromkeys(queries) if q not in skip]
+    return [q for q in active if q not in deprioritized] + [q for q in active if q in deprioritized]
@@ -0,0 +1,41 @@
+# src/utils/rate_limiter.py
+
+import threading
+import time
+
+
+class TokenBucket:
+    """스레드 안전 토큰 버킷 (초당 호출 수 + 일일 한도)"""
+
+    def __init__(self, rate_per_sec, capacity=None, daily_limit=None):
+        self.rate = float(rate_per_sec)
+        self.capacity = float(capacity or max(1.0, rate_per_sec))
+        self.daily_limit = daily_limit
+        self.tokens = self.capacity
+        self.used = 0
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self._last) * self.rate)
+        self._last = now
+
+    def acquire(self, amount=1):
+        """토큰 amount 개 획득까지 대기. 일일 한도 소진 시 False 반환"""
+        amount = min(amount, self.capacity)  # 버킷보다 큰 요청은 가득 찼을 때 통과
+        while True:
+            with self._lock:
+                if self.daily_limit is not None and self.used >= self.daily_limit:
+                    return False
+                self._refill()
+                if self.tokens >= amount:
+                    self.tokens -= amount
+                    self.used += amount
+                    return True
+                wait = (amount - self.tokens) / self.rate
+            time.sleep(wait)
+
+    def remaining(self):
+        if self.daily_limit is None: return None
+        return max(0, self.daily_limit - self.used)
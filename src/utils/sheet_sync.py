@@ -0,0 +1,187 @@
+# src/utils/sheet_sync.py - 워크시트 차등 동기화 (URL 기준 행 단위 추가/수정/삭제, 크기 기준 분할 batch_update, 429 백오프)
+
+import os
+import re
+import json
+import time
+import random
+import pandas as pd
+from gspread.exceptions import APIError
+from gspread.utils import rowcol_to_a1
+from utils.logger import log_info
+
+SHEET_SYNC_KEY = "URL"
+SHEET_CHUNK_BYTES = int(os.getenv("SHEET_CHUNK_BYTES", str(1_000_000)))   # batch_update 1회 최대 전송량(대략)
+SHEET_MAX_RETRIES = int(os.getenv("SHEET_MAX_RETRIES", "5"))
+RETRYABLE_STATUS = (429, 500, 502, 503)
+
+def call_with_backoff(fn, *args, **kwargs):
+    """Sheets API 호출. 할당량 초과(429)/일시 오류는 지수 백오프(+지터)로 재시도, 그 외 예외는 그대로 raise"""
+    for attempt in range(SHEET_MAX_RETRIES + 1):
+        try:
+            return fn(*args, **kwargs)
+        except APIError as e:
+            if e.code not in RETRYABLE_STATUS or attempt == SHEET_MAX_RETRIES: raise
+            wait = min(64, 2 ** attempt) + random.uniform(0, 1)
+            log_info(f"⏳ Sheets {e.code} - {wait:.1f}초 후 재시도 ({attempt+1}/{SHEET_MAX_RETRIES})")
+            time.sleep(wait)
+
+_DATE = re.compile(r"^(\d{4})\s*[-./]\s*(\d{1,2})\s*[-./]\s*(\d{1,2})\.?$")
+_NUMBER = re.compile(r"^[+-]?[\d,]*\.?\d+$")
+
+def _cell(value):
+    if value is None or (not isinstance(value, str) and pd.isna(value)): return ""
+    return str(value)
+
+def _entered(value):
+    # USER_ENTERED 로 기록 (set_with_dataframe 과 같은 방식: 날짜/숫자는 시트가 해석, 작은따옴표로 시작하면 한 번 더 붙여 그대로 보존)
+    return "'" + value if value.startswith("'") else value
+
+def normalize_cell(value):
+    """
+    비교용 셀 값. 시트가 USER_ENTERED 값을 표시 형식으로 돌려주므로(예: 2026-10-01 → 2026. 10. 1, 3.0 → 3)
+    날짜는 YYYY-MM-DD, 숫자는 float 값으로 맞춰 기록한 값과 읽은 값을 같은 기준으로 비교
+    """
+    m = _DATE.match(value)
+    if m: return "{}-{:0>2}-{:0>2}".format(*m.groups())
+    if _NUMBER.match(value):
+        try: return repr(float(value.replace(",", "")))
+        except ValueError: return value
+    return value
+
+def frame_to_rows(df):
+    """DataFrame → (헤더, 문자열 행 리스트)"""
+    header = [str(c) for c in df.columns]
+    rows = [[_cell(v) for v in row] for row in df.itertuples(index=False, name=None)]
+    return header, rows
+
+def _keys(rows, k):
+    # 같은 URL 이 여러 번 나오면 (URL, 등장 순번) 으로 구분
+    seen, keys = {}, []
+    for row in rows:
+        url = row[k] if k < len(row) else ""
+        seen[url] = seen.get(url, 0) + 1
+        keys.append((url, seen[url]))
+    return keys
+
+def _normalized(row):
+    return [normalize_cell(v) for v in row]
+
+def plan_sync(existing, header, rows, key=SHEET_SYNC_KEY):
+    """
+    기존 값(헤더 행 포함, 표시 형식)과 목표 행을 URL 기준으로 비교해 행 단위 변경 계획 반환. 헤더가 다르면 None (전체 재작성).
+    값은 normalize_cell 로 맞춰 비교하고, writes 에는 목표 행 원래 값을 담음.
+    {"deletes": [기존 데이터 행 위치], "inserts": [목표 데이터 행 위치], "writes": [(목표 데이터 행 위치, 행)]}
+    없어진 행은 삭제, 새 행은 목표 위치에 빈 행 삽입 후, 위치별로 내용이 다른 행(새 행/수정/순서 변경)만 기록
+    """
+    if not existing or key not in header: return None
+    width = len(header)
+    current_header = list(existing[0][:width]) + [""] * (width - len(existing[0]))
+    if _normalized(current_header) != _normalized(header) or any(existing[0][width:]): return None
+
+    current = [_normalized(list(r[:width]) + [""] * (width - len(r))) for r in existing[1:]]
+    while current and not any(current[-1]): current.pop()
+    target = [_normalized(row) for row in rows]
+    k = header.index(key)
+    current_keys, target_keys = _keys(current, k), _keys(target, k)
+    wanted = set(target_keys)
+    deletes = [i for i, key_ in enumerate(current_keys) if not key_[0] or key_ not in wanted]
+    deleted = set(deletes)
+    kept = [i for i in range(len(current)) if i not in deleted]
+    kept_keys = {current_keys[i] for i in kept}
+    inserts = [j for j, key_ in enumerate(target_keys) if not key_[0] or key_ not in kept_keys]
+
+    # 삭제/삽입 후 배치: 삽입 위치는 빈 행, 나머지 자리는 남은 행이 기존 순서대로
+    inserted, survivors = set(inserts), iter(kept)
+    layout = [None if j in inserted else current[next(survivors)] for j in range(len(rows))]
+    writes = [(j, rows[j]) for j, (row, now) in enumerate(zip(target, layout)) if row != now]
+    return {"deletes": deletes, "inserts": inserts, "writes": writes, "updated": len(writes) - len(inserts)}
+
+def _runs(positions):
+    # 정렬된 위치 목록 → 연속 구간 [(시작, 끝+1)]
+    runs = []
+    for p in positions:
+        if runs and runs[-1][1] == p: runs[-1][1] = p + 1
+        else: runs.append([p, p + 1])
+    return runs
+
+def _dimension_requests(sheet_id, first_row, deletes, inserts):
+    """행 삭제(아래부터) → 빈 행 삽입(위부터) spreadsheets.batchUpdate 요청 목록. first_row: 데이터 첫 행(1-base)"""
+    def dimension(start, end):
+        return {"sheetId": sheet_id, "dimension": "ROWS", "startIndex": first_row - 1 + start, "endIndex": first_row - 1 + end}
+    requests_ = [{"deleteDimension": {"range": dimension(s, e)}} for s, e in reversed(_runs(deletes))]
+    requests_ += [{"insertDimension": {"range": dimension(s, e), "inheritFromBefore": True}} for s, e in _runs(inserts)]
+    return requests_
+
+def _write_chunks(writes, first_row, width, chunk_bytes=SHEET_CHUNK_BYTES):
+    """연속된 행은 하나의 범위로 묶고, 전송량이 chunk_bytes 를 넘지 않게 batch_update 요청 단위로 분할"""
+    chunks, chunk, size, prev = [], [], 0, None
+    for i, row in writes:
+        row_size = len(json.dumps(row, ensure_ascii=False).encode("utf-8"))
+        if chunk and size + row_size > chunk_bytes:
+            chunks.append(chunk)
+            chunk, size = [], 0
+        if chunk and prev == i - 1:
+            chunk[-1][1].append(row)
+        else:
+            chunk.append((first_row + i, [row]))
+        size += row_size
+        prev = i
+    if chunk: chunks.append(chunk)
+    return [
+        [{"range": f"{rowcol_to_a1(start, 1)}:{rowcol_to_a1(start + len(values) - 1, width)}", "values": values}
+         for start, values in chunk]
+        for chunk in chunks
+    ]
+
+def _apply(worksheet, writes, first_row, width, row_count=None):
+    """
+    행 쓰기 (분할 batch_update, 격자가 모자라면 행 수 확장). (요청 수, 전송 바이트) 반환.
+    row_count: 현재 격자 행 수. worksheet.row_count 는 읽어 온 시점의 캐시 값이라
+    spreadsheet.batch_update 로 행을 삭제/삽입한 뒤에는 호출 측이 계산해 넘긴다
+    """
+    requests_sent, sent_bytes = 0, 0
+    row_count = worksheet.row_count if row_count is None else row_count
+    last_row = first_row + max((i for i, _ in writes), default=-1)
+    if last_row > row_count:
+        # add_rows 도 캐시 값 기준으로 크기를 정하므로 필요한 전체 행 수로 직접 지정
+        call_with_backoff(worksheet.resize, rows=last_row)
+        requests_sent += 1
+    writes = [(i, [_entered(v) for v in row]) for i, row in writes]
+    for chunk in _write_chunks(writes, first_row, width):
+        call_with_backoff(worksheet.batch_update, chunk, value_input_option="USER_ENTERED")
+        requests_sent += 1
+        sent_bytes += len(json.dumps(chunk, ensure_ascii=False).encode("utf-8"))
+    return requests_sent, sent_bytes
+
+def rewrite_worksheet(worksheet, df, header_row=3):
+    """헤더 행부터 전부 지우고 다시 기록 (차등 동기화가 불가능할 때)"""
+    header, rows = frame_to_rows(df)
+    call_with_backoff(worksheet.batch_clear, [f"A{header_row}:Z"])
+    requests_sent, sent_bytes = _apply(worksheet, list(enumerate([header] + rows)), header_row, len(header))
+    return {"mode": "rewrite", "rows": len(rows), "requests": requests_sent + 1, "bytes": sent_bytes}
+
+def sync_worksheet(worksheet, df, header_row=3, key=SHEET_SYNC_KEY):
+    """
+    시트의 기존 행(헤더 행부터)을 1회 읽어 df 와 URL 기준으로 비교, 바뀐 행만 반영 (최종 내용/순서는 전체 재작성과 동일).
+    요청 수/전송량은 시트 크기가 아니라 변경량에 비례. 결과 통계 dict 반환
+    """
+    header, rows = frame_to_rows(df)
+    existing = call_with_backoff(worksheet.get_values, f"A{header_row}:Z", value_render_option="FORMATTED_VALUE")
+    plan = plan_sync(existing, header, rows, key)
+    if plan is None:
+        log_info("📄 시트 헤더가 달라 전체 재작성")
+        stats = rewrite_worksheet(worksheet, df, header_row)
+        stats["requests"] += 1
+        return stats
+    requests_sent, sent_bytes = 1, 0
+    dimension_requests = _dimension_requests(worksheet.id, header_row + 1, plan["deletes"], plan["inserts"])
+    if dimension_requests:
+        call_with_backoff(worksheet.spreadsheet.batch_update, {"requests": dimension_requests})
+        requests_sent += 1
+    row_count = worksheet.row_count - len(plan["deletes"]) + len(plan["inserts"])
+    sent, sent_bytes = _apply(worksheet, plan["writes"], header_row + 1, len(header), row_count)
+    return {
+        "mode": "diff", "rows": len(rows), "requests": requests_sent + sent, "bytes": sent_bytes,
+        "inserted": len(plan["inserts"]), "updated": plan["updated"], "deleted": len(plan["deletes"]),
+    }
@@ -0,0 +1,122 @@
+# src/utils/stage_runner.py - 파이프라인 단계 실행기 (입력 파일 + 설정의 내용 해시로 결과가 유효한 단계는 건너뛰고 첫 무효 단계부터 재개)
+
+import os
+import json
+import hashlib
+from datetime import datetime, timedelta
+from utils.logger import log_info, log_error
+
+STATE_FILE = "pipeline_state.json"   # 날짜 폴더별 단계 실행 기록
+TIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+def file_digest(path):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+def config_digest(config):
+    return hashlib.sha256(json.dumps(config, ensure_ascii=False, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+class Stage:
+    """
+    run: 인자 없는 실행 함수 (False 를 반환하면 미완료로 보고 기록하지 않음), config: 캐시 키에 넣을 설정 dict 를 만드는 함수.
+    inputs/outputs: 파일 경로 또는 경로를 반환하는 함수 (실행 시점에 실제 파일 형식에 맞춰 결정되는 경우).
+    max_age: 입력이 없는 수집 단계처럼 시간이 지나면 결과가 낡는 단계의 유효 시간 (초, None 이면 제한 없음)
+    """
+
+    def __init__(self, name, run, inputs=(), outputs=(), config=None, max_age=None):
+        self.name = name
+        self.run = run
+        self.inputs = list(inputs)
+        self.outputs = list(outputs)
+        self.config = config
+        self.max_age = max_age
+
+class StageRunner:
+    """{단계: {"key": 입력·설정 해시, "outputs": {파일: 해시}, "finished"}} 를 날짜 폴더의 pipeline_state.json 에 기록"""
+
+    def __init__(self, stages, folder):
+        self.stages = stages
+        self.names = [s.name for s in stages]
+        self.path = os.path.join(folder, STATE_FILE)
+        self.state = {}
+        if os.path.exists(self.path):
+            try:
+                with open(self.path, encoding="utf-8") as f:
+                    self.state = json.load(f)
+            except ValueError:
+                self.state = {}
+
+    def stage(self, name):
+        return self.stages[self.names.index(name)]
+
+    @staticmethod
+    def _paths(paths):
+        return [p() if callable(p) else p for p in paths]
+
+    def key(self, stage):
+        """입력 파일 내용 + 설정 해시 (입력 파일이 없으면 None)"""
+        inputs = {}
+        for path in self._paths(stage.inputs):
+            if not os.path.exists(path): return None
+            inputs[os.path.basename(path)] = file_digest(path)
+        return config_digest({"config": stage.config() if stage.config else {}, "inputs": inputs})
+
+    def is_valid(self, stage):
+        """마지막 실행 이후 입력/설정이 같고 출력 파일도 그대로인지 (max_age 가 있으면 그 시간 안에 실행된 경우만)"""
+        entry = self.state.get(stage.name)
+        if not entry or entry["key"] != self.key(stage): return False
+        if stage.max_age is not None:
+            finished = datetime.strptime(entry["finished"], TIME_FORMAT)
+            if datetime.now() - finished >= timedelta(seconds=stage.max_age): return False
+        return all(os.path.exists(p) and file_digest(p) == entry["outputs"].get(os.path.basename(p)) for p in self._paths(stage.outputs))
+
+    def needs_run(self, name, start=None, only=None):
+        """--from 이후 단계 / --only 단계는 강제 실행, 그 외는 결과가 무효일 때만"""
+        if only is not None: return name == only
+        if start is not None and self.names.index(name) >= self.names.index(start): return True
+        return not self.is_valid(self.stage(name))
+
+    def _save(self):
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.state, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self.path)
+
+    def invalidate(self, name):
+        if self.state.pop(name, None) is not None: self._save()
+
+    def record(self, name):
+        """단계 완료 기록 (실행 후의 입력/설정/출력 해시)"""
+        stage = self.stage(name)
+        self.state[name] = {
+            "key": self.key(stage),
+            "outputs": {os.path.basename(p): file_digest(p) if os.path.exists(p) else None for p in self._paths(stage.outputs)},
+            "finished": datetime.now().strftime(TIME_FORMAT),
+        }
+        self._save()
+
+    def run_stage(self, name):
+        """단계 1개 실행 후 기록. 미완료(False)면 False 반환"""
+        log_info(f"▶️ [{name}] 실행")
+        self.invalidate(name)
+        if self.stage(name).run() is False:
+            log_error(f"❌ [{name}] 미완료 - 다음 실행 때 이 단계부터 다시 실행")
+            return False
+        self.record(name)
+        return True
+
+    def run(self, start=None, only=None):
+        """순서대로 실행. 유효 여부는 앞 단계 실행 후에 판단 (앞 단계 출력이 같으면 뒤 단계는 계속 유효)"""
+        for name in self.names:
+            if not self.needs_run(name, start, only):
+                if only is None: log_info(f"⏭️ [{name}] 입력/설정 변경 없음 - 건너뜀")
+                continue
+            if not self.run_stage(name): return False
+        return True
+
+    def status(self):
+        return [(name, self.is_valid(self.stage(name)), self.state.get(name, {}).get("finished")) for name in self.names]
@@ -0,0 +1,104 @@
+# src/utils/story_index.py - 일자 간 처리 완료 기사 인덱스 (SQLite)
+
+import os
+import re
+import json
+import sqlite3
+import hashlib
+from datetime import datetime, timedelta
+import pandas as pd
+from utils.local_dedup import normalize_headline
+
+STORY_INDEX_FILE = os.path.join("data", "state", "story_index.sqlite")
+STORY_RETENTION_DAYS = int(os.getenv("STORY_RETENTION_DAYS", "7"))
+STORY_MAX_ROWS = int(os.getenv("STORY_MAX_ROWS", "200000"))
+
+# 상태: classified(분석 완료, 라벨 재사용) / duplicate(중복으로 제외된 기사)
+CLASSIFIED, DUPLICATE = "classified", "duplicate"
+
+_NAVER_ARTICLE = re.compile(r"n\.news\.naver\.com/(?:mnews/)?article/(\d+)/(\d+)")
+
+def canonical_url(url):
+    """네이버 기사 URL 은 언론사/기사 ID 로 정규화 (쿼리스트링, mnews 유무 무시)"""
+    url = str(url or "")
+    m = _NAVER_ARTICLE.search(url)
+    if m: return f"naver:{m.group(1)}/{m.group(2)}"
+    return url.split("?", 1)[0].split("#", 1)[0].rstrip("/")
+
+def headline_signatures(headlines: pd.Series) -> pd.Series:
+    """정규화 헤드라인 해시 (빈 헤드라인은 None → 서명 매칭 제외)"""
+    return normalize_headline(headlines).map(
+        lambda h: hashlib.blake2b(h.encode("utf-8"), digest_size=8).hexdigest() if h else None
+    )
+
+class StoryIndex:
+    def __init__(self, path=STORY_INDEX_FILE):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.conn = sqlite3.connect(path)
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS stories ("
+            " url TEXT PRIMARY KEY, signature TEXT, status TEXT, labels TEXT, score INTEGER,"
+            " first_seen TEXT, last_seen TEXT)"
+        )
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_signature ON stories(signature)")
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_last_seen ON stories(last_seen)")
+
+    def close(self):
+        self.conn.commit()
+        self.conn.close()
+
+    def evict(self, retention_days=STORY_RETENTION_DAYS, max_rows=STORY_MAX_ROWS):
+        """보존 기간이 지난 기사 삭제 후, 그래도 많으면 오래된 순으로 max_rows 까지 삭제"""
+        cutoff = (datetime.now() - timedelta(days=retention_days)).strftime("%Y-%m-%d")
+        removed = self.conn.execute("DELETE FROM stories WHERE last_seen < ?", (cutoff,)).rowcount
+        removed += self.conn.execute(
+            "DELETE FROM stories WHERE url IN (SELECT url FROM stories ORDER BY last_seen DESC LIMIT -1 OFFSET ?)",
+            (max_rows,),
+        ).rowcount
+        self.conn.commit()
+        return removed
+
+    def lookup(self, df: pd.DataFrame) -> pd.DataFrame:
+        """df 와 같은 인덱스의 (status, labels, score) 프레임. URL 우선, 없으면 헤드라인 서명으로 조회"""
+        urls = df["URL"].map(canonical_url)
+        sigs = headline_signatures(df["헤드라인"])
+        by_url, by_sig = {}, {}
+        for chunk in range(0, len(df), 500):
+            u = list(dict.fromkeys(urls.iloc[chunk:chunk + 500]))
+            s = list(dict.fromkeys(sigs.iloc[chunk:chunk + 500]))
+            for url, sig, status, labels, score in self.conn.execute(
+                f"SELECT url, signature, status, labels, score FROM stories WHERE url IN ({','.join('?' * len(u))})", u
+            ):
+                by_url[url] = (status, labels, score)
+            # 같은 서명이 여러 건이면 분석 완료 기사를 우선
+            for url, sig, status, labels, score in self.conn.execute(
+                f"SELECT url, signature, status, labels, score FROM stories WHERE signature IN ({','.join('?' * len(s))})"
+                " ORDER BY status = 'classified'", s
+            ):
+                by_sig[sig] = (status, labels, score)
+        hits = [by_url.get(u) or by_sig.get(s) for u, s in zip(urls, sigs)]
+        out = pd.DataFrame(
+            [h if h else (None, None, None) for h in hits], columns=["status", "labels", "score"], index=df.index
+        )
+        out["labels"] = out["labels"].map(lambda x: json.loads(x) if isinstance(x, str) else None)
+        return out
+
+    def record(self, df: pd.DataFrame, status, label_columns=()):
+        """기사 기록 (이미 있으면 상태/라벨/last_seen 갱신, first_seen 유지)"""
+        if df.empty: return
+        today = datetime.now().strftime("%Y-%m-%d")
+        urls = df["URL"].map(canonical_url)
+        sigs = headline_signatures(df["헤드라인"])
+        rows = []
+        for i, idx in enumerate(df.index):
+            labels = {c: df.at[idx, c] for c in label_columns} if status == CLASSIFIED else {}
+            score = int(df.at[idx, "중요도"]) if status == CLASSIFIED and "중요도" in df.columns else None
+            rows.append((urls.iloc[i], sigs.iloc[i], status, json.dumps(labels, ensure_ascii=False), score, today, today))
+        self.conn.executemany(
+            "INSERT INTO stories (url, signature, status, labels, score, first_seen, last_seen) VALUES (?, ?, ?, ?, ?, ?, ?)"
+            " ON CONFLICT(url) DO UPDATE SET signature=excluded.signature, status=excluded.status,"
+            " labels=excluded.labels, score=excluded.score, last_seen=excluded.last_seen",
+            rows,
+        )
+        self.conn.commit()
+
@@ -0,0 +1,54 @@
+# src/utils/token_budget.py - 토큰 수 추정 및 토큰 예산 기반 배치 묶기
+
+import os
+import re
+import math
+from functools import lru_cache
+
+try:
+    import tiktoken  # requirements.txt 에 포함. 설치/인코딩 로드 실패 시에만 문자 수 기반 추정으로 대체
+except ImportError:
+    tiktoken = None
+
+TOKEN_ENCODING = os.getenv("GPT_TOKEN_ENCODING", "o200k_base")   # gpt-4o 계열 토크나이저
+
+_NON_ASCII = re.compile(r"[^\x00-\x7f]")
+
+@lru_cache(maxsize=1)
+def _encoder():
+    if tiktoken is None: return None
+    try:
+        return tiktoken.get_encoding(TOKEN_ENCODING)
+    except Exception:
+        # 인코딩 파일을 내려받을 수 없는 환경 등
+        return None
+
+def count_tokens(text) -> int:
+    """토큰 수. tiktoken 이 있으면 정확히, 없으면 (한글 1자 ≈ 1토큰, 영문/숫자 4자 ≈ 1토큰) 으로 추정"""
+    text = str(text or "")
+    enc = _encoder()
+    if enc is not None:
+        return len(enc.encode(text))
+    non_ascii = len(_NON_ASCII.findall(text))
+    return math.ceil(non_ascii + (len(text) - non_ascii) / 4)
+
+def pack_by_tokens(item_tokens, input_budget, output_budget=None, output_per_item=0, max_items=None, overhead=0):
+    """
+    항목별 입력 토큰 수 목록을 순서대로 묶어 [(시작, 끝), ...] 위치 구간 반환.
+    각 묶음은 overhead + 항목 합이 input_budget, 예상 출력(항목 수 × output_per_item)이 output_budget 을 넘지 않게 채운다.
+    예산보다 큰 항목 하나는 단독 묶음이 된다.
+    """
+    spans = []
+    start, used = 0, overhead
+    for i, tokens in enumerate(item_tokens):
+        count = i - start
+        over_input = used + tokens > input_budget
+        over_output = output_budget is not None and (count + 1) * output_per_item > output_budget
+        over_items = max_items is not None and count >= max_items
+        if count and (over_input or over_output or over_items):
+            spans.append((start, i))
+            start, used = i, overhead
+        used += tokens
+    if start < len(item_tokens):
+        spans.append((start, len(item_tokens)))
+    return spans
@@ -0,0 +1,53 @@
+# src/utils/watermark_store.py - 쿼리별 수집 워터마크 (가장 최근 pubDate/link) 저장소
+
+import os
+import json
+from datetime import datetime
+
+WATERMARK_FILE = os.path.join("data", "state", "naver_watermarks.json")
+TIME_FORMAT = "%Y-%m-%dT%H:%M:%S"
+
+def load_watermarks(path=WATERMARK_FILE):
+    """{query: {"pubDate": str, "links": [str]}} 로드 (없거나 손상 시 빈 dict)"""
+    if not os.path.exists(path): return {}
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def save_watermarks(watermarks, path=WATERMARK_FILE):
+    """임시 파일에 쓴 뒤 교체 (중간 실패 시 기존 파일 보존)"""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(watermarks, f, ensure_ascii=False, indent=1)
+    os.replace(tmp_path, path)
+
+def watermark_time(watermark):
+    if not watermark or not watermark.get("pubDate"): return None
+    return datetime.strptime(watermark["pubDate"], TIME_FORMAT)
+
+def is_seen(pub_date, link, watermark):
+    """워터마크 시점 이전(또는 같은 시각의 이미 본 링크)이면 True"""
+    wm_time = watermark_time(watermark)
+    if wm_time is None: return False
+    return pub_date < wm_time or (pub_date == wm_time and link in watermark.get("links", []))
+
+def advance(watermark, pub_date, link):
+    """더 최신 항목이면 워터마크 갱신 (in-place)"""
+    wm_time = watermark_time(watermark)
+    if wm_time is None or pub_date > wm_time:
+        watermark["pubDate"] = pub_date.strftime(TIME_FORMAT)
+        watermark["links"] = [link]
+    elif pub_date == wm_time and link not in watermark.setdefault("links", []):
+        watermark["links"].append(link)
+
+def merge(old, new):
+    """이전 워터마크와 이번 실행의 최신 항목 병합"""
+    merged = {"pubDate": (old or {}).get("pubDate"), "links": list((old or {}).get("links", []))}
+    if new and new.get("pubDate"):
+        new_time = watermark_time(new)
+        for link in new.get("links", []):
+            advance(merged, new_time, link)
+    return merged if merged["pubDate"] else {}
@@ -0,0 +1,8 @@
+# tests/conftest.py - src/ 와 tools/ 를 import 경로에 추가 (tools 의 대역: fake_gspread, mock_openai_server)
+
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "src"))
+sys.path.insert(0, os.path.join(ROOT, "tools"))
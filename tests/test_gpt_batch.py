@@ -0,0 +1,106 @@
+# tests/test_gpt_batch.py - gpt_batch.run_chat_batch (mock_openai_server 의 Files/Batch API 대상)
+
+import os
+import pytest
+from openai import OpenAI
+from mock_openai_server import start_server, chat_reply
+from utils import gpt_batch
+
+MODEL, VERSION = "mock-model", "v1"
+
+@pytest.fixture(autouse=True)
+def batch_dir(tmp_path, monkeypatch):
+    # 상태/결과 파일은 data/state/gpt_batch (상대 경로) 에 기록
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(gpt_batch, "GPT_BATCH_POLL_SECONDS", 0)
+    yield
+    gpt_batch._consumed.clear()
+
+def serve(**options):
+    server, base_url = start_server(**options)
+    return server, OpenAI(base_url=base_url, api_key="x", max_retries=0)
+
+@pytest.fixture
+def mock():
+    servers = []
+    def make(**options):
+        server, client = serve(**options)
+        servers.append(server)
+        return server, client
+    yield make
+    for server in servers:
+        server.shutdown()
+
+def bodies(n):
+    return [{"model": MODEL, "messages": [{"role": "system", "content": "기사 분석"},
+                                          {"role": "user", "content": f"1. 기사 {i} 헤드라인\n2. 기사 {i} 후속"}]}
+            for i in range(n)]
+
+def test_submit_poll_and_map_by_custom_id(mock):
+    server, client = mock(polls_before_done=2, seed=3)
+    requests_ = bodies(12)
+    results = gpt_batch.run_chat_batch(client, requests_, "analysis", MODEL, VERSION)
+    # 출력 파일 순서는 섞여 있으므로 custom_id 로 입력 위치에 매핑돼야 함
+    assert results == [chat_reply(body) for body in requests_]
+    assert len(server.state.batches) == 1
+    assert server.state.stats["batch_requests"] == 12
+    # 결과 파일만 보관 (상태 파일은 삭제)
+    assert os.listdir(gpt_batch.GPT_BATCH_DIR) and all(name.endswith(".output.jsonl") for name in os.listdir(gpt_batch.GPT_BATCH_DIR))
+
+def test_completed_output_is_reused_without_resubmitting(mock):
+    server, client = mock()
+    requests_ = bodies(3)
+    first = gpt_batch.run_chat_batch(client, requests_, "analysis", MODEL, VERSION)
+    assert gpt_batch.run_chat_batch(client, requests_, "analysis", MODEL, VERSION) == first
+    assert len(server.state.batches) == 1
+    # 프롬프트 버전이 바뀌면 새 배치
+    gpt_batch.run_chat_batch(client, requests_, "analysis", MODEL, "v2")
+    assert len(server.state.batches) == 2
+
+def test_partial_failures_are_none(mock):
+    server, client = mock(batch_error_rate=0.4, seed=1)
+    requests_ = bodies(20)
+    results = gpt_batch.run_chat_batch(client, requests_, "analysis", MODEL, VERSION)
+    failed = [i for i, r in enumerate(results) if r is None]
+    assert 0 < len(failed) < len(requests_)
+    batch = next(iter(server.state.batches.values()))
+    assert batch["request_counts"]["failed"] == len(failed)
+    assert all(results[i] == chat_reply(requests_[i]) for i in range(len(requests_)) if i not in failed)
+
+def test_expired_batch_keeps_finished_results(mock):
+    _, client = mock(batch_outcome="expired")
+    requests_ = bodies(6)
+    results = gpt_batch.run_chat_batch(client, requests_, "analysis", MODEL, VERSION)
+    assert results[:3] == [chat_reply(body) for body in requests_[:3]]
+    assert results[3:] == [None] * 3
+
+def test_failed_batch_returns_none_and_clears_state(mock):
+    server, client = mock(batch_outcome="failed")
+    requests_ = bodies(4)
+    assert gpt_batch.run_chat_batch(client, requests_, "analysis", MODEL, VERSION) == [None] * 4
+    assert os.listdir(gpt_batch.GPT_BATCH_DIR) == []
+    # 상태가 지워졌으므로 다음 실행은 새로 제출
+    server.state.batch_outcome = "completed"
+    assert gpt_batch.run_chat_batch(client, requests_, "analysis", MODEL, VERSION) == [chat_reply(b) for b in requests_]
+    assert len(server.state.batches) == 2
+
+def test_resume_in_flight_batch_after_restart(mock, monkeypatch):
+    server, client = mock(polls_before_done=3)
+    requests_ = bodies(5)
+
+    def killed(seconds):
+        raise KeyboardInterrupt   # 폴링 대기 중 프로세스 중단
+    monkeypatch.setattr(gpt_batch.time, "sleep", killed)
+    with pytest.raises(KeyboardInterrupt):
+        gpt_batch.run_chat_batch(client, requests_, "analysis", MODEL, VERSION)
+    states = [name for name in os.listdir(gpt_batch.GPT_BATCH_DIR) if name.endswith(".json")]
+    assert len(states) == 1
+    monkeypatch.setattr(gpt_batch.time, "sleep", lambda seconds: None)
+
+    # 재시작: 저장된 batch_id 를 이어서 폴링 (새 파일 업로드/배치 제출 없음)
+    files_before = len(server.state.files)
+    results = gpt_batch.run_chat_batch(client, requests_, "analysis", MODEL, VERSION)
+    assert results == [chat_reply(body) for body in requests_]
+    assert len(server.state.batches) == 1
+    assert len(server.state.files) == files_before + 1   # 출력 파일만 추가
+    assert not os.path.exists(os.path.join(gpt_batch.GPT_BATCH_DIR, states[0]))
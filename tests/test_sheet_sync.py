@@ -0,0 +1,107 @@
+# tests/test_sheet_sync.py - plan_sync / sync_worksheet (fake_gspread 대상)
+
+import pandas as pd
+import pytest
+from fake_gspread import FakeWorksheet
+from utils.sheet_sync import plan_sync, sync_worksheet, rewrite_worksheet, frame_to_rows, normalize_cell
+
+HEADER_ROW = 3
+HEADER = ["일자", "헤드라인", "URL", "중요도"]
+
+def url(i):
+    return f"https://n.news.naver.com/mnews/article/001/{i:010d}"
+
+def frame(ids, title="기사", score=4):
+    return pd.DataFrame([{"일자": "2026-10-01", "헤드라인": f"{title} {i}", "URL": url(i), "중요도": score} for i in ids])
+
+def sheet_of(df, rows=None):
+    ws = FakeWorksheet(rows=rows or HEADER_ROW + len(df))
+    rewrite_worksheet(ws, df, HEADER_ROW)
+    return ws
+
+def assert_matches(ws, df):
+    header, rows = frame_to_rows(df)
+    width = len(header)
+    actual = [[normalize_cell(v) for v in r + [""] * (width - len(r))] for r in ws.grid(HEADER_ROW)]
+    assert actual == [[normalize_cell(v) for v in row] for row in [header] + rows]
+
+def test_plan_sync_unchanged_rows_need_no_writes():
+    header, rows = frame_to_rows(frame(range(3)))
+    plan = plan_sync([header] + rows, header, rows)
+    assert plan == {"deletes": [], "inserts": [], "writes": [], "updated": 0}
+
+def test_plan_sync_insert_update_delete():
+    header, current = frame_to_rows(frame([0, 1, 2, 3]))
+    target_df = frame([0, 2, 9, 3])
+    target_df.loc[3, "헤드라인"] = "수정된 제목"
+    _, target = frame_to_rows(target_df)
+    plan = plan_sync([header] + current, header, target)
+    assert plan["deletes"] == [1]
+    assert plan["inserts"] == [2]
+    assert plan["writes"] == [(2, target[2]), (3, target[3])]
+    assert plan["updated"] == 1
+
+def test_plan_sync_reorder_rewrites_moved_positions_only():
+    header, current = frame_to_rows(frame([0, 1, 2, 3]))
+    _, target = frame_to_rows(frame([0, 2, 1, 3]))
+    plan = plan_sync([header] + current, header, target)
+    assert plan["deletes"] == [] and plan["inserts"] == []
+    assert [i for i, _ in plan["writes"]] == [1, 2]
+
+def test_plan_sync_compares_user_entered_display_values():
+    # 시트는 USER_ENTERED 로 기록한 날짜/숫자를 표시 형식으로 돌려줌 → 바뀌지 않은 행으로 판단해야 함
+    header, rows = frame_to_rows(frame(range(2), score=4.0))
+    displayed = [header] + [["2026. 10. 1", r[1], r[2], "4"] for r in rows]
+    plan = plan_sync(displayed, header, rows)
+    assert plan["writes"] == []
+
+def test_plan_sync_header_change_returns_none():
+    header, rows = frame_to_rows(frame(range(2)))
+    assert plan_sync([["다른 헤더"] + header[1:]] + rows, header, rows) is None
+    assert plan_sync([], header, rows) is None
+
+@pytest.mark.parametrize("ids", [
+    [0, 1, 2, 3, 4, 10, 11],      # 뒤에 추가
+    [10, 0, 1, 2, 3, 4],          # 앞에 추가
+    [0, 2, 4],                    # 삭제
+    [4, 3, 2, 1, 0],              # 순서 변경
+    [5, 0, 6, 2, 7, 8, 9, 4],     # 추가/삭제/순서 변경 혼합
+])
+def test_sync_worksheet_matches_target(ids):
+    ws = sheet_of(frame(range(5)))
+    target = frame(ids)
+    stats = sync_worksheet(ws, target, HEADER_ROW)
+    assert stats["mode"] == "diff"
+    assert_matches(ws, target)
+
+def test_sync_worksheet_update_writes_only_changed_row():
+    ws = sheet_of(frame(range(5)))
+    target = frame(range(5))
+    target.loc[2, "헤드라인"] = "수정된 제목"
+    before = dict(ws.stats)
+    stats = sync_worksheet(ws, target, HEADER_ROW)
+    assert (stats["inserted"], stats["updated"], stats["deleted"]) == (0, 1, 0)
+    assert ws.stats["cells_written"] - before["cells_written"] == len(HEADER)
+    assert_matches(ws, target)
+
+def test_sync_worksheet_second_run_is_read_only():
+    # USER_ENTERED 로 기록된 날짜/숫자/작은따옴표 값을 다시 읽어 비교해도 변경 없음
+    df = frame(range(3), score=3.0)
+    df.loc[1, "헤드라인"] = "'인용 제목"
+    ws = FakeWorksheet(rows=50)
+    sync_worksheet(ws, df, HEADER_ROW)
+    before = dict(ws.stats)
+    stats = sync_worksheet(ws, df, HEADER_ROW)
+    assert stats["requests"] == 1
+    assert ws.stats["writes"] == before["writes"]
+    assert ws.grid(HEADER_ROW)[2][1] == "'인용 제목"
+
+def test_sync_worksheet_uses_row_count_after_dimension_updates():
+    # 격자가 꽉 찬 시트에서 행이 늘어도 삽입으로 격자가 이미 커졌으므로 크기 조정 요청이 없어야 함 (캐시된 row_count 는 낡은 값)
+    ws = sheet_of(frame(range(5)))
+    grid_rows = ws.grid_rows
+    target = frame([0, 1, 2, 3, 4, 5, 6, 7])
+    stats = sync_worksheet(ws, target, HEADER_ROW)
+    assert stats["requests"] == 3   # 읽기 + 행 삽입 + 값 쓰기
+    assert ws.grid_rows == grid_rows + 3
+    assert_matches(ws, target)
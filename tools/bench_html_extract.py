@@ -0,0 +1,78 @@
+# tools/bench_html_extract.py - 기사 본문 추출 엔진 처리량 / 결과 동일성 비교
+#
+# 사용 예:
+#   python tools/bench_html_extract.py                                  # tools/fixtures/naver_html 의 저장 페이지
+#   python tools/bench_html_extract.py --fixtures my_pages --repeat 20
+#   python tools/bench_html_extract.py --record data/2026-10-01/step1_filtered.parquet --limit 50   # 실제 기사 페이지 저장
+# 기준은 BeautifulSoup html.parser 전체 파싱(soup)이며, 다른 엔진의 결과가 한 글자라도 다르면 불일치로 보고한다.
+
+import os
+import sys
+import glob
+import time
+import hashlib
+import argparse
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "src"))
+from utils.html_extract import ENGINES, decode_html
+from utils.frame_store import read_frame_file
+
+DEFAULT_FIXTURES = os.path.join(ROOT, "tools", "fixtures", "naver_html")
+
+def record_fixtures(frame_path, out_dir, limit):
+    """step1/step2 결과 파일(parquet/feather/csv)의 URL 페이지를 원본 바이트 그대로 저장"""
+    from utils.http_client import get_http_client
+    os.makedirs(out_dir, exist_ok=True)
+    urls = read_frame_file(frame_path, columns=["URL"])["URL"].dropna().head(limit)
+    for url in urls:
+        res = get_http_client().get(url, headers={"User-Agent": "Mozilla/5.0"})
+        name = hashlib.blake2b(url.encode("utf-8"), digest_size=8).hexdigest() + ".html"
+        with open(os.path.join(out_dir, name), "wb") as f:
+            f.write(res.content)
+        print(f"💾 {res.status_code} {len(res.content)}B {url} → {name}")
+
+def main():
+    parser = argparse.ArgumentParser(description="본문 추출 엔진 벤치마크")
+    parser.add_argument("--fixtures", default=DEFAULT_FIXTURES, help="저장된 기사 HTML 폴더")
+    parser.add_argument("--repeat", type=int, default=10, help="페이지당 반복 횟수")
+    parser.add_argument("--engines", nargs="+", default=list(ENGINES), help="비교할 엔진 (설치된 것만)")
+    parser.add_argument("--record", help="이 step1/step2 결과 파일의 URL 페이지를 --fixtures 폴더에 저장하고 종료")
+    parser.add_argument("--limit", type=int, default=30, help="--record 시 저장할 최대 페이지 수")
+    args = parser.parse_args()
+
+    if args.record:
+        record_fixtures(args.record, args.fixtures, args.limit)
+        return
+
+    paths = sorted(glob.glob(os.path.join(args.fixtures, "*.html")))
+    if not paths:
+        print(f"❌ HTML 픽스처 없음: {args.fixtures}")
+        return
+    pages = []
+    for path in paths:
+        with open(path, "rb") as f:
+            pages.append((os.path.basename(path), decode_html(f.read())))
+    total_bytes = sum(len(html.encode("utf-8")) for _, html in pages)
+    print(f"📄 페이지 {len(pages)}개 ({total_bytes/1024:.0f}KB), 반복 {args.repeat}회")
+
+    reference = {name: ENGINES["soup"](html) for name, html in pages}
+    base_time = None
+    print(f"{'엔진':<12} {'페이지/s':>9} {'MB/s':>7} {'배속':>6} {'불일치':>6}")
+    for engine in [e for e in args.engines if e in ENGINES]:
+        fn = ENGINES[engine]
+        started = time.perf_counter()
+        for _ in range(args.repeat):
+            for _, html in pages:
+                fn(html)
+        elapsed = time.perf_counter() - started
+        base_time = elapsed if engine == "soup" else base_time
+        mismatches = [name for name, html in pages if fn(html) != reference[name]]
+        runs = len(pages) * args.repeat
+        speedup = f"{base_time / elapsed:.1f}x" if base_time else "-"
+        print(f"{engine:<12} {runs / elapsed:>9.1f} {total_bytes * args.repeat / elapsed / 1e6:>7.2f} {speedup:>6} {len(mismatches):>6}")
+        for name in mismatches:
+            print(f"   ≠ {name}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+# tools/bench_import_time.py - 파이프라인 진입점 import 시간 프로파일 (python -X importtime)
+#
+# 사용 예:
+#   python tools/bench_import_time.py                                  # 진입점별 import 시간 + 무거운 패키지 로드 여부
+#   python tools/bench_import_time.py --modules hra_news_step1 --top 15 --repeat 5
+# 진입점마다 creds.json 이 없는 빈 임시 폴더에서 새 인터프리터로 import 만 수행한다 (단계 실행 없음).
+
+import os
+import re
+import sys
+import argparse
+import tempfile
+import subprocess
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ENTRY_POINTS = ["main_pipeline", "hra_news_step0", "hra_news_step1", "hra_news_step2"]
+HEAVY_PACKAGES = ["pandas", "openai", "sklearn", "gspread", "google.oauth2", "bs4", "tqdm"]
+
+_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+
+def profile(module, workdir):
+    """새 프로세스에서 import 1회. (성공 여부, [(self_us, cumulative_us, depth, 모듈명)], 오류 메시지)"""
+    env = {**os.environ, "PYTHONPATH": os.path.join(ROOT, "src"), "PYTHONIOENCODING": "utf-8"}
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"], cwd=workdir, env=env,
+                          capture_output=True, text=True, encoding="utf-8")
+    rows, errors = [], []
+    for line in proc.stderr.splitlines():
+        m = _LINE.match(line)
+        if m: rows.append((int(m.group(1)), int(m.group(2)), (len(m.group(3)) - 1) // 2, m.group(4)))
+        elif not line.startswith("import time:"): errors.append(line)
+    return proc.returncode == 0, rows, "\n".join(errors[-3:])
+
+def main():
+    parser = argparse.ArgumentParser(description="진입점 import 시간 프로파일")
+    parser.add_argument("--modules", nargs="+", default=ENTRY_POINTS, help="import 할 모듈 (src 기준)")
+    parser.add_argument("--repeat", type=int, default=3, help="모듈별 반복 횟수 (최솟값 보고)")
+    parser.add_argument("--top", type=int, default=8, help="누적 시간이 큰 직접 import 표시 개수")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="bench_import_")
+    print(f"{'모듈':<18} {'import(ms)':>10}  무거운 패키지")
+    details = {}
+    for module in args.modules:
+        runs = [profile(module, workdir) for _ in range(args.repeat)]
+        ok, rows, error = min(runs, key=lambda r: r[1][-1][1] if r[1] else float("inf"))
+        if not ok:
+            print(f"{module:<18} {'실패':>10}  {error}")
+            continue
+        total = next((cum for _, cum, depth, name in rows if depth == 0 and name == module), 0)
+        loaded = {name for *_, name in rows}
+        heavy = [p for p in HEAVY_PACKAGES if p in loaded]
+        print(f"{module:<18} {total / 1000:>10.0f}  {', '.join(heavy) or '-'}")
+        details[module] = rows
+
+    for module, rows in details.items():
+        print(f"\n📦 {module} - 누적 시간 상위 import")
+        top = sorted((r for r in rows if r[2] <= 1 and r[3] != module), key=lambda r: -r[1])[:args.top]
+        for self_us, cum, _, name in top:
+            print(f"   {cum / 1000:>8.1f}ms  {name}")
+
+if __name__ == "__main__":
+    main()
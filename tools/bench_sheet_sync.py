@@ -0,0 +1,82 @@
+# tools/bench_sheet_sync.py - 시트 차등 동기화 vs 전체 재작성 요청/전송량 비교 (fake gspread, 실제 시트 호출 없음)
+#
+# 사용 예:
+#   python tools/bench_sheet_sync.py                                   # 300행, 실행마다 5% 수정 / 5% 추가 / 5% 삭제
+#   python tools/bench_sheet_sync.py --rows 2000 --change 0.01 --runs 5
+#   python tools/bench_sheet_sync.py --quota-error-rate 0.2            # 429 백오프 확인 (대기 시간 포함)
+# 매 실행 후 시트 내용이 목표 DataFrame 과 정확히 같은지 검증한다.
+
+import os
+import sys
+import time
+import random
+import argparse
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "src"))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from fake_gspread import FakeWorksheet
+from utils.sheet_sync import sync_worksheet, rewrite_worksheet, frame_to_rows, normalize_cell
+
+HEADER_ROW = 3
+
+def make_row(rng, i, body_chars):
+    return {
+        "구분": "", "키워드": rng.choice(["임금", "채용", "노조", "인사"]), "일자": "2026-10-01",
+        "헤드라인": f"기사 {i} 헤드라인", "요약": f"요약 {i}", "매체명": "www.example.com",
+        "URL": f"https://n.news.naver.com/mnews/article/001/{i:010d}", "중요도": rng.randint(3, 5),
+        "본문": f"본문 {i} " + "가나다라마바사 " * (body_chars // 8),
+    }
+
+def mutate(df, rng, change, next_id, body_chars):
+    """change 비율만큼 본문 수정 / 신규 추가 / 삭제"""
+    n = max(1, int(len(df) * change))
+    df = df.copy()
+    for i in rng.sample(range(len(df)), n):
+        df.at[i, "본문"] = df.at[i, "본문"] + " (수정)"
+    df = df.drop(index=rng.sample(range(len(df)), n)).reset_index(drop=True)
+    added = pd.DataFrame([make_row(rng, next_id + j, body_chars) for j in range(n)])
+    return pd.concat([df, added], ignore_index=True), next_id + n
+
+def check(worksheet, df):
+    header, rows = frame_to_rows(df)
+    expected = [[normalize_cell(v) for v in row] for row in [header] + rows]
+    width = len(header)
+    actual = [[normalize_cell(v) for v in r + [""] * (width - len(r))] for r in worksheet.grid(HEADER_ROW)]
+    return actual == expected
+
+def main():
+    parser = argparse.ArgumentParser(description="시트 차등 동기화 벤치마크 (fake gspread)")
+    parser.add_argument("--rows", type=int, default=300)
+    parser.add_argument("--body-chars", type=int, default=3000, help="행당 본문 길이")
+    parser.add_argument("--change", type=float, default=0.05, help="실행마다 수정/추가/삭제할 행 비율 (각각)")
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--quota-error-rate", type=float, default=0.0, help="요청별 429 주입 확률")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    df = pd.DataFrame([make_row(rng, i, args.body_chars) for i in range(args.rows)])
+    next_id = args.rows
+    sheets = {
+        "diff": FakeWorksheet(rows=100, quota_error_rate=args.quota_error_rate, seed=args.seed),
+        "full": FakeWorksheet(rows=100, quota_error_rate=args.quota_error_rate, seed=args.seed),
+    }
+    print(f"{'실행':>4} {'방식':<5} {'요청':>5} {'전송KB':>8} {'셀':>7} {'429':>4} {'시간(s)':>7} {'추가/수정/삭제':>14} {'일치':>4}")
+    for run in range(args.runs + 1):
+        if run:
+            df, next_id = mutate(df, rng, args.change, next_id, args.body_chars)
+        for mode, worksheet in sheets.items():
+            before = dict(worksheet.stats)
+            started = time.perf_counter()
+            stats = sync_worksheet(worksheet, df, HEADER_ROW) if mode == "diff" else rewrite_worksheet(worksheet, df, HEADER_ROW)
+            elapsed = time.perf_counter() - started
+            delta = {k: worksheet.stats[k] - before[k] for k in before}
+            changes = "/".join(str(stats.get(k, "-")) for k in ("inserted", "updated", "deleted"))
+            print(f"{run:>4} {mode:<5} {delta['reads'] + delta['writes']:>5} {delta['bytes_sent']/1024:>8.0f} "
+                  f"{delta['cells_written']:>7} {delta['quota_errors']:>4} {elapsed:>7.1f} {changes:>14} "
+                  f"{'✅' if check(worksheet, df) else '❌':>4}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+# tools/bench_step1.py - mock OpenAI 서버로 hra_news_step1.main 을 기사 규모별로 실행해 처리량 측정
+#
+# 사용 예:
+#   python tools/bench_step1.py --sizes 100 1000 10000 --latency 0.2 --jitter 0.2 --rate-limit-rate 0.02 --malformed-rate 0.01
+#   python tools/bench_step1.py --sizes 1000 --fixture data/2026-10-01/step0_raw.parquet --env GPT_MAX_WORKERS=8
+# 실제 API 를 호출하지 않으며, 규모별로 임시 작업 폴더에서 step1 을 별도 프로세스로 실행한다.
+
+import os
+import re
+import sys
+import time
+import random
+import shutil
+import argparse
+import tempfile
+import subprocess
+from datetime import datetime
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "src"))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from mock_openai_server import start_server, add_fault_arguments, fault_options
+from utils.frame_store import read_frame, read_frame_file, write_frame, STEP0_RAW, STEP1_FILTERED
+
+STEP1 = os.path.join(ROOT, "src", "hra_news_step1.py")
+
+TOPICS = ["임금 협상", "채용 확대", "노조 파업", "인사 발표", "근로시간 단축", "퇴직연금 개편", "반도체 투자", "보험료 인상",
+          "최저임금 결정", "중대재해법 판결", "주 4일제 도입", "성과급 논란", "희망퇴직 실시", "육아휴직 확대", "정년 연장 논의"]
+COMPANIES = ["삼성전자", "현대차", "SK하이닉스", "LG에너지솔루션", "포스코", "한화", "카카오", "네이버", "롯데", "KT"]
+PRESS = ["www.mk.co.kr", "www.hankyung.com", "www.chosun.com", "www.yna.co.kr", "www.edaily.co.kr", "news.example.com"]
+
+# 벤치마크 기본 환경: 실행 간 상태 재사용/사전 분류 없이 매번 같은 GPT 작업량을 측정
+BENCH_ENV = {
+    "OPENAI_API_KEY": "mock", "GPT_CACHE": "0", "STORY_INDEX": "0", "PRECLASSIFIER": "0",
+    "GPT_RPM": "100000", "GPT_TPM": "100000000", "GPT_BATCH_POLL_SECONDS": "0.2",
+}
+
+def synthetic_articles(n, dup_rate=0.2, seed=0):
+    """결정적 합성 step0_raw: dup_rate 비율은 앞선 기사의 말머리/매체만 바꾼 중복 기사"""
+    rng = random.Random(seed)
+    day = datetime.now().strftime("%Y-%m-%d")
+    rows = []
+    for i in range(n):
+        if rows and rng.random() < dup_rate:
+            src = rows[rng.randrange(len(rows))]
+            headline, summary = f"[{rng.choice(['속보', '단독', '종합'])}] {src['헤드라인']}", src["요약"]
+        else:
+            company, topic = rng.choice(COMPANIES), rng.choice(TOPICS)
+            headline = f"{company}, {topic} {rng.randint(1, 99)}번째 발표"
+            summary = f"{company}가 {topic}과 관련해 {rng.randint(1, 500)}억 원 규모의 계획을 밝혔다. " * rng.randint(1, 4)
+        rows.append({
+            "구분": "", "키워드": rng.choice(TOPICS), "일자": day, "헤드라인": headline, "요약": summary.strip(),
+            "매체명": rng.choice(PRESS), "URL": f"https://n.news.naver.com/mnews/article/{rng.randint(1, 99):03d}/{i:010d}",
+        })
+    return pd.DataFrame(rows).assign(row_id=range(n))
+
+def fixture_articles(path, n, seed=0):
+    """기록된 step0_raw (parquet/feather/csv) 를 n 건으로 맞춤 (부족하면 URL 을 바꿔 반복 표본)"""
+    base = read_frame_file(path)
+    df = base.sample(n=n, replace=len(base) < n, random_state=seed).reset_index(drop=True)
+    df["URL"] = df["URL"].astype(str) + "#bench" + df.index.astype(str)
+    return df.assign(row_id=range(n))
+
+def run_once(articles, base_url, server, extra_env, keep=False):
+    """임시 폴더에서 step1 1회 실행. (지표 dict, 작업 폴더) 반환"""
+    workdir = tempfile.mkdtemp(prefix="bench_step1_")
+    day_dir = os.path.join(workdir, "data", datetime.now().strftime("%Y-%m-%d"))
+    os.makedirs(day_dir)
+    write_frame(articles, day_dir, STEP0_RAW)
+
+    env = {**os.environ, **BENCH_ENV, **extra_env, "OPENAI_BASE_URL": base_url,
+           "PYTHONPATH": os.path.join(ROOT, "src"), "PYTHONIOENCODING": "utf-8"}
+    server.state.reset_stats()
+    started = time.perf_counter()
+    proc = subprocess.run([sys.executable, STEP1], cwd=workdir, env=env, capture_output=True, text=True, encoding="utf-8")
+    wall = time.perf_counter() - started
+
+    log = proc.stdout + proc.stderr
+    selected = read_frame(day_dir, STEP1_FILTERED, columns=["URL"])
+    stats = dict(server.state.stats)
+    metrics = {
+        "articles": len(articles), "wall": wall, "exit": proc.returncode,
+        "calls": stats["requests"] + stats["batch_requests"], **stats,
+        "backoffs": len(re.findall(r"⏳ GPT", log)),
+        "retry_rounds": len(re.findall(r"🔁 재시도", log)),
+        "fallbacks": len(re.findall(r"텍스트 형식으로 재요청", log)),
+        "selected": len(selected) if selected is not None else None,
+    }
+    if proc.returncode != 0:
+        print(log[-3000:])
+    if not keep:
+        shutil.rmtree(workdir, ignore_errors=True)
+    return metrics, workdir
+
+def print_report(results):
+    header = f"{'기사':>7} {'시간(s)':>8} {'기사/s':>8} {'호출':>6} {'429':>5} {'5xx':>5} {'깨짐':>5} {'백오프':>6} {'폴백':>5} {'재시도R':>7} {'입력토큰':>10} {'출력토큰':>9} {'선별':>6}"
+    print(header)
+    print("-" * len(header))
+    for m in results:
+        print(
+            f"{m['articles']:>7} {m['wall']:>8.1f} {m['articles'] / m['wall']:>8.1f} {m['calls']:>6} {m['rate_limited']:>5} "
+            f"{m['server_errors']:>5} {m['malformed']:>5} {m['backoffs']:>6} {m['fallbacks']:>5} {m['retry_rounds']:>7} "
+            f"{m['prompt_tokens']:>10} {m['completion_tokens']:>9} {m['selected'] if m['selected'] is not None else '-':>6}"
+        )
+
+def main():
+    parser = argparse.ArgumentParser(description="Step 1 처리량 벤치마크 (mock OpenAI 서버)")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 10000], help="기사 수 목록")
+    parser.add_argument("--fixture", help="기록된 step0_raw 파일 (없으면 합성 기사 생성)")
+    parser.add_argument("--dup-rate", type=float, default=0.2, help="합성 기사 중 중복 기사 비율")
+    parser.add_argument("--env", action="append", default=[], help="step1 에 넘길 환경변수 (KEY=VALUE, 반복 가능)")
+    parser.add_argument("--keep", action="store_true", help="실행별 임시 작업 폴더를 지우지 않음")
+    add_fault_arguments(parser)
+    args = parser.parse_args()
+
+    extra_env = dict(item.split("=", 1) for item in args.env)
+    server, base_url = start_server(**fault_options(args))
+    results = []
+    try:
+        for n in args.sizes:
+            articles = fixture_articles(args.fixture, n, args.seed) if args.fixture else synthetic_articles(n, args.dup_rate, args.seed)
+            metrics, workdir = run_once(articles, base_url, server, extra_env, keep=args.keep)
+            results.append(metrics)
+            print(f"✅ {n}건: {metrics['wall']:.1f}s, 호출 {metrics['calls']}회" + (f" (작업 폴더 {workdir})" if args.keep else ""))
+    finally:
+        server.shutdown()
+    print_report(results)
+
+if __name__ == "__main__":
+    main()
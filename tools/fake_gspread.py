@@ -0,0 +1,136 @@
+# tools/fake_gspread.py - gspread Worksheet 대역 (메모리 격자, 요청/전송량 집계, 429 할당량 오류 주입)
+#
+# utils.sheet_sync 가 쓰는 메서드만 구현: get_values / batch_update / batch_clear / update / add_rows / resize, row_count / col_count,
+# spreadsheet.batch_update 의 행 삭제/삽입(deleteDimension / insertDimension).
+# gspread 처럼 row_count 는 캐시 값: spreadsheet.batch_update 로 행을 삭제/삽입해도 바뀌지 않고 add_rows / resize 때만 갱신
+# (add_rows 는 gspread 와 같이 캐시 값 + rows 로 resize). 실제 격자 크기를 넘는 쓰기는 오류.
+# USER_ENTERED 쓰기는 시트처럼 해석해 표시 형식으로 저장 (날짜 → "2026. 10. 1"(ko 로캘), 숫자 → 일반 형식, 앞 작은따옴표 제거),
+# RAW 쓰기는 문자열 그대로 저장. 읽기는 실제 API 처럼 끝의 빈 셀/빈 행을 잘라서 돌려준다.
+
+import re
+import json
+import random
+import requests
+from gspread.exceptions import APIError
+from gspread.utils import a1_range_to_grid_range
+
+_DATE = re.compile(r"^(\d{4})-(\d{1,2})-(\d{1,2})$")
+_NUMBER = re.compile(r"^[+-]?\d+(\.\d+)?$")
+
+def _displayed(value):
+    """USER_ENTERED 값의 표시 형식 (FORMATTED_VALUE)"""
+    if value.startswith("'"): return value[1:]
+    m = _DATE.match(value)
+    if m: return f"{int(m.group(1))}. {int(m.group(2))}. {int(m.group(3))}"
+    if _NUMBER.match(value):
+        number = float(value)
+        return str(int(number)) if number.is_integer() else repr(number)
+    return value
+
+class FakeSpreadsheet:
+    def __init__(self, worksheet):
+        self.worksheet = worksheet
+
+    def batch_update(self, body):
+        ws = self.worksheet
+        ws._maybe_quota_error()
+        ws.stats["writes"] += 1
+        ws.stats["bytes_sent"] += len(json.dumps(body, ensure_ascii=False).encode("utf-8"))
+        for request in body["requests"]:
+            kind, spec = next(iter(request.items()))
+            start, end = spec["range"]["startIndex"] + 1, spec["range"]["endIndex"] + 1   # 1-base [start, end)
+            count = end - start
+            if kind == "deleteDimension":
+                ws.cells = {(r if r < start else r - count, c): v for (r, c), v in ws.cells.items() if not start <= r < end}
+                ws.grid_rows -= count
+            elif kind == "insertDimension":
+                ws.cells = {(r if r < start else r + count, c): v for (r, c), v in ws.cells.items()}
+                ws.grid_rows += count
+            else:
+                raise ValueError(f"지원하지 않는 요청: {kind}")
+        return {}
+
+class FakeWorksheet:
+    def __init__(self, rows=1000, cols=26, quota_error_rate=0.0, seed=0):
+        self.id = 0
+        self.spreadsheet = FakeSpreadsheet(self)
+        self.row_count = rows           # 캐시 값 (gspread Worksheet.row_count)
+        self.grid_rows = rows           # 실제 격자 행 수
+        self.col_count = cols
+        self.cells = {}                 # (row, col) 1-base -> 값
+        self.quota_error_rate = quota_error_rate
+        self._rng = random.Random(seed)
+        self.stats = {"reads": 0, "writes": 0, "quota_errors": 0, "cells_written": 0, "bytes_sent": 0}
+
+    def _maybe_quota_error(self):
+        if self._rng.random() < self.quota_error_rate:
+            self.stats["quota_errors"] += 1
+            response = requests.Response()
+            response.status_code = 429
+            response._content = json.dumps({"error": {"code": 429, "message": "Quota exceeded (fake)",
+                                                      "status": "RESOURCE_EXHAUSTED"}}).encode("utf-8")
+            raise APIError(response)
+
+    def _bounds(self, name):
+        g = a1_range_to_grid_range(name)
+        return (g.get("startRowIndex", 0) + 1, g.get("endRowIndex", self.grid_rows),
+                g.get("startColumnIndex", 0) + 1, g.get("endColumnIndex", self.col_count))
+
+    def _values(self, range_name):
+        r0, r1, c0, c1 = self._bounds(range_name)
+        rows = [[self.cells.get((r, c), "") for c in range(c0, c1 + 1)] for r in range(r0, r1 + 1)]
+        while rows and not any(rows[-1]): rows.pop()
+        width = max((max((i + 1 for i, v in enumerate(row) if v), default=0) for row in rows), default=0)
+        return [row[:width] for row in rows]   # gspread 기본(pad_values=True)처럼 같은 너비로 맞춤
+
+    def get_values(self, range_name="A1:Z", **kwargs):
+        self._maybe_quota_error()
+        self.stats["reads"] += 1
+        return self._values(range_name)
+
+    def _write(self, name, values, entered):
+        r0, _, c0, _ = self._bounds(name)
+        for i, row in enumerate(values):
+            if r0 + i > self.grid_rows: raise ValueError(f"격자 범위 초과: {name} (행 {self.grid_rows})")
+            for j, value in enumerate(row):
+                if value == "": self.cells.pop((r0 + i, c0 + j), None)
+                else: self.cells[(r0 + i, c0 + j)] = _displayed(str(value)) if entered else str(value)
+                self.stats["cells_written"] += 1
+
+    def batch_update(self, data, raw=True, value_input_option=None, **kwargs):
+        self._maybe_quota_error()
+        entered = value_input_option == "USER_ENTERED" if value_input_option else not raw
+        self.stats["writes"] += 1
+        data = list(data)
+        self.stats["bytes_sent"] += len(json.dumps(data, ensure_ascii=False).encode("utf-8"))
+        for item in data:
+            self._write(item["range"], item["values"], entered)
+        return {}
+
+    def update(self, values, range_name=None, **kwargs):
+        return self.batch_update([{"range": range_name or "A1", "values": values}], **kwargs)
+
+    def batch_clear(self, ranges):
+        self._maybe_quota_error()
+        self.stats["writes"] += 1
+        for name in ranges:
+            r0, r1, c0, c1 = self._bounds(name)
+            for key in [k for k in self.cells if r0 <= k[0] <= r1 and c0 <= k[1] <= c1]:
+                del self.cells[key]
+        return {}
+
+    def add_rows(self, rows):
+        self.resize(rows=self.row_count + rows)
+
+    def resize(self, rows=None, cols=None):
+        self._maybe_quota_error()
+        self.stats["writes"] += 1
+        if rows is not None:
+            self.cells = {(r, c): v for (r, c), v in self.cells.items() if r <= rows}
+            self.row_count = self.grid_rows = rows
+        if cols is not None:
+            self.col_count = cols
+
+    def grid(self, first_row=1):
+        """first_row 부터 값이 있는 마지막 행까지 (비교용, 요청으로 집계하지 않음)"""
+        return self._values(f"A{first_row}:Z")
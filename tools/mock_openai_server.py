@@ -0,0 +1,272 @@
+# tools/mock_openai_server.py - 로컬 OpenAI 대체 서버 (채팅 + Files + Batch API, 결정적 응답)
+#
+# 사용 예:
+#   python tools/mock_openai_server.py --port 8765 --latency 0.3 --rate-limit-rate 0.05 --malformed-rate 0.02
+#   OPENAI_BASE_URL=http://127.0.0.1:8765/v1 OPENAI_API_KEY=x GPT_EXECUTION_MODE=batch GPT_BATCH_POLL_SECONDS=0.2 python src/hra_news_step1.py
+# GET /stats 로 요청/오류/토큰 집계 조회, POST /stats/reset 으로 초기화
+# 배치 결과는 실제 API 처럼 입력 순서와 다르게 섞어서 기록. --batch-error-rate 로 요청별 실패(에러 파일),
+# --batch-outcome 으로 배치 전체 실패(failed) / 기한 만료(expired: 앞 절반만 처리) 재현
+
+import re
+import json
+import math
+import time
+import uuid
+import random
+import hashlib
+import argparse
+import threading
+from email.parser import BytesParser
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+FIELDS = ["large_corp", "hr", "policy", "economy", "insurance"]
+TEXT_LABELS = ["대기업 관련", "HR 관심", "정책/법안/판례 관련", "경제/산업 관련", "보험/금융 관련"]
+
+def _labels(line):
+    """기사 줄 내용 해시로 정해지는 5개 O/X (같은 입력 → 같은 라벨)"""
+    digest = hashlib.sha256(line.encode("utf-8")).digest()
+    return ["O" if b % 2 else "X" for b in digest[:5]]
+
+def chat_reply(body):
+    """요청 본문 → 응답 content (중복 판단은 정규화 헤드라인 일치 그룹, 분석은 텍스트/JSON 형식 라벨)"""
+    messages = body.get("messages", [])
+    system = messages[0]["content"] if messages else ""
+    user = messages[-1]["content"] if messages else ""
+    items = re.findall(r"^(\d+)\. (.*)$", user, re.M)
+    if "중복" in system:
+        # 괄호 말머리/공백을 뺀 헤드라인이 같으면 같은 그룹
+        groups = {}
+        for n, text in items:
+            groups.setdefault(re.sub(r"\[.*?\]|\s+", "", text), []).append(int(n))
+        return json.dumps(list(groups.values()))
+    if body.get("response_format"):
+        return json.dumps({"articles": [{"id": int(n), **dict(zip(FIELDS, _labels(text)))} for n, text in items]}, ensure_ascii=False)
+    return "\n".join(
+        f"{n}. " + ", ".join(f"{name}: {v}" for name, v in zip(TEXT_LABELS, _labels(text))) for n, text in items
+    )
+
+def malformed_reply(body):
+    """파서가 처리하지 못하는 깨진 응답 (잘린 JSON / 형식 없는 문장)"""
+    if body.get("response_format"):
+        return '{"articles": [{"id": 1, "large_corp": "O"'
+    return "죄송합니다. 요청을 처리할 수 없습니다."
+
+def _tokens(text):
+    # 한글 1자 ≈ 1토큰, 그 외 4자 ≈ 1토큰
+    non_ascii = sum(1 for ch in text if ord(ch) > 127)
+    return math.ceil(non_ascii + (len(text) - non_ascii) / 4)
+
+def completion_object(body, content=None):
+    content = chat_reply(body) if content is None else content
+    prompt_tokens = sum(_tokens(m.get("content") or "") for m in body.get("messages", []))
+    completion_tokens = _tokens(content)
+    return {
+        "id": f"chatcmpl-{uuid.uuid4().hex[:12]}", "object": "chat.completion", "created": int(time.time()),
+        "model": body.get("model", "mock"),
+        "choices": [{"index": 0, "message": {"role": "assistant", "content": content}, "finish_reason": "stop"}],
+        "usage": {"prompt_tokens": prompt_tokens, "completion_tokens": completion_tokens, "total_tokens": prompt_tokens + completion_tokens},
+    }
+
+class MockState:
+    def __init__(self, polls_before_done=1, latency=0.0, jitter=0.0, error_rate=0.0, rate_limit_rate=0.0, malformed_rate=0.0, seed=0,
+                 batch_error_rate=0.0, batch_outcome="completed"):
+        self.files = {}      # id → (meta, bytes)
+        self.batches = {}    # id → batch 객체
+        self.polls = {}      # id → 남은 in_progress 응답 횟수
+        self.polls_before_done = polls_before_done
+        self.latency, self.jitter = latency, jitter
+        self.error_rate, self.rate_limit_rate, self.malformed_rate = error_rate, rate_limit_rate, malformed_rate
+        self.batch_error_rate, self.batch_outcome = batch_error_rate, batch_outcome
+        self.rng = random.Random(seed)
+        self.lock = threading.Lock()
+        self.reset_stats()
+
+    def reset_stats(self):
+        self.stats = {"requests": 0, "ok": 0, "rate_limited": 0, "server_errors": 0, "malformed": 0,
+                      "prompt_tokens": 0, "completion_tokens": 0, "batch_requests": 0}
+
+    def draw_fault(self):
+        """이번 채팅 요청에 적용할 장애 (None / '429' / '500' / 'malformed'), 설정 확률과 시드로 결정"""
+        with self.lock:
+            r = self.rng.random()
+        if r < self.rate_limit_rate: return "429"
+        r -= self.rate_limit_rate
+        if r < self.error_rate: return "500"
+        r -= self.error_rate
+        if r < self.malformed_rate: return "malformed"
+        return None
+
+    def count(self, key, amount=1):
+        with self.lock:
+            self.stats[key] += amount
+
+    def add_file(self, filename, data, purpose):
+        file_id = f"file-{uuid.uuid4().hex[:12]}"
+        meta = {"id": file_id, "object": "file", "bytes": len(data), "created_at": int(time.time()),
+                "filename": filename, "purpose": purpose, "status": "processed"}
+        self.files[file_id] = (meta, data)
+        return meta
+
+    def run_batch(self, batch):
+        """입력 JSONL 을 처리해 출력/에러 파일을 만들고 배치를 종료 상태(batch_outcome)로 전환"""
+        if self.batch_outcome == "failed":
+            batch.update(status="failed", failed_at=int(time.time()),
+                         errors={"object": "list", "data": [{"code": "invalid_request", "message": "Batch failed (mock)"}]})
+            return
+        lines = list(filter(str.strip, self.files[batch["input_file_id"]][1].decode("utf-8").splitlines()))
+        out, errors = [], []
+        for k, line in enumerate(lines):
+            req = json.loads(line)
+            if self.batch_outcome == "expired" and k >= len(lines) // 2:
+                errors.append(json.dumps({"id": f"batch_req_{uuid.uuid4().hex[:8]}", "custom_id": req["custom_id"], "response": None,
+                                          "error": {"code": "batch_expired", "message": "Request expired (mock)"}}))
+                continue
+            if self.rng.random() < self.batch_error_rate:
+                errors.append(json.dumps({"id": f"batch_req_{uuid.uuid4().hex[:8]}", "custom_id": req["custom_id"],
+                                          "response": {"status_code": 500, "request_id": uuid.uuid4().hex[:8],
+                                                       "body": {"error": {"message": "Internal error (mock)", "type": "server_error"}}},
+                                          "error": None}))
+                continue
+            completion = completion_object(req["body"])
+            self.stats["batch_requests"] += 1
+            self.stats["prompt_tokens"] += completion["usage"]["prompt_tokens"]
+            self.stats["completion_tokens"] += completion["usage"]["completion_tokens"]
+            out.append(json.dumps({
+                "id": f"batch_req_{uuid.uuid4().hex[:8]}", "custom_id": req["custom_id"],
+                "response": {"status_code": 200, "request_id": uuid.uuid4().hex[:8], "body": completion},
+                "error": None,
+            }, ensure_ascii=False))
+        self.rng.shuffle(out)
+        output = self.add_file("batch_output.jsonl", ("\n".join(out) + "\n").encode("utf-8"), "batch_output") if out else None
+        error = self.add_file("batch_errors.jsonl", ("\n".join(errors) + "\n").encode("utf-8"), "batch_output") if errors else None
+        status = "expired" if self.batch_outcome == "expired" else "completed"
+        batch.update(status=status, output_file_id=output and output["id"], error_file_id=error and error["id"],
+                     **{f"{status}_at": int(time.time())},
+                     request_counts={"total": len(lines), "completed": len(out), "failed": len(errors)})
+
+class Handler(BaseHTTPRequestHandler):
+    def log_message(self, fmt, *args):
+        pass
+
+    def _send(self, obj, status=200, raw=None, headers=None):
+        data = raw if raw is not None else json.dumps(obj, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/octet-stream" if raw is not None else "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _chat(self, body):
+        """채팅 호출: 지연 → 장애 주입 → 결정적 응답 (지연은 잠금 밖에서 대기해 동시 요청을 흉내냄)"""
+        state = self.server.state
+        state.count("requests")
+        if state.latency or state.jitter:
+            time.sleep(state.latency + random.uniform(0, state.jitter))
+        fault = state.draw_fault()
+        if fault == "429":
+            state.count("rate_limited")
+            return self._send({"error": {"message": "Rate limit reached (mock)", "type": "rate_limit_exceeded"}}, 429,
+                              headers={"retry-after-ms": "50"})
+        if fault == "500":
+            state.count("server_errors")
+            return self._send({"error": {"message": "Internal error (mock)", "type": "server_error"}}, 500)
+        completion = completion_object(body, malformed_reply(body) if fault == "malformed" else None)
+        state.count("malformed" if fault == "malformed" else "ok")
+        state.count("prompt_tokens", completion["usage"]["prompt_tokens"])
+        state.count("completion_tokens", completion["usage"]["completion_tokens"])
+        return self._send(completion)
+
+    def _body(self):
+        return self.rfile.read(int(self.headers.get("Content-Length", 0)))
+
+    def do_GET(self):
+        path = self.path.split("?", 1)[0]
+        if path == "/stats":
+            return self._send(dict(self.server.state.stats))
+        with self.server.state.lock:
+            m = re.fullmatch(r"/v1/files/([\w-]+)/content", path)
+            if m and m.group(1) in self.server.state.files:
+                return self._send(None, raw=self.server.state.files[m.group(1)][1])
+            m = re.fullmatch(r"/v1/batches/([\w-]+)", path)
+            if m and m.group(1) in self.server.state.batches:
+                batch_id = m.group(1)
+                batch = self.server.state.batches[batch_id]
+                if batch["status"] == "in_progress":
+                    if self.server.state.polls[batch_id] > 0:
+                        self.server.state.polls[batch_id] -= 1
+                    else:
+                        self.server.state.run_batch(batch)
+                return self._send(batch)
+        self._send({"error": {"message": f"not found: {path}"}}, 404)
+
+    def do_POST(self):
+        path = self.path.split("?", 1)[0]
+        body = self._body()
+        if path == "/v1/chat/completions":
+            return self._chat(json.loads(body))
+        if path == "/stats/reset":
+            self.server.state.reset_stats()
+            return self._send({"ok": True})
+        with self.server.state.lock:
+            if path == "/v1/files":
+                msg = BytesParser().parsebytes(
+                    b"Content-Type: " + self.headers["Content-Type"].encode() + b"\r\n\r\n" + body
+                )
+                parts = {p.get_param("name", header="content-disposition"): p for p in msg.get_payload()}
+                upload = parts["file"]
+                purpose = parts["purpose"].get_payload(decode=True).decode()
+                return self._send(self.server.state.add_file(upload.get_filename(), upload.get_payload(decode=True), purpose))
+            if path == "/v1/batches":
+                req = json.loads(body)
+                batch_id = f"batch_{uuid.uuid4().hex[:12]}"
+                total = sum(1 for line in self.server.state.files[req["input_file_id"]][1].decode("utf-8").splitlines() if line.strip())
+                batch = {
+                    "id": batch_id, "object": "batch", "endpoint": req["endpoint"], "input_file_id": req["input_file_id"],
+                    "completion_window": req["completion_window"], "status": "in_progress", "created_at": int(time.time()),
+                    "output_file_id": None, "error_file_id": None,
+                    "request_counts": {"total": total, "completed": 0, "failed": 0},
+                }
+                self.server.state.batches[batch_id] = batch
+                self.server.state.polls[batch_id] = self.server.state.polls_before_done
+                return self._send(batch)
+        self._send({"error": {"message": f"not found: {path}"}}, 404)
+
+def start_server(host="127.0.0.1", port=0, **options):
+    """백그라운드 스레드로 서버 시작 (port=0 이면 빈 포트). (server, base_url) 반환, 종료는 server.shutdown()"""
+    server = ThreadingHTTPServer((host, port), Handler)
+    server.daemon_threads = True
+    server.state = MockState(**options)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://{host}:{server.server_address[1]}/v1"
+
+def add_fault_arguments(parser):
+    parser.add_argument("--latency", type=float, default=0.0, help="채팅 응답 기본 지연(초)")
+    parser.add_argument("--jitter", type=float, default=0.0, help="지연에 더할 0~jitter 초 난수")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="500 응답 비율")
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0, help="429 응답 비율")
+    parser.add_argument("--malformed-rate", type=float, default=0.0, help="형식이 깨진 응답 비율")
+    parser.add_argument("--seed", type=int, default=0, help="장애 주입 난수 시드")
+    parser.add_argument("--polls", type=int, default=1, help="배치가 완료되기 전 in_progress 로 응답할 조회 횟수")
+    parser.add_argument("--batch-error-rate", type=float, default=0.0, help="배치 요청별 실패(500) 비율")
+    parser.add_argument("--batch-outcome", choices=["completed", "failed", "expired"], default="completed", help="배치 종료 상태")
+
+def fault_options(args):
+    return {"polls_before_done": args.polls, "latency": args.latency, "jitter": args.jitter, "error_rate": args.error_rate,
+            "rate_limit_rate": args.rate_limit_rate, "malformed_rate": args.malformed_rate, "seed": args.seed,
+            "batch_error_rate": args.batch_error_rate, "batch_outcome": args.batch_outcome}
+
+def main():
+    parser = argparse.ArgumentParser(description="로컬 OpenAI 대체 서버 (Batch API 포함)")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    add_fault_arguments(parser)
+    args = parser.parse_args()
+    server = ThreadingHTTPServer((args.host, args.port), Handler)
+    server.state = MockState(**fault_options(args))
+    print(f"🧪 mock OpenAI 서버: http://{args.host}:{args.port}/v1")
+    server.serve_forever()
+
+if __name__ == "__main__":
+    main()